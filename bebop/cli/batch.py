@@ -0,0 +1,80 @@
+import json
+import shlex
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Tuple
+
+import click
+from rich.markup import escape
+
+
+@dataclass
+class CommandResult:
+    """Representa el resultado de un comando de un lote"""
+
+    line: int
+    command: str
+    ok: bool
+    message: str = ""
+
+
+def iter_commands(source: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """Recorrer las líneas con comandos del lote junto a su número de línea"""
+    for number, line in enumerate(source, start=1):
+        line = line.strip()
+        if line != "" and not line.startswith("#"):
+            yield number, line
+
+
+def parse_command(line: str) -> List[str]:
+    """
+    Obtener los argumentos de un comando escrito como en la terminal o como una lista JSON
+
+    :raises ValueError: Si la línea no se puede interpretar
+    """
+    if line.startswith("["):
+        argv = json.loads(line)
+        if not isinstance(argv, list) or not all(isinstance(x, str) for x in argv):
+            raise ValueError("A JSON command must be a list of strings")
+    else:
+        argv = shlex.split(line)
+
+    if len(argv) and argv[0] == "bebop":
+        argv = argv[1:]
+    if not len(argv):
+        raise ValueError("Missing command")
+    return argv
+
+
+def run_command(parent: click.Context, argv: List[str]) -> None:
+    """Ejecutar un comando del CLI sobre el contexto ya cargado"""
+    name, *args = argv
+    command = parent.command.get_command(parent, name)
+    if command is None or name == "batch":
+        raise click.UsageError(f"No such command '{name}'")
+
+    with command.make_context(name, args, parent=parent) as ctx:
+        command.invoke(ctx)
+
+
+def run_commands(parent: click.Context, lines: Iterable[Tuple[int, str]], stop_on_error: bool) -> List[CommandResult]:
+    """Ejecutar los comandos en orden, registrando el resultado de cada uno"""
+    results = []
+    for number, line in lines:
+        result = CommandResult(number, line, ok=False)
+        try:
+            run_command(parent, parse_command(line))
+            result.ok = True
+        except click.exceptions.Exit as e:
+            result.ok = e.exit_code == 0
+            result.message = "" if result.ok else f"Exited with code {e.exit_code}"
+        except click.exceptions.Abort as e:
+            result.message = str(e) or "Aborted"
+        except click.ClickException as e:
+            result.message = escape(e.format_message())
+        except Exception as e:
+            result.message = escape(str(e) or e.__class__.__name__)
+
+        results.append(result)
+        if stop_on_error and not result.ok:
+            break
+    return results
@@ -0,0 +1,164 @@
+from dataclasses import replace
+from fnmatch import fnmatchcase
+from typing import TYPE_CHECKING, Callable, ClassVar, Dict, Iterator, List, Set, Tuple, TypeVar
+
+import typer
+from rich.console import Console
+
+from bebop.cli.config import BebopConfig
+from bebop.models import PostGroup, Post
+from bebop.storage.operations import get_element
+from bebop.token import IndexToken, Token
+from . import render
+from .context import BebopContext
+
+if TYPE_CHECKING:
+    from bebop.storage.search import SearchResult
+
+T = TypeVar("T")
+MAX_WORKERS = 16
+# Constante de reciprocal rank fusion, suaviza la diferencia entre los primeros puestos de cada tablero
+RANK_OFFSET = 60
+
+
+def is_board_pattern(value: str) -> bool:
+    """Comprobar si el valor de `--board` indica varios tableros, con una lista separada por comas o un patrón"""
+    return any(x in value for x in ",*?[")
+
+
+def match_boards(config: BebopConfig, pattern: str) -> List[str]:
+    """
+    Obtener los nombres de los tableros guardados con el formato configurado que coinciden con el patrón
+
+    :raises typer.BadParameter: Si alguna parte del patrón no coincide con ningún tablero
+    """
+    suffix = BebopContext(config).storage.suffix
+    root = config.get_root_path()
+    # Los archivos auxiliares tienen un punto en el nombre y la configuración no es un tablero
+    names = sorted(
+        x.name[: -len(suffix)]
+        for x in root.glob(f"*{suffix}")
+        if "." not in x.name[: -len(suffix)] and x != config.get_config_path()
+    )
+
+    matched: List[str] = []
+    for part in (x.strip() for x in pattern.split(",")):
+        found = [x for x in names if fnmatchcase(x, part)]
+        if not len(found):
+            raise typer.BadParameter(f"No board matches '{part}'", param_hint="'--board'")
+        matched.extend(x for x in found if x not in matched)
+    return matched
+
+
+class BoardSet:
+    """
+    Representa varios tableros que se muestran juntos
+
+    Los tableros se cargan en paralelo, así que un comando tarda poco más que con el tablero más lento.
+    Los tokens de sus elementos se muestran precedidos por el nombre del tablero, como 'svc-a/B3'.
+    Sólo admite los comandos que no modifican los tableros.
+    """
+
+    commands: ClassVar[Set[str]] = {"show", "search", "tags"}
+
+    def __init__(self, contexts: List[BebopContext]):
+        self.contexts = contexts
+
+    @classmethod
+    def from_pattern(cls, config: BebopConfig, pattern: str, debug: bool = False) -> "BoardSet":
+        return cls([BebopContext(config, x, debug=debug) for x in match_boards(config, pattern)])
+
+    @property
+    def config(self) -> BebopConfig:
+        return self.contexts[0].config
+
+    @property
+    def console(self) -> Console:
+        return self.contexts[0].console
+
+    @property
+    def view(self) -> render.KanbanView:
+        return self.contexts[0].view
+
+    @view.setter
+    def view(self, view: render.KanbanView) -> None:
+        for context in self.contexts:
+            context.view = replace(view, board=context.board_name)
+
+    def map(self, func: Callable[[BebopContext], T]) -> List[T]:
+        """Ejecutar la función sobre el contexto de cada tablero en paralelo, en el orden de los tableros"""
+        if len(self.contexts) == 1:
+            return [func(self.contexts[0])]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(self.contexts))) as executor:
+            return list(executor.map(func, self.contexts))
+
+    def load(self) -> None:
+        """Cargar los tableros, y sus índices de etiquetas si la vista las filtra"""
+
+        def load_context(context: BebopContext) -> None:
+            context.board
+            if not context.view.tags.is_empty:
+                context.tags
+
+        self.map(load_context)
+
+    def get_context(self, token: Token) -> BebopContext:
+        """
+        Obtener el contexto del tablero que indica el token
+
+        :raises typer.Abort: Si el token no indica uno de los tableros
+        """
+        for context in self.contexts:
+            if context.board_name == token.board:
+                return context
+        names = ", ".join(x.board_name for x in self.contexts)
+        return self.contexts[0].abort(f"The Token '{token}' must start with one of the boards: {names}")
+
+    def print_kanban(self) -> None:
+        """Imprimir un solo Kanban con los grupos de todos los tableros"""
+        if self.console.quiet:
+            return
+
+        self.load()
+        kanbans = [render.Kanban(x.board, x.config, x.view, x.selection) for x in self.contexts]
+        self.console.print(render.MergedKanban(kanbans))
+
+    def iter_elements(self, tokens: List[Token]) -> Iterator[Tuple[PostGroup | Post, IndexToken]]:
+        """Recorrer los elementos de los tokens, o los que cumplen el filtro de etiquetas si no se indica ninguno"""
+        if not len(tokens):
+            self.load()
+            paths = ((x, path) for x in self.contexts for path in x.iter_selected())
+        else:
+            paths = ((x, path) for token in tokens for x in [self.get_context(token)] for path in x.iter_paths(token))
+
+        for context, path in paths:
+            token = IndexToken.from_index(*path).with_board(context.board_name)
+            yield get_element(context.board, path), token
+
+    def search(self, text: str, limit: int) -> List["SearchResult"]:
+        """
+        Buscar en todos los tableros, los resultados se ordenan por relevancia
+
+        Las puntuaciones de cada índice dependen de las estadísticas de su tablero, así que no se comparan entre
+        tableros: cada resultado puntúa por su posición en su tablero (reciprocal rank fusion) y los empates
+        se mantienen en el orden de los tableros.
+        """
+
+        def search_board(context: BebopContext) -> List["SearchResult"]:
+            results = context.search(text, limit)
+            return [
+                replace(x, board=context.board_name, score=1 / (RANK_OFFSET + idx)) for idx, x in enumerate(results)
+            ]
+
+        results = (x for items in self.map(search_board) for x in items)
+        return sorted(results, key=lambda x: x.score, reverse=True)[:limit]
+
+    def tag_counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for board_counts in self.map(lambda context: context.tags.counts()):
+            for tag, count in board_counts.items():
+                counts[tag] = counts.get(tag, 0) + count
+        return counts
@@ -0,0 +1,37 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Optional
+
+
+def render_key(*parts: Any) -> str:
+    """Obtener la clave de una salida renderizada a partir de todo lo que la determina"""
+    data = json.dumps(parts, default=str, sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+class RenderCache:
+    """
+    Representa la salida renderizada de un tablero guardada en disco
+
+    La primera línea del archivo guarda la clave de la salida, si no coincide con la
+    clave pedida la entrada se considera inválida.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.path.is_file():
+            return None
+
+        with self.path.open("rb") as f:
+            if f.readline().rstrip(b"\n") != key.encode():
+                return None
+            return f.read().decode()
+
+    def put(self, key: str, output: str) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_suffix(".tmp")
+        temp.write_bytes(key.encode() + b"\n" + output.encode())
+        temp.rename(self.path)
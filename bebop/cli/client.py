@@ -0,0 +1,89 @@
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+from typing import List, Optional
+
+SOCKET_ENVVAR = "BEBOP_SOCKET"
+DISABLE_ENVVAR = "BEBOP_NO_DAEMON"
+TRACE_ENVVAR = "BEBOP_TRACE"
+# Las trazas de --debug y BEBOP_TRACE miden el comando en el proceso
+LOCAL_OPTIONS = {"--help", "--dry-run", "--debug", "--install-completion", "--show-completion"}
+# La exportación escribe directamente en la salida y la importación lee archivos relativos al directorio actual
+LOCAL_COMMANDS = {"daemon", "batch", "open", "checkmarks", "export", "import", "tui", "watch"}
+ENVIRON_KEYS = ["TERM", "COLORTERM", "NO_COLOR", "FORCE_COLOR"]
+
+
+def get_socket_path() -> str:
+    if os.environ.get(SOCKET_ENVVAR):
+        return os.environ[SOCKET_ENVVAR]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"bebop-{os.getuid()}.sock")
+
+
+def is_forwardable(argv: List[str]) -> bool:
+    """Comprobar si el comando puede ejecutarse en el daemon"""
+    if os.environ.get(DISABLE_ENVVAR) or os.environ.get(TRACE_ENVVAR):
+        return False
+    if any(x in LOCAL_OPTIONS for x in argv):
+        return False
+    return not any(x in LOCAL_COMMANDS for x in argv)
+
+
+def build_request(argv: List[str]) -> dict:
+    return {
+        "argv": argv,
+        "board": os.environ.get("BEBOP_BOARD"),
+        "width": shutil.get_terminal_size().columns,
+        "terminal": sys.stdout.isatty(),
+        "environ": {x: os.environ[x] for x in ENVIRON_KEYS if x in os.environ},
+    }
+
+
+def forward(argv: List[str], path: Optional[str] = None) -> Optional[int]:
+    """
+    Ejecutar el comando en el daemon, escribiendo su salida en la terminal
+
+    Devuelve el código de salida, o None si no hay un daemon o el comando debe ejecutarse en el proceso.
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(path or get_socket_path())
+    except OSError:
+        client.close()
+        return None
+
+    with client, client.makefile("rwb") as stream:
+        stream.write(json.dumps(build_request(argv)).encode() + b"\n")
+        stream.flush()
+        line = stream.readline()
+
+    if not line:
+        return None
+    response = json.loads(line)
+    if response.get("fallback"):
+        return None
+
+    sys.stdout.write(response["stdout"])
+    sys.stdout.flush()
+    sys.stderr.write(response["stderr"])
+    return response["exit"]
+
+
+def main() -> None:
+    """
+    Punto de entrada del CLI, reenvía el comando al daemon si está en ejecución
+
+    Sólo usa la biblioteca estándar hasta saber si el comando se ejecuta en el proceso.
+    """
+    argv = sys.argv[1:]
+    if is_forwardable(argv):
+        code = forward(argv)
+        if code is not None:
+            sys.exit(code)
+
+    from bebop.cli.main import app
+
+    app()
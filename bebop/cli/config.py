@@ -1,5 +1,7 @@
 import re
+from enum import StrEnum
 from pathlib import Path
+from typing import List, Optional
 
 import typer
 from pydantic import BaseModel, ConfigDict, Field
@@ -20,6 +22,16 @@ DEFAULT_BOARD = Board(
 )
 
 
+class StorageKind(StrEnum):
+    """Representa los formatos de almacenamiento de un tablero"""
+
+    JSON = "json"
+    JOURNAL = "journal"
+    SQLITE = "sqlite"
+    BINARY = "binary"
+    SHARDED = "sharded"
+
+
 def to_dot(v: str) -> str:
     return re.sub(r"_", ".", v)
 
@@ -57,6 +69,16 @@ class BebopConfig(BaseModel):
 
     default_board: str = Field(default=DEFAULT_BOARD_NAME)
     datetime_format: str = Field(default=DATETIME_FORMAT)
+    lazy_load: bool = Field(default=False)
+    storage: StorageKind = Field(default=StorageKind.JSON)
+    journal_max_operations: int = Field(default=500)
+    journal_max_bytes: int = Field(default=1024 * 1024)
+    render_cache: bool = Field(default=True)
+    daemon_save_delay: float = Field(default=1.0)
+    archive_compress: bool = Field(default=False)
+    auto_archive_days: Optional[int] = Field(default=None)
+    auto_archive_groups: List[str] = Field(default_factory=lambda: ["done"])
+    description_max_bytes: Optional[int] = Field(default=4096)
     theme: BebopTheme = Field(default_factory=lambda: BebopTheme())
 
     @classmethod
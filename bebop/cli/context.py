@@ -1,19 +1,55 @@
+from dataclasses import astuple
+from functools import cached_property
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, NoReturn, Optional, Set, Tuple
 
 import typer
 from rich.console import Console
-from rich.prompt import Prompt
+from rich.markup import escape
 from rich.theme import Theme
 
-from bebop.cli.config import BebopConfig, DEFAULT_BOARD
-from bebop.models import Board, PostGroup, Post
-from bebop.token import IndexToken, RefToken
+from bebop.cli.config import BebopConfig, DEFAULT_BOARD, StorageKind
+from bebop.models import Board, PostGroup, Post, Todo, Comment
+from bebop.storage import BoardStorage, JsonStorage, JournalStorage, dump_element
+from bebop.storage.archive import Archive, ArchiveEntry, find_expired
+from bebop.storage.base import file_signature
+from bebop.storage.descriptions import DescriptionStore, changes_description_file, iter_description_files
+from bebop.storage.lock import BoardLock
+from bebop.storage.names import NameIndex, get_field, iter_elements
+from bebop.storage.tags import TagIndex, TagSelection
+from bebop.storage.operations import (
+    Operation,
+    InsertOperation,
+    ExtendOperation,
+    RemoveOperation,
+    MoveOperation,
+    UpdateOperation,
+    AppendOperation,
+    ElementPath,
+    apply_operation,
+    element_key,
+    path_key,
+    dump_fields,
+    get_element,
+    get_parent_list,
+    index_of,
+    raw_items,
+)
+from bebop.token import Token, IndexToken, RefToken, TokenRange
+from bebop.trace import span, traced, tracer
 from . import render
+from .cache import RenderCache, render_key
+
+if TYPE_CHECKING:
+    from bebop.storage.search import SearchIndex, SearchResult
 
 ElementTree = Tuple[PostGroup, Optional[Post]]
 
 
+class InteractiveRequired(typer.Abort):
+    """Representa un comando que necesita comunicarse con el usuario en un contexto no interactivo"""
+
+
 class BebopContext:
 
     def __init__(
@@ -26,39 +62,579 @@ class BebopContext:
     ):
         """Obtener el contexto de ejecución del CLI"""
         self.config = config
-        self.theme = Theme(config.theme.model_dump(mode="json", by_alias=True))
-        self.console = Console(theme=self.theme)
         self.board_name = board_name or config.default_board
-        self.board = self.load_board()
+        self.storage = self.get_storage()
+        self.lock = BoardLock(config.get_root_path() / f"{self.board_name}.lock")
+        self.operations: List[Operation] = []
+        self.signature = ""
+        self.revision = 0
+        self.retries = 0
+        self.archive_entries: List[ArchiveEntry] = []
+        # Ids de las entradas restauradas, se eliminan del archivo al guardar
+        self.restored_entries: Set[str] = set()
+        self._names: Optional[NameIndex] = None
+        self._tags: Optional[TagIndex] = None
+        self.view = render.KanbanView()
+        self.interactive = True
+        self.autosave = True
         self.dry_run = dry_run
         self.debug = debug
         self.author = author
 
+    @cached_property
+    def theme(self) -> Theme:
+        return Theme(self.config.theme.model_dump(mode="json", by_alias=True))
+
+    @cached_property
+    def console(self) -> Console:
+        return Console(theme=self.theme)
+
+    @cached_property
+    def error_console(self) -> Console:
+        return Console(stderr=True, theme=self.theme)
+
+    @cached_property
+    def board(self) -> Board:
+        """Tablero del contexto, se carga la primera vez que se usa"""
+        # Crear el tablero por defecto es una escritura
+        with self.lock.acquire(exclusive=not self.storage.exists()):
+            return self.read_board()
+
     @property
     def board_path(self) -> Path:
-        return (self.config.get_root_path() / self.board_name).with_suffix(".json")
+        return self.storage.path
+
+    @property
+    def names_path(self) -> Path:
+        return self.board_path.with_suffix(".names.json")
+
+    @property
+    def tags_path(self) -> Path:
+        return self.board_path.with_suffix(".tags.json")
+
+    @property
+    def search_path(self) -> Path:
+        return self.board_path.with_suffix(".search.db")
+
+    @property
+    def render_cache(self) -> RenderCache:
+        return RenderCache(self.config.get_root_path() / "cache" / f"{self.board_name}.kanban")
+
+    @cached_property
+    def archive(self) -> Archive:
+        """Archivo frío del tablero, sólo se lee al listar, buscar o restaurar elementos archivados"""
+        return Archive(self.config.get_root_path() / self.board_name, self.config.archive_compress)
+
+    @cached_property
+    def descriptions(self) -> DescriptionStore:
+        """Archivos de las descripciones largas del tablero, sólo se leen al mostrarlas"""
+        return DescriptionStore(self.config.get_root_path(), self.board_name)
+
+    @property
+    def names(self) -> NameIndex:
+        """Índice de nombres del tablero, se lee del archivo auxiliar o se construye la primera vez que se usa"""
+        if self._names is None:
+            board = self.board
+            names = NameIndex.read(self.names_path, self.signature)
+            if names is None:
+                names = NameIndex.build(board)
+            else:
+                for operation in self.operations:
+                    names.apply(operation)
+            self._names = names
+        return self._names
+
+    @property
+    def tags(self) -> TagIndex:
+        """Índice de etiquetas del tablero, se lee del archivo auxiliar o se construye la primera vez que se usa"""
+        if self._tags is None:
+            board = self.board
+            tags = TagIndex.read(self.tags_path, self.signature)
+            if tags is None:
+                tags = TagIndex.build(board)
+            else:
+                for operation in self.operations:
+                    tags.apply(operation)
+            self._tags = tags
+        return self._tags
+
+    @property
+    def selection(self) -> Optional[TagSelection]:
+        """Elementos que cumplen el filtro de etiquetas de la vista, None si no hay filtro"""
+        if self.view.tags.is_empty:
+            return None
+        return self.tags.select(self.view.tags)
+
+    def get_storage(self, kind: Optional[StorageKind] = None) -> BoardStorage:
+        """Obtener el almacenamiento del tablero para el formato indicado o el configurado"""
+        path = self.config.get_root_path() / self.board_name
+        match kind or self.config.storage:
+            case StorageKind.JOURNAL:
+                return JournalStorage(
+                    path,
+                    lazy=self.config.lazy_load,
+                    max_operations=self.config.journal_max_operations,
+                    max_bytes=self.config.journal_max_bytes,
+                )
+            case StorageKind.SQLITE:
+                from bebop.storage.sqlite import SqliteStorage
+
+                return SqliteStorage(path)
+            case StorageKind.BINARY:
+                from bebop.storage.binary import BinaryStorage
+
+                return BinaryStorage(path, lazy=self.config.lazy_load)
+            case StorageKind.SHARDED:
+                from bebop.storage.sharded import ShardedStorage
+
+                return ShardedStorage(path, lazy=self.config.lazy_load)
+            case _:
+                return JsonStorage(path, lazy=self.config.lazy_load)
+
+    def read_board(self) -> Board:
+        """Cargar el tablero junto a su revisión y su firma, requiere el bloqueo del tablero"""
+        self.revision = self.lock.read_revision()
+        board = self.load_board()
+        # Con el bloqueo adquirido nadie puede escribir entre la carga y la firma
+        self.signature = self.storage.signature()
+        return board
 
     def load_board(self) -> Board:
-        if not self.board_path.is_file():
-            board = DEFAULT_BOARD.copy()
+        if not self.storage.exists():
+            board = DEFAULT_BOARD.model_copy(deep=True)
             board.title = self.board_name.title()
-            dump = board.model_dump_json(indent=2, by_alias=True)
-            self.board_path.write_text(dump)
+            self.storage.write(board)
             return board
 
-        with self.board_path.open("r") as f:
-            return Board.model_validate_json(f.read())
+        with span("board.load") as load:
+            board = self.storage.load()
+            if tracer.enabled:
+                groups = list(iter_elements(board.posts))
+                load.add(groups=len(groups), posts=sum(len(get_field(x, "posts", [])) for _, x in groups))
+        return board
+
+    def is_stale(self) -> bool:
+        """Comprobar si el tablero guardado cambió desde que se cargó"""
+        if "board" not in self.__dict__:
+            return False
+        return self.lock.read_revision() != self.revision or self.storage.signature() != self.signature
+
+    def reload_board(self) -> None:
+        """
+        Volver a cargar el tablero guardado y aplicar sobre él las operaciones pendientes
+
+        :raises typer.Abort: Si las operaciones ya no se pueden aplicar sobre el tablero guardado
+        """
+        operations = self.operations
+        self.operations = []
+        self._names = None
+        self._tags = None
+        self.retries += 1
+        self.__dict__["board"] = self.read_board()
+
+        try:
+            for operation in operations:
+                apply_operation(self.board, operation)
+                self.record(operation)
+        except (IndexError, ValueError) as e:
+            self.operations = []
+            del self.__dict__["board"]
+            self.abort(f"The board was changed by another process and the changes can't be applied: {e}")
+
+    def refresh_board(self) -> None:
+        """Descartar el tablero cargado y sus índices, el próximo uso lee el tablero guardado"""
+        self.__dict__.pop("board", None)
+        self._names = None
+        self._tags = None
 
     def save_board(self) -> None:
+        """
+        Guardar las operaciones pendientes con el bloqueo exclusivo del tablero
+
+        Si otro proceso guardó el tablero desde que se cargó, las operaciones se vuelven a aplicar sobre
+        el tablero guardado antes de guardarlo.
+        """
+        if self.dry_run or not self.autosave:
+            return
+
+        with self.lock.acquire(exclusive=True):
+            if self.is_stale():
+                self.reload_board()
+            if self.config.auto_archive_days is not None:
+                paths = find_expired(self.board, self.config.auto_archive_groups, self.config.auto_archive_days)
+                self.archive_elements(paths)
+            if self._names is None and self.names_path.is_file():
+                self.names
+            if self._tags is None and self.tags_path.is_file():
+                self.tags
+
+            # Un fallo entre ambas escrituras duplica los elementos en lugar de perderlos
+            self.archive.append(self.archive_entries)
+            self.archive_entries = []
+            previous, operations = self.signature, self.operations
+            with span("board.save", operations=len(operations)):
+                self.storage.save(self.board, self.operations)
+            self.operations = []
+            self.revision += 1
+            self.lock.write_revision(self.revision)
+            self.signature = self.storage.signature()
+            with span("index.update"):
+                if self._names is not None:
+                    self._names.write(self.names_path, self.signature)
+                if self._tags is not None:
+                    self._tags.write(self.tags_path, self.signature)
+                self.update_search_index(previous, operations)
+            if self.descriptions.directory.is_dir() and any(changes_description_file(x) for x in operations):
+                self.descriptions.collect(set(iter_description_files(self.board)))
+            self.archive.remove(self.restored_entries)
+            self.restored_entries = set()
+
+        self.log(
+            f"Saved revision {self.revision} of '{self.board_name}', waited {self.lock.wait:.3f}s for the lock, "
+            f"{self.retries} retries"
+        )
+
+    def get_search_index(self) -> "SearchIndex":
+        from bebop.storage.search import SearchIndex
+
+        return SearchIndex(self.search_path, self.config.get_root_path())
+
+    def update_search_index(self, previous: str, operations: List[Operation]) -> None:
+        """Aplicar las operaciones guardadas al índice de búsqueda, si existe y corresponde al tablero anterior"""
+        if not self.search_path.is_file():
+            return
+
+        index = self.get_search_index()
+        try:
+            # Si no corresponde, se reconstruye en la próxima búsqueda
+            if index.signature == previous:
+                index.apply(operations, self.board, self.signature)
+        finally:
+            index.close()
+
+    def search(self, text: str, limit: int) -> List["SearchResult"]:
+        """
+        Buscar los elementos que contienen el texto en el tablero guardado
+
+        El índice sólo se reconstruye, cargando el tablero, si no existe o el tablero cambió por otra vía.
+        """
+        index = self.get_search_index()
+        try:
+            # El tablero cargado y su firma son coherentes, otro cambio sólo provoca otra reconstrucción
+            if not self.storage.exists() or index.signature != self.storage.signature():
+                index.rebuild(self.board, self.signature)
+            return index.search(text, limit)
+        finally:
+            index.close()
+
+    def compact_board(self) -> None:
+        """Dejar el archivo del tablero con todos los cambios aplicados"""
         if self.dry_run:
             return
 
-        dump = self.board.model_dump_json(indent=2, by_alias=True)
-        temp = self.board_path.with_suffix(".json.tmp")
-        with temp.open("w") as f:
-            f.write(dump)
-        temp.rename(self.board_path)
+        with self.lock.acquire(exclusive=True):
+            self.storage.compact(self.board)
+            self.descriptions.collect(set(iter_description_files(self.board)))
+
+    def log(self, message: str) -> None:
+        """Mostrar un mensaje de diagnóstico en la salida de errores si está activo `--debug`"""
+        if self.debug:
+            self.error_console.print(f"[dim]{escape(message)}[/]")
+
+    def abort(self, message: str) -> NoReturn:
+        """
+        Mostrar un mensaje de error y terminar el comando
+
+        :raises typer.Abort: Siempre, con el mensaje como argumento
+        """
+        self.console.print(render.ErrorPanel(message))
+        raise typer.Abort(message)
+
+    def require_interactive(self, action: str) -> None:
+        """
+        Comprobar que el comando se puede comunicar con el usuario
+
+        :raises InteractiveRequired: Si el contexto no es interactivo
+        """
+        if not self.interactive:
+            message = f"{action} requires an interactive terminal"
+            self.console.print(render.ErrorPanel(message))
+            raise InteractiveRequired(message)
+
+    def record(self, operation: Operation) -> None:
+        self.operations.append(operation)
+        if self._names is not None:
+            self._names.apply(operation)
+        if self._tags is not None:
+            self._tags.apply(operation)
+
+    def get_path(self, group: PostGroup, post: Optional[Post] = None) -> ElementPath:
+        """Obtener la ruta de posiciones de un árbol de elementos"""
+        main_index = index_of(self.board.posts, group)
+        if post is None:
+            return [main_index]
+        return [main_index, index_of(group.posts, post)]
+
+    def read_description(self, element: PostGroup | Post) -> Optional[str]:
+        """Obtener la descripción de un elemento, leyendo su archivo si está guardada fuera del tablero"""
+        if element.description_file is None:
+            return element.description
+        return self.descriptions.read(element.description_file)
+
+    def spill_description(self, element: PostGroup | Post) -> None:
+        """Guardar la descripción en un archivo si supera el tamaño máximo de la configuración"""
+        limit = self.config.description_max_bytes
+        if limit is None or element.description is None or len(element.description.encode()) <= limit:
+            return
+        element.description_file = self.descriptions.put(element.description)
+        element.description = None
+
+    def get_description_fields(self, element: PostGroup | Post, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Obtener los campos a asignar, con la descripción nueva en un archivo si es demasiado larga"""
+        if "description" not in fields:
+            return fields
+
+        fields = {**fields, "description_file": None}
+        limit = self.config.description_max_bytes
+        description = fields["description"]
+        if limit is not None and description is not None and len(description.encode()) > limit:
+            fields.update(description=None, description_file=self.descriptions.put(description))
+        elif not self.descriptions.is_managed(element.description_file):
+            # Los archivos de descripción que no crea bebop se conservan
+            del fields["description_file"]
+        return fields
+
+    @traced("mutation")
+    def add_group(self, group: PostGroup, index: Optional[int] = None) -> None:
+        for element in [group, *group.posts]:
+            self.spill_description(element)
+        index = len(self.board.posts) if index is None else index
+        self.board.posts.insert(index, group)
+        self.record(InsertOperation(path=[index], data=dump_element(group)))
+
+    @traced("mutation")
+    def add_post(self, group: PostGroup, post: Post, index: Optional[int] = None) -> None:
+        self.spill_description(post)
+        index = len(group.posts) if index is None else index
+        group.posts.insert(index, post)
+        path = [index_of(self.board.posts, group), index]
+        self.record(InsertOperation(path=path, data=dump_element(post)))
 
+    @traced("mutation")
+    def add_posts(self, group: PostGroup, posts: List[Post]) -> None:
+        """Agregar varios posts al final de un grupo con una sola operación, que guarda los mismos posts"""
+        if not len(posts):
+            return
+
+        for post in posts:
+            self.spill_description(post)
+        index = len(group.posts)
+        raw_items(group.posts).extend(posts)
+        self.record(ExtendOperation(path=[index_of(self.board.posts, group), index], posts=posts))
+
+    @traced("mutation")
+    def remove_element(self, group: PostGroup, post: Optional[Post] = None) -> None:
+        element = group if post is None else post
+        operation = RemoveOperation(path=self.get_path(group, post), element=element_key(element))
+        apply_operation(self.board, operation)
+        self.record(operation)
+
+    @traced("mutation")
+    def move_element(self, source: ElementTree, target: ElementTree) -> None:
+        """
+        Mover un elemento antes del elemento destino
+
+        Si el origen es un Post y el destino un PostGroup, el Post se agrega al final del grupo.
+        """
+        source_element = source[0] if source[1] is None else source[1]
+        target_element = target[0] if target[1] is None else target[1]
+        if source_element is target_element:
+            return
+
+        path = self.get_path(*source)
+        raw_items(get_parent_list(self.board, path)).pop(path[-1])
+
+        if source[1] is not None and target[1] is None:
+            target_path = [index_of(self.board.posts, target[0]), len(target[0].posts)]
+        else:
+            target_path = self.get_path(*target)
+        get_parent_list(self.board, target_path).insert(target_path[-1], source_element)
+        self.record(MoveOperation(path=path, target=target_path, element=element_key(source_element)))
+
+    @traced("mutation")
+    def move_elements(self, paths: List[ElementPath], target: ElementTree) -> None:
+        """
+        Mover varios elementos del mismo nivel antes del elemento destino, conservando su orden
+
+        Si los orígenes son Posts y el destino un PostGroup, se agregan al final del grupo. Las posiciones se
+        calculan antes de mover y cada lista afectada se reconstruye una sola vez.
+        """
+        sources = sorted({tuple(x) for x in paths})
+        if not len(sources):
+            return
+
+        if len(sources[0]) == 2 and target[1] is None:
+            target_path = [index_of(self.board.posts, target[0]), len(target[0].posts)]
+        else:
+            target_path = self.get_path(*target)
+        parent = tuple(target_path[:-1])
+        anchor = target_path[-1]
+        while parent + (anchor,) in sources:
+            anchor += 1
+
+        lists = {x[:-1]: raw_items(get_parent_list(self.board, list(x))) for x in sources}
+        target_items = raw_items(get_parent_list(self.board, target_path))
+        keys = [path_key(get_parent_list(self.board, list(x)), x[-1]) for x in sources]
+        elements = [lists[x[:-1]][x[-1]] for x in sources]
+
+        # Cada movimiento se registra con las posiciones que tiene el elemento tras los movimientos anteriores
+        moved = {key: 0 for key in lists}
+        moved_before_anchor = 0
+        for count, path in enumerate(sources):
+            key, idx = path[:-1], path[-1]
+            current = idx - moved[key]
+            position = anchor - moved_before_anchor + count
+            if key == parent:
+                current += count if anchor <= idx else 0
+                position -= 1 if idx < anchor else 0
+                moved_before_anchor += 1 if idx < anchor else 0
+            moved[key] += 1
+            operation = MoveOperation(path=[*key, current], target=[*parent, position], element=keys[count])
+            self.record(operation)
+
+        for key, items in lists.items():
+            removed = {x[-1] for x in sources if x[:-1] == key}
+            items[:] = [x for idx, x in enumerate(items) if idx not in removed]
+        position = anchor - moved_before_anchor
+        target_items[position:position] = elements
+
+    @traced("mutation")
+    def remove_elements(self, paths: List[ElementPath]) -> None:
+        """Eliminar varios elementos reconstruyendo una sola vez cada lista afectada"""
+        groups = {x[0] for x in paths if len(x) == 1}
+        targets = sorted({tuple(x) for x in paths if len(x) == 1 or x[0] not in groups}, reverse=True)
+        lists = {x[:-1]: raw_items(get_parent_list(self.board, list(x))) for x in targets}
+        keys = [path_key(get_parent_list(self.board, list(x)), x[-1]) for x in targets]
+
+        for key, items in lists.items():
+            removed = {x[-1] for x in targets if x[:-1] == key}
+            items[:] = [x for idx, x in enumerate(items) if idx not in removed]
+        for path, key in zip(targets, keys):
+            self.record(RemoveOperation(path=list(path), element=key))
+
+    @traced("mutation")
+    def archive_elements(self, paths: List[ElementPath]) -> None:
+        """Mover varios elementos al archivo del tablero, se escriben en él al guardar el tablero"""
+        groups = {x[0] for x in paths if len(x) == 1}
+        paths = [list(x) for x in sorted({tuple(x) for x in paths}) if len(x) == 1 or x[0] not in groups]
+        for path in paths:
+            element = get_element(self.board, path)
+            group = None if len(path) == 1 else self.board.posts[path[0]]
+            self.archive_entries.append(
+                ArchiveEntry(
+                    group=None if group is None else group.title,
+                    group_name=None if group is None else group.name,
+                    data=self.inline_descriptions(dump_element(element)),
+                )
+            )
+        self.remove_elements(paths)
+
+    def inline_descriptions(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Copiar en los datos del elemento y de sus posts las descripciones guardadas en archivos del tablero"""
+        # Los posts no visitados son los mismos diccionarios del tablero
+        data = dict(data)
+        if "posts" in data:
+            data["posts"] = [dict(x) for x in data["posts"]]
+        for element in [data, *data.get("posts", [])]:
+            if self.descriptions.is_managed(element.get("descriptionFile")):
+                element["description"] = self.descriptions.read(element["descriptionFile"])
+                element["descriptionFile"] = None
+        return data
+
+    @traced("mutation")
+    def restore_elements(self, numbers: Set[int]) -> List[ArchiveEntry]:
+        """
+        Devolver al tablero las entradas del archivo, se eliminan del archivo al guardar el tablero
+
+        Los posts vuelven al final del grupo del que salieron, buscándolo por nombre y por título, o a un
+        grupo nuevo con el mismo título si ya no existe. Los grupos vuelven al final del tablero.
+
+        :raises typer.Abort: Si algún número no corresponde a ninguna entrada
+        """
+        entries = [(x, entry) for x, entry in self.archive if x in numbers]
+        missing = numbers - {x for x, _ in entries}
+        if len(missing):
+            self.abort(f"There is no archived element #{min(missing)}")
+
+        entries = [(x, entry) for x, entry in entries if entry.id not in self.restored_entries]
+        for _, entry in entries:
+            if entry.is_group:
+                self.add_group(PostGroup.model_validate(entry.data))
+                continue
+
+            path = self.names.get(entry.group_name) if entry.group_name is not None else None
+            if path is None or len(path) > 1:
+                path = next(
+                    ([idx] for idx, x in iter_elements(self.board.posts) if get_field(x, "title") == entry.group), None
+                )
+            if path is None:
+                self.add_group(PostGroup(title=entry.group))
+                path = [len(self.board.posts) - 1]
+            self.add_post(self.board.posts[path[0]], Post.model_validate(entry.data))
+
+        self.restored_entries.update(x.id for _, x in entries)
+        return [x for _, x in entries]
+
+    @traced("mutation")
+    def update_element(self, group: PostGroup, post: Optional[Post] = None, **fields: Any) -> None:
+        """Asignar nuevos valores a los campos de un elemento"""
+        if not len(fields):
+            return
+
+        element = group if post is None else post
+        key = element_key(element)
+        fields = self.get_description_fields(element, fields)
+        for name, value in fields.items():
+            element.__pydantic_validator__.validate_assignment(element, name, value)
+        data = dump_fields(element, list(fields))
+        self.record(UpdateOperation(path=self.get_path(group, post), fields=data, element=key))
+
+    @traced("mutation")
+    def update_elements(self, paths: List[ElementPath], **fields: Any) -> None:
+        """Asignar nuevos valores a los campos de varios elementos"""
+        for path in paths:
+            element = get_element(self.board, path)
+            key = element_key(element)
+            values = self.get_description_fields(element, fields)
+            for name, value in values.items():
+                element.__pydantic_validator__.validate_assignment(element, name, value)
+            self.record(UpdateOperation(path=path, fields=dump_fields(element, list(values)), element=key))
+
+    @traced("mutation")
+    def add_todos(self, paths: List[ElementPath], todo: Todo) -> None:
+        """Agregar una copia de la tarea a varios posts"""
+        data = todo.model_dump(mode="json", by_alias=True)
+        for path in paths:
+            element = get_element(self.board, path)
+            element.todos.append(todo.model_copy())
+            self.record(AppendOperation(path=path, field="todos", data=data, element=element_key(element)))
+
+    @traced("mutation")
+    def add_todo(self, group: PostGroup, post: Post, todo: Todo) -> None:
+        post.todos.append(todo)
+        data = todo.model_dump(mode="json", by_alias=True)
+        path = self.get_path(group, post)
+        self.record(AppendOperation(path=path, field="todos", data=data, element=element_key(post)))
+
+    @traced("mutation")
+    def add_comment(self, group: PostGroup, post: Optional[Post], comment: Comment) -> None:
+        element = group if post is None else post
+        element.comments.append(comment)
+        data = comment.model_dump(mode="json", by_alias=True)
+        path = self.get_path(group, post)
+        self.record(AppendOperation(path=path, field="comments", data=data, element=element_key(element)))
+
+    @traced("token.resolve")
     def get_tree_by_index(self, token: IndexToken) -> ElementTree:
         """
         Obtener el árbol de elementos por índice
@@ -73,47 +649,159 @@ class BebopContext:
             return group, post
 
         except IndexError:
-            message = render.ErrorPanel(f"The Token '{token}' does not exists")
-            self.console.print(message)
-            raise typer.Abort()
+            self.abort(f"The Token '{token}' does not exists")
 
+    @traced("token.resolve")
     def get_tree_by_ref(self, token: RefToken) -> ElementTree:
         """
         Obtener el árbol de elementos por nombre
 
         :raises typer.Abort: Si no se encuentra ningún elemento con el nombre
         """
-        for group in self.board.posts:
-            if (group.name or "").lower() == token.name:
-                return group, None
+        path = self.names.get(token.name)
+        if path is None:
+            self.abort(f"The Token '{token}' does not match any element")
+
+        group = self.board.posts[path[0]]
+        post = group.posts[path[1]] if len(path) > 1 else None
+        return group, post
+
+    @traced("token.resolve")
+    def get_tree(self, token: Token) -> ElementTree:
+        """
+        Obtener el árbol de elementos por índice o por nombre
+
+        :raises typer.Abort: Si el token es un rango o no corresponde a ningún elemento
+        """
+        self.check_board(token)
+        if isinstance(token, TokenRange):
+            self.abort(f"The Token '{token}' is a range, a single element is expected")
+        if isinstance(token, RefToken):
+            return self.get_tree_by_ref(token)
+        return self.get_tree_by_index(token)
+
+    def iter_paths(self, token: Token) -> Iterator[ElementPath]:
+        """
+        Recorrer las rutas de los elementos identificados por un token, los rangos se expanden a medida que se recorren
+
+        Los rangos sólo incluyen los elementos que cumplen el filtro de etiquetas de la vista.
+
+        :raises typer.Abort: Si el token no corresponde a ningún elemento
+        """
+        self.check_board(token)
+        if not isinstance(token, TokenRange):
+            group, post = self.get_tree(token)
+            if isinstance(token, RefToken):
+                yield self.names.get(token.name)
+            else:
+                yield [token.main_index] if post is None else [token.main_index, token.sub_index]
+            return
+
+        selection = self.selection
+        try:
+            if not token.is_post_range:
+                paths = ([x] for x in range(len(self.board.posts))[token.group_slice()])
+            else:
+                main_index, posts = token.post_slice()
+                group, _ = self.get_tree_by_index(IndexToken.from_index(main_index))
+                paths = ([main_index, x] for x in range(len(group.posts))[posts])
+        except ValueError as e:
+            self.abort(str(e))
+
+        yield from (x for x in paths if selection is None or x in selection)
+
+    def iter_selected(self) -> Iterator[ElementPath]:
+        """Recorrer en el orden del tablero las rutas de los grupos y posts que cumplen el filtro de etiquetas"""
+        selection = self.selection
+        if selection is None or selection.include is None:
+            yield from self.iter_paths(TokenRange(":"))
+            return
+        yield from (list(x) for x in sorted(selection.include - selection.exclude))
+
+    @traced("token.resolve")
+    def resolve_token(self, token: Token) -> IndexToken:
+        """
+        Obtener el IndexToken del elemento identificado por el token
 
-            for post in group.posts:
-                if (post.name or "").lower() == token.name:
-                    return group, post
+        :raises typer.Abort: Si el token es un rango o no se encuentra ningún elemento con el nombre
+        """
+        self.check_board(token)
+        if isinstance(token, IndexToken):
+            return token
+        return self.build_index_token(*self.get_tree(token))
 
-        message = render.ErrorPanel(f"The Token '{token}' does not match any element")
-        self.console.print(message)
-        raise typer.Abort()
+    def check_board(self, token: Token) -> None:
+        """
+        Comprobar que el token no identifica un elemento de otro tablero
+
+        :raises typer.Abort: Si el token indica otro tablero
+        """
+        if token.board is not None and token.board != self.board_name:
+            self.abort(f"The Token '{token}' belongs to another board, use [green]--board {token.board}[/]")
 
     def build_index_token(self, group: PostGroup, post: Optional[Post] = None) -> IndexToken:
         """Obtener el IndexToken para un árbol de elementos"""
         try:
-            main_index = self.board.index(group)
-            sub_index = group.posts.index(post)
-            return IndexToken.from_index(main_index, sub_index)
+            return IndexToken.from_index(*self.get_path(group, post))
         except ValueError:
-            message = render.ErrorPanel("Failed to create the IndexToken")
-            self.console.print(message)
-            raise typer.Abort()
+            self.abort("Failed to create the IndexToken")
+
+    def get_kanban_key(self) -> Optional[str]:
+        """
+        Obtener la clave de la salida del Kanban para el contenido guardado del tablero
+
+        Devuelve None si el tablero en memoria puede diferir del guardado.
+        """
+        if len(self.operations):
+            return None
+        if not self.storage.exists():
+            # Cargar el tablero crea el archivo por defecto
+            self.board
+
+        console = self.console
+        return render_key(
+            self.storage.signature(),
+            file_signature(Path(render.__file__)),
+            console.width,
+            console.color_system,
+            console.encoding,
+            console.legacy_windows,
+            self.config.datetime_format,
+            self.config.theme.model_dump(),
+            astuple(self.view),
+        )
 
     def print_kanban(self) -> None:
-        kanban = render.Kanban(self.board, self.config)
-        self.console.print(kanban)
+        """Imprimir el Kanban, reutilizando la salida guardada si el tablero no ha cambiado"""
+        if self.console.quiet:
+            return
+
+        with span("render.kanban") as rendering:
+            key = self.get_kanban_key() if self.config.render_cache else None
+            if key is None:
+                self.console.print(render.Kanban(self.board, self.config, self.view, self.selection))
+                return
+
+            output = self.render_cache.get(key)
+            rendering.add(cached=int(output is not None))
+            if output is None:
+                with self.console.capture() as capture:
+                    self.console.print(render.Kanban(self.board, self.config, self.view, self.selection))
+                output = capture.get()
+                if not self.dry_run:
+                    self.render_cache.put(key, output)
+
+            rendering.add(bytes=len(output))
+            self.console.file.write(output)
+            self.console.file.flush()
 
     def ask_token(self) -> IndexToken:
+        from rich.prompt import Prompt
+
+        self.require_interactive("Asking for a token")
+
         token = Prompt.ask("Enter a [token]Index Token[/]", console=self.console)
         try:
-            return IndexToken(token)
+            return self.resolve_token(Token.parse(token))
         except ValueError:
-            error = render.ErrorPanel("Invalid token")
-            raise typer.Abort()
+            self.abort("Invalid token")
@@ -0,0 +1,199 @@
+import asyncio
+import json
+import os
+import signal
+import socket
+import threading
+import traceback
+from io import StringIO
+from typing import Dict, Optional
+
+import click
+import typer
+from rich.console import Console
+from rich.theme import Theme
+
+from bebop.cli.boards import is_board_pattern
+from bebop.cli.config import BebopConfig
+from bebop.cli.context import BebopContext, InteractiveRequired
+
+
+def get_color_system(terminal: bool, environ: Dict[str, str]) -> Optional[str]:
+    """Obtener el sistema de color de la terminal del cliente"""
+    if environ.get("FORCE_COLOR"):
+        terminal = True
+    if not terminal or environ.get("NO_COLOR") or environ.get("TERM") in ("dumb", "unknown"):
+        return None
+    if environ.get("COLORTERM", "").lower() in ("truecolor", "24bit"):
+        return "truecolor"
+    if "256color" in environ.get("TERM", ""):
+        return "256"
+    return "standard"
+
+
+class ContextPool:
+    """
+    Representa los contextos de los tableros que el daemon mantiene en memoria
+
+    Los comandos de un mismo tablero se ejecutan de uno en uno. Los cambios se guardan un tiempo
+    después del último comando que modificó el tablero, con el guardado normal del contexto.
+    """
+
+    def __init__(self, config: BebopConfig):
+        self.config = config
+        self.contexts: Dict[str, BebopContext] = {}
+        self.locks: Dict[str, threading.Lock] = {}
+        self.pool_lock = threading.Lock()
+        self.local = threading.local()
+        self.theme = Theme(config.theme.model_dump(mode="json", by_alias=True))
+
+    def get_lock(self, board_name: str) -> threading.Lock:
+        with self.pool_lock:
+            return self.locks.setdefault(board_name, threading.Lock())
+
+    def get_context(self, board_name: Optional[str], debug: bool) -> BebopContext:
+        """Obtener el contexto del tablero, se vuelve a cargar si el archivo cambió fuera del daemon"""
+        board_name = board_name or self.config.default_board
+        manager = self.contexts.get(board_name)
+        if manager is None or (not len(manager.operations) and manager.is_stale()):
+            manager = BebopContext(self.config, board_name)
+            self.contexts[board_name] = manager
+
+        manager.debug = debug
+        manager.interactive = False
+        manager.autosave = False
+        manager.console = self.local.console
+        return manager
+
+    def flush(self, board_name: str) -> None:
+        """Guardar los cambios pendientes del tablero"""
+        with self.get_lock(board_name):
+            self._save(board_name)
+
+    def _save(self, board_name: str) -> None:
+        manager = self.contexts.get(board_name)
+        if manager is not None and len(manager.operations):
+            manager.autosave = True
+            manager.save_board()
+            manager.autosave = False
+
+    def execute(self, request: dict) -> dict:
+        """Ejecutar un comando del CLI, devolviendo su salida y su código de salida"""
+        from bebop.cli.main import app
+
+        stdout = StringIO()
+        self.local.console = Console(
+            file=stdout,
+            width=request.get("width") or 80,
+            force_terminal=request.get("terminal", False),
+            color_system=get_color_system(request.get("terminal", False), request.get("environ", {})),
+            theme=self.theme,
+        )
+        argv = list(request["argv"])
+        if request.get("board"):
+            argv = ["--board", request["board"], *argv]
+
+        group = typer.main.get_command(app)
+        board_name = None
+        stderr = ""
+        code = 0
+        try:
+            with group.make_context("bebop", argv, obj=self) as ctx:
+                board_name = ctx.params.get("board_name") or self.config.default_board
+                # Los tableros de un patrón se cargan en el proceso del comando
+                if ctx.params.get("dry_run") or is_board_pattern(board_name):
+                    return {"fallback": True}
+
+                with self.get_lock(board_name):
+                    # Como en los lotes, un comando que falla no descarta los cambios pendientes del tablero
+                    try:
+                        group.invoke(ctx)
+                    except InteractiveRequired:
+                        self._save(board_name)
+                        return {"fallback": True}
+        except click.exceptions.Exit as e:
+            code = e.exit_code
+        except click.exceptions.Abort:
+            stderr, code = "Aborted!\n", 1
+        except click.ClickException as e:
+            usage = e.ctx.get_usage() + "\n" if getattr(e, "ctx", None) is not None else ""
+            stderr, code = f"{usage}Error: {e.format_message()}\n", e.exit_code
+        except Exception:
+            # No se vuelve a ejecutar en el cliente porque el comando pudo aplicarse en parte
+            stderr, code = traceback.format_exc(), 1
+
+        return {"stdout": stdout.getvalue(), "stderr": stderr, "exit": code, "board": board_name}
+
+
+class Daemon:
+    """Representa el servidor que ejecuta los comandos de los clientes sobre los tableros en memoria"""
+
+    def __init__(self, config: BebopConfig, path: str):
+        self.pool = ContextPool(config)
+        self.path = path
+        self.pending: Dict[str, asyncio.TimerHandle] = {}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        line = await reader.readline()
+        if not line:
+            # Conexiones que sólo comprueban si el daemon está en ejecución
+            writer.close()
+            return
+
+        try:
+            response = await loop.run_in_executor(None, self.pool.execute, json.loads(line))
+        except (ValueError, KeyError):
+            traceback.print_exc()
+            response = {"fallback": True}
+
+        if response.get("board") is not None:
+            self.schedule_save(response["board"])
+        try:
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    def schedule_save(self, board_name: str) -> None:
+        manager = self.pool.contexts.get(board_name)
+        if manager is None or not len(manager.operations) or board_name in self.pending:
+            return
+
+        def save():
+            del self.pending[board_name]
+            asyncio.get_running_loop().run_in_executor(None, self.pool.flush, board_name)
+
+        delay = self.pool.config.daemon_save_delay
+        self.pending[board_name] = asyncio.get_running_loop().call_later(delay, save)
+
+    async def serve(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Atender a los clientes hasta recibir SIGINT o SIGTERM, o hasta que se active `stop`"""
+        loop = asyncio.get_running_loop()
+        if stop is None:
+            stop = asyncio.Event()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, stop.set)
+
+        server = await asyncio.start_unix_server(self.handle, path=self.path)
+        os.chmod(self.path, 0o600)
+        async with server:
+            await stop.wait()
+
+        for handle in self.pending.values():
+            handle.cancel()
+        for board_name in list(self.pool.contexts):
+            await loop.run_in_executor(None, self.pool.flush, board_name)
+        os.unlink(self.path)
+
+
+def is_running(path: str) -> bool:
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        client.close()
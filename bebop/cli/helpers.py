@@ -1,43 +1,288 @@
 import curses
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
-from bebop.models import Post
+from bebop.models import Post, Todo
 
+HEADER_ROWS = 3
+FOOTER_ROWS = 2
+HELP = (
+    "Arrows/PgUp/PgDn/Home/End move, <Space> toggle, <m> mark, <d> delete, </> filter, "
+    "<q> save and exit, <Ctrl-c> abort"
+)
 
-def render_checkmarks_menu(post: Post):
-    todos = post.todos
 
-    def inner(window: curses.window):
+@dataclass
+class ChecklistState:
+    """
+    Representa el estado del editor de tareas, separado de curses
+
+    Sólo se muestran las tareas de la ventana entre `top` y `top + height` de la lista filtrada. Mover
+    el cursor o marcar tareas anota las filas que cambian en `dirty`, sin recorrer la lista. Cada letra
+    del filtro se aplica sobre el resultado anterior, y al borrarla se recupera ese resultado.
+    """
+
+    todos: List[Todo]
+    height: int
+    cursor: int = 0
+    top: int = 0
+    editing: bool = False
+    marked: Dict[int, Todo] = field(default_factory=dict)
+    dirty: Set[int] = field(default_factory=set)
+    redraw: bool = True
+    # Resultado del filtro para cada prefijo del texto escrito
+    history: List[Tuple[str, List[Todo]]] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.history = [("", self.todos)]
+
+    @property
+    def query(self) -> str:
+        return self.history[-1][0]
+
+    @property
+    def visible(self) -> List[Todo]:
+        return self.history[-1][1]
+
+    @property
+    def current(self) -> Optional[Todo]:
+        return self.visible[self.cursor] if self.cursor < len(self.visible) else None
+
+    def is_marked(self, todo: Todo) -> bool:
+        return id(todo) in self.marked
+
+    def resize(self, height: int) -> None:
+        self.height = max(height, 1)
+        self.scroll()
+        self.redraw = True
+
+    def scroll(self) -> None:
+        """Desplazar la ventana para que contenga el cursor, si se desplaza se redibuja completa"""
+        top = min(max(self.top, self.cursor - self.height + 1), self.cursor)
+        top = max(min(top, len(self.visible) - self.height), 0)
+        if top != self.top:
+            self.top = top
+            self.redraw = True
+
+    def move_to(self, position: int) -> None:
+        if not len(self.visible):
+            return
+        self.dirty.add(self.cursor)
+        self.cursor = min(max(position, 0), len(self.visible) - 1)
+        self.dirty.add(self.cursor)
+        self.scroll()
+
+    def move(self, delta: int) -> None:
+        self.move_to(self.cursor + delta)
+
+    def page(self, pages: int) -> None:
+        self.move(pages * self.height)
+
+    def mark(self) -> None:
+        """Agregar o quitar la tarea del cursor de las marcadas, y pasar a la siguiente"""
+        todo = self.current
+        if todo is None:
+            return
+        if self.marked.pop(id(todo), None) is None:
+            self.marked[id(todo)] = todo
+        self.dirty.add(self.cursor)
+        self.move(1)
+
+    def selected(self) -> List[Todo]:
+        """Obtener las tareas marcadas, o la del cursor si no hay ninguna"""
+        if not len(self.marked):
+            return [] if self.current is None else [self.current]
+        return list(self.marked.values())
+
+    def toggle(self) -> None:
+        """Cambiar el estado de las tareas marcadas, o de la del cursor si no hay ninguna marcada"""
+        selected = self.selected()
+        for todo in selected:
+            todo.checked = not todo.checked
+        # Sólo se redibujan las filas de la ventana, sin buscar las tareas en la lista
+        ids = {id(x) for x in selected}
+        end = min(self.top + self.height, len(self.visible))
+        self.dirty.update(x for x in range(self.top, end) if id(self.visible[x]) in ids)
+
+    def delete(self) -> None:
+        """Eliminar las tareas marcadas, o la del cursor si no hay ninguna marcada"""
+        removed = {id(x) for x in self.selected()}
+        if not len(removed):
+            return
+        self.todos[:] = [x for x in self.todos if id(x) not in removed]
+        self.marked.clear()
+        query = self.query
+        self.history = [("", self.todos)]
+        if query != "":
+            self.history.append((query, self.filter(self.todos, query)))
+        self.move_to(min(self.cursor, len(self.visible) - 1))
+        self.redraw = True
+
+    def type(self, char: str) -> None:
+        """Agregar una letra al filtro, buscando sólo entre las tareas que cumplían el filtro anterior"""
+        query = self.query + char
+        self.history.append((query, self.filter(self.visible, query)))
+        self.reset_cursor()
+
+    def erase(self) -> None:
+        """Quitar la última letra del filtro, recuperando el resultado anterior"""
+        if self.query == "":
+            return
+        query = self.query[:-1]
+        self.history.pop()
+        if self.query != query:
+            # Tras eliminar tareas sólo se conserva el resultado del filtro completo
+            self.history.append((query, self.filter(self.todos, query)))
+        self.reset_cursor()
+
+    def clear_filter(self) -> None:
+        del self.history[1:]
+        self.reset_cursor()
+
+    def reset_cursor(self) -> None:
+        self.cursor = 0
+        self.top = 0
+        self.redraw = True
+
+    @staticmethod
+    def filter(todos: List[Todo], query: str) -> List[Todo]:
+        query = query.lower()
+        return [x for x in todos if query in x.text.lower()]
+
+
+class ChecklistView:
+    """
+    Renderiza el estado del editor en una ventana de curses
+
+    Sólo se dibujan las filas visibles, y entre teclas sólo las que el estado anotó como cambiadas y la línea
+    de estado. Los textos se recortan al ancho de la ventana.
+    """
+
+    def __init__(self, window: "curses.window", state: ChecklistState, title: str):
+        self.window = window
+        self.state = state
+        self.title = title
+
+    @staticmethod
+    def get_height(rows: int) -> int:
+        return max(rows - HEADER_ROWS - FOOTER_ROWS, 1)
+
+    def draw(self) -> None:
+        state = self.state
+        if state.redraw:
+            self.window.erase()
+            self.write(1, f" {self.title} - TODO:", curses.A_UNDERLINE)
+            self.write(HEADER_ROWS + state.height + 1, f" {HELP}", curses.A_DIM)
+            rows = range(state.top, state.top + state.height)
+        else:
+            rows = sorted(x for x in state.dirty if state.top <= x < state.top + state.height)
+
+        for position in rows:
+            self.draw_row(position)
+        self.write(HEADER_ROWS + state.height, self.get_status(), curses.A_BOLD)
+        state.dirty.clear()
+        state.redraw = False
+        self.window.refresh()
+
+    def draw_row(self, position: int) -> None:
+        state = self.state
+        y = HEADER_ROWS + position - state.top
+        if position >= len(state.visible):
+            self.write(y, "")
+            return
+        todo = state.visible[position]
+        cursor = position == state.cursor
+        prefix = f" {'>' if cursor else ' '} {'*' if state.is_marked(todo) else ' '}"
+        self.write(y, f"{prefix}[{'X' if todo.checked else ' '}] {todo.text}", curses.A_REVERSE if cursor else 0)
+
+    def get_status(self) -> str:
+        state = self.state
+        total = f"{state.cursor + 1 if len(state.visible) else 0}/{len(state.visible)}"
+        marked = f", {len(state.marked)} marked" if len(state.marked) else ""
+        if state.editing or state.query != "":
+            return f" /{state.query}{'_' if state.editing else ''}  {total}{marked}"
+        return f" {total}{marked}"
+
+    def write(self, y: int, text: str, attr: int = curses.A_NORMAL) -> None:
+        rows, columns = self.window.getmaxyx()
+        if y >= rows:
+            return
+        self.window.move(y, 0)
+        self.window.clrtoeol()
+        # La última columna de la última fila no se puede escribir sin error
+        self.window.addnstr(y, 0, text, max(columns - 1, 0), attr)
+
+
+Key = int | str
+Action = Callable[[ChecklistState], None]
+
+# curses devuelve las teclas especiales como números y el resto como texto
+KEYS: Dict[Key, Action] = {
+    curses.KEY_UP: lambda x: x.move(-1),
+    curses.KEY_DOWN: lambda x: x.move(1),
+    curses.KEY_PPAGE: lambda x: x.page(-1),
+    curses.KEY_NPAGE: lambda x: x.page(1),
+    curses.KEY_HOME: lambda x: x.move_to(0),
+    curses.KEY_END: lambda x: x.move_to(len(x.visible) - 1),
+    "k": lambda x: x.move(-1),
+    "j": lambda x: x.move(1),
+    "g": lambda x: x.move_to(0),
+    "G": lambda x: x.move_to(len(x.visible) - 1),
+    " ": ChecklistState.toggle,
+    "x": ChecklistState.toggle,
+    "X": ChecklistState.toggle,
+    "m": ChecklistState.mark,
+    "\t": ChecklistState.mark,
+    "d": ChecklistState.delete,
+    "D": ChecklistState.delete,
+}
+BACKSPACE_KEYS: Set[Key] = {curses.KEY_BACKSPACE, "\x7f", "\b"}
+ENTER_KEYS: Set[Key] = {curses.KEY_ENTER, "\n", "\r"}
+ESCAPE_KEY = "\x1b"
+
+
+def handle_key(state: ChecklistState, key: Key) -> bool:
+    """Aplicar una tecla sobre el estado del editor, devuelve False si el editor debe terminar"""
+    if state.editing:
+        if key in ENTER_KEYS:
+            state.editing = False
+        elif key == ESCAPE_KEY:
+            state.editing = False
+            state.clear_filter()
+        elif key in BACKSPACE_KEYS:
+            state.erase()
+        elif isinstance(key, str) and key.isprintable():
+            state.type(key)
+        elif isinstance(key, int) and key in KEYS:
+            KEYS[key](state)
+        return True
+
+    if key in ("q", "Q"):
+        return False
+    if key == "/":
+        state.editing = True
+    elif key == ESCAPE_KEY:
+        state.clear_filter()
+    elif key in KEYS:
+        KEYS[key](state)
+    return len(state.todos) > 0
+
+
+def render_checkmarks_menu(post: Post):
+    def inner(window: "curses.window"):
         window.keypad(True)
         curses.cbreak()
         curses.noecho()
+        curses.set_escdelay(25)
 
-        position = 0
+        state = ChecklistState(post.todos, ChecklistView.get_height(window.getmaxyx()[0]))
+        view = ChecklistView(window, state, post.title)
         while True:
-            window.clear()
-            window.addstr(f"\n {post.title} - TODO:\n\n", curses.A_UNDERLINE)
-
-            for idx, todo in enumerate(todos):
-                selected = ">" if position == idx else " "
-                checked = "X" if todo.checked else " "
-                window.addstr(f" {selected} [{checked}] {todo.text}\n")
-
-            window.addstr(
-                "\n Use Arrows to Move, <Space> for toggle checkmark, <d> for Delete item, "
-                "<q> for Save and Exit, <Ctrl-c> to Abort"
-            )
-            c = window.getch()
-            if c == curses.KEY_UP:
-                position = (position - 1 + len(todos)) % len(todos)
-            if c == curses.KEY_DOWN:
-                position = (position + 1) % len(todos)
-            if c in (ord(" "), ord("x"), ord("X")):
-                todos[position].checked = not todos[position].checked
-            if c in (ord("d"), ord("D")):
-                todos.remove(todos[position])
-                if not len(todos):
-                    break
-                position = (position - 1 + len(todos)) % len(todos)
-            if c in (ord("q"), ord("Q")):
+            view.draw()
+            key = window.get_wch()
+            if key == curses.KEY_RESIZE:
+                state.resize(ChecklistView.get_height(window.getmaxyx()[0]))
+            elif not handle_key(state, key):
                 break
 
     return inner
@@ -1,18 +1,23 @@
-import curses
+import sys
 from datetime import datetime
 from enum import StrEnum
-from typing import Annotated, Optional, List
+from pathlib import Path
+from typing import Annotated, Dict, Optional, List, Set
 
-import click
 import typer
-from rich.prompt import Confirm
+from rich.console import Console
 
 from bebop.cli import render
-from bebop.cli.config import BebopConfig
+from bebop.cli.boards import BoardSet, is_board_pattern
+from bebop.cli.config import BebopConfig, StorageKind
 from bebop.cli.context import BebopContext
-from bebop.cli.helpers import render_checkmarks_menu
 from bebop.models import Post, Todo, Comment, PostGroup
-from bebop.token import IndexToken
+from bebop.storage.names import get_field, iter_elements
+from bebop.storage.operations import ElementPath, get_element, index_of
+from bebop.storage.formats import RecordFormat
+from bebop.storage.tags import TagFilter
+from bebop.token import Token, IndexToken, TokenRange
+from bebop.trace import get_trace_path, span, tracer
 
 app = typer.Typer(rich_markup_mode="rich")
 
@@ -28,9 +33,26 @@ class HelpPanel(StrEnum):
 @app.callback(invoke_without_command=True, epilog="See you space cowboy :rocket:")
 def main(
     ctx: typer.Context,
-    board_name: Annotated[Optional[str], typer.Option("--board", "-b", envvar="BEBOP_BOARD")] = None,
+    board_name: Annotated[
+        Optional[str],
+        typer.Option(
+            "--board", "-b", envvar="BEBOP_BOARD", help="Board to use, a pattern like 'svc-*' or a comma list"
+        ),
+    ] = None,
     dry_run: bool = False,
     debug: bool = False,
+    rows: Annotated[Optional[int], typer.Option("--rows", min=1, help="Number of posts shown per group")] = None,
+    columns: Annotated[
+        Optional[TokenRange], typer.Option("--cols", parser=TokenRange, help="Range of groups shown, like A:F")
+    ] = None,
+    page: Annotated[int, typer.Option("--page", min=1, help="Page of posts shown when using --rows")] = 1,
+    tags: Annotated[
+        Optional[List[str]],
+        typer.Option(
+            "--tag", help="Only elements with the tag, a comma list matches any of them and repeats match all"
+        ),
+    ] = None,
+    not_tags: Annotated[Optional[List[str]], typer.Option("--not-tag", help="Skip elements with the tag")] = None,
 ) -> None:
     """
     Simple Kanban CLI tool
@@ -38,18 +60,49 @@ def main(
     Bebop is a tool for organizing your notes :memo:, tracking progress :chart_increasing:,
     or listing your pending tasks :white_check_mark:
     """
-    config = BebopConfig.load_config()
-    manager = BebopContext(config, board_name, dry_run, debug)
+    if ctx.obj is None:
+        trace_path = get_trace_path()
+        if debug or trace_path is not None:
+            tracer.enable()
+            ctx.call_on_close(lambda: report_trace(debug, trace_path))
+        with span("config.load"):
+            config = BebopConfig.load_config()
+        if board_name is not None and is_board_pattern(board_name):
+            if ctx.invoked_subcommand is not None and ctx.invoked_subcommand not in BoardSet.commands:
+                raise typer.BadParameter(
+                    f"'{ctx.invoked_subcommand}' only works on a single board", param_hint="'--board'"
+                )
+            manager = BoardSet.from_pattern(config, board_name, debug)
+        else:
+            manager = BebopContext(config, board_name, dry_run, debug)
+    else:
+        # El daemon indica el conjunto de contextos de los tableros que mantiene en memoria
+        manager = ctx.obj.get_context(board_name, debug)
+    try:
+        group_slice = columns.group_slice() if columns is not None else slice(None)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="'--cols'")
+    manager.view = render.KanbanView(rows, group_slice, page, TagFilter.parse(tags, not_tags))
     ctx.obj = manager
     if ctx.invoked_subcommand is None:
         manager.print_kanban()
 
 
+def report_trace(debug: bool, path: Optional[Path]) -> None:
+    """Mostrar en la salida de errores el resumen de los intervalos medidos, o escribirlos en el archivo de traza"""
+    elapsed = tracer.elapsed
+    tracer.disable()
+    if path is not None:
+        tracer.write_chrome_trace(path)
+    if debug:
+        Console(stderr=True).print(render.TraceSummary(tracer.summary(), elapsed))
+
+
 @app.command("post", rich_help_panel=HelpPanel.DATA)
 def add_post(
     ctx: typer.Context,
     title: str,
-    on_group: Annotated[IndexToken, typer.Argument(parser=IndexToken)],
+    on_group: Annotated[Token, typer.Argument(parser=Token.parse)],
     description: Annotated[Optional[str], typer.Option("--description", "-d")] = None,
     tags: Annotated[Optional[List[str]], typer.Option("--tag", "-t")] = None,
     todos: Annotated[Optional[List[str]], typer.Option("--todo", "-x")] = None,
@@ -60,7 +113,7 @@ def add_post(
 ) -> None:
     """Add a new [blue]Post[/]"""
     manager: BebopContext = ctx.obj
-    group, _ = manager.get_tree_by_index(on_group)
+    group, _ = manager.get_tree(on_group)
     post = Post(
         title=title,
         name=name,
@@ -71,7 +124,7 @@ def add_post(
         startDate=start_date,
         endDate=end_date,
     )
-    group.posts.append(post)
+    manager.add_post(group, post)
 
     manager.save_board()
     manager.print_kanban()
@@ -99,7 +152,7 @@ def add_group(
         comments=[Comment(text=x) for x in comments],
         posts=[Post(title=x) for x in posts],
     )
-    manager.board.posts.append(group)
+    manager.add_group(group)
     manager.save_board()
     manager.print_kanban()
 
@@ -108,7 +161,7 @@ def add_group(
 def add_element(
     ctx: typer.Context,
     title: str,
-    on_group: Annotated[IndexToken, typer.Option("--on-group", "-o", parser=IndexToken)] = None,
+    on_group: Annotated[Token, typer.Option("--on-group", "-o", parser=Token.parse)] = None,
     description: Annotated[Optional[str], typer.Option("--description", "-d")] = None,
     tags: Annotated[Optional[List[str]], typer.Option("--tag", "-t")] = None,
     todos: Annotated[Optional[List[str]], typer.Option("--todo", "-x")] = None,
@@ -130,23 +183,20 @@ def add_element(
 def push_elements(
     ctx: typer.Context,
     titles: List[str],
-    token: Annotated[Optional[IndexToken], typer.Option("--on-group", "-o", parser=IndexToken)] = None,
+    token: Annotated[Optional[Token], typer.Option("--on-group", "-o", parser=Token.parse)] = None,
 ) -> None:
     """
     Add multiple items at once
     """
     manager: BebopContext = ctx.obj
-    target_list = manager.board.posts
-    model = PostGroup
 
-    if token is not None:
-        group, _ = manager.get_tree_by_index(token)
-        target_list = group.posts
-        model = Post
-
-    for title in titles:
-        element = model(title=title)
-        target_list.append(element)
+    if token is None:
+        for title in titles:
+            manager.add_group(PostGroup(title=title))
+    else:
+        group, _ = manager.get_tree(token)
+        for title in titles:
+            manager.add_post(group, Post(title=title))
 
     manager.save_board()
     manager.print_kanban()
@@ -155,90 +205,85 @@ def push_elements(
 @app.command("rm", rich_help_panel=HelpPanel.DATA)
 def remove_elements(
     ctx: typer.Context,
-    tokens: Annotated[List[IndexToken], typer.Argument(parser=IndexToken)],
+    tokens: Annotated[List[Token], typer.Argument(parser=Token.parse)],
     omit_confirmation: Annotated[bool, typer.Option("--omit-confirmation", "-y")] = False,
 ) -> None:
     """
-    Remove all the given elements
+    Remove all the given elements, tokens can be ranges like [token]B3:B40[/] or [token]C:[/]
     """
     manager: BebopContext = ctx.obj
 
-    elements = []
+    paths = []
     for token in tokens:
-        group, post = manager.get_tree_by_index(token)
-        element = group if post is None else post
-        source_list = manager.board.posts if post is None else group.posts
-        if not omit_confirmation:
-            panel = render.ElementInfo(element, token, manager.config)
-            manager.console.print(panel)
-            style = "group" if post is None else "post"
-            result = Confirm.ask(
-                f"Are you sure you want to delete [token]{token}[/] [{style}]{element.title}[/]?",
-                console=manager.console,
-                default=True,
-            )
-            if not result:
-                continue
-        elements.append((source_list, element))
-
-    for source_list, element in elements:
-        source_list.remove(element)
+        token_paths = list(manager.iter_paths(token))
+        if not omit_confirmation and not confirm_removal(manager, token, token_paths):
+            continue
+        paths.extend(token_paths)
 
+    manager.remove_elements(paths)
     manager.save_board()
     manager.print_kanban()
 
 
+def confirm_removal(manager: BebopContext, token: Token, paths: List[ElementPath]) -> bool:
+    from rich.prompt import Confirm
+
+    manager.require_interactive("Confirming a removal")
+
+    if isinstance(token, TokenRange):
+        question = f"Are you sure you want to delete the {len(paths)} elements of [token]{token}[/]?"
+    else:
+        element = get_element(manager.board, paths[0])
+        index_token = IndexToken.from_index(*paths[0])
+        manager.console.print(render.ElementInfo(element, index_token, manager.config))
+        style = "group" if len(paths[0]) == 1 else "post"
+        question = f"Are you sure you want to delete [token]{index_token}[/] [{style}]{element.title}[/]?"
+    return Confirm.ask(question, console=manager.console, default=True)
+
+
 @app.command("show", rich_help_panel=HelpPanel.VIEW)
 def show_elements(
     ctx: typer.Context,
-    tokens: Annotated[Optional[List[IndexToken]], typer.Argument(parser=IndexToken)] = None,
+    tokens: Annotated[Optional[List[Token]], typer.Argument(parser=Token.parse)] = None,
 ) -> None:
     """
     Show detailed view of the given elements
     """
-    manager: BebopContext = ctx.obj
+    manager: BebopContext | BoardSet = ctx.obj
 
-    if not len(tokens):
-        tokens = [IndexToken.from_index(idx) for idx in range(len(manager.board.posts))]
+    if isinstance(manager, BoardSet):
+        for element, token in manager.iter_elements(tokens):
+            manager.console.print(render.ElementInfo(element, token, manager.config))
+        return
 
-    for token in tokens:
-        group, post = manager.get_tree_by_index(token)
-        element = group if post is None else post
-        panel = render.ElementInfo(element, token, manager.config)
+    paths = (x for token in tokens for x in manager.iter_paths(token)) if len(tokens) else manager.iter_selected()
+    for path in paths:
+        element = get_element(manager.board, path)
+        panel = render.ElementInfo(element, IndexToken.from_index(*path), manager.config)
         manager.console.print(panel)
 
 
 @app.command("mv", rich_help_panel=HelpPanel.VIEW)
 def move_element(
     ctx: typer.Context,
-    from_token: Annotated[IndexToken, typer.Argument(parser=IndexToken)],
-    to_token: Annotated[IndexToken, typer.Argument(parser=IndexToken)],
+    from_token: Annotated[Token, typer.Argument(parser=Token.parse)],
+    to_token: Annotated[Token, typer.Argument(parser=Token.parse)],
 ) -> None:
     """
-    Move an Element
+    Move an Element, or a range of elements like [token]C:[/], before the target element
     """
     manager: BebopContext = ctx.obj
-    source_group, source_post = manager.get_tree_by_index(from_token)
-    source_element = source_group if source_post is None else source_post
-
-    target_group, target_post = manager.get_tree_by_index(to_token)
-    target_element = target_group if target_post is None else target_post
+    target_group, target_post = manager.get_tree(to_token)
 
-    if isinstance(source_element, PostGroup) and isinstance(target_element, Post):
-        error = render.ErrorPanel("It is not possible to move a [group]PostGroup[/] to a [post]Post[/] position")
-        manager.console.print(error)
-        raise typer.Abort()
-
-    source_list = manager.board.posts if source_post is None else source_group.posts
-    source_list.remove(source_element)
-    target_list = manager.board.posts if target_post is None else target_group.posts
-
-    if isinstance(source_element, Post) and isinstance(target_element, PostGroup):
-        target_list = target_group.posts
-        target_list.append(source_element)
+    if not isinstance(from_token, TokenRange):
+        source_group, source_post = manager.get_tree(from_token)
+        if source_post is None and target_post is not None:
+            manager.abort("It is not possible to move a [group]PostGroup[/] to a [post]Post[/] position")
+        manager.move_element((source_group, source_post), (target_group, target_post))
     else:
-        target_index = target_list.index(target_element)
-        target_list.insert(target_index, source_element)
+        if not from_token.is_post_range and target_post is not None:
+            manager.abort("It is not possible to move a [group]PostGroup[/] to a [post]Post[/] position")
+        manager.move_elements(list(manager.iter_paths(from_token)), (target_group, target_post))
 
     manager.save_board()
     manager.print_kanban()
@@ -247,7 +292,7 @@ def move_element(
 @app.command("edit", rich_help_panel=HelpPanel.DATA)
 def edit_element(
     ctx: typer.Context,
-    token: Annotated[Optional[IndexToken], typer.Argument(parser=IndexToken)] = None,
+    token: Annotated[Optional[Token], typer.Argument(parser=Token.parse)] = None,
     title: Annotated[Optional[str], typer.Option("--title", "-T", help="Set a new title")] = None,
     description: Annotated[Optional[str], typer.Option("--description", "-d", help="Set a new description")] = None,
     start_date: Annotated[Optional[datetime], typer.Option("--start-date", "-s", help="Set a new start date")] = None,
@@ -264,39 +309,42 @@ def edit_element(
         manager.print_kanban()
         token = manager.ask_token()
 
+    token = manager.resolve_token(token)
     group, post = manager.get_tree_by_index(token)
     element = group if post is None else post
+    fields = {}
 
     if title is not None:
-        element.title = title
+        fields["title"] = title
     if name is not None:
-        element.name = name
+        fields["name"] = name
     if description is not None:
-        element.description = description
+        fields["description"] = description
     if len(tags):
-        element.tags = tags
+        fields["tags"] = tags
 
     if len(todos):
         if isinstance(element, Post):
-            element.todos = [Todo(text=x) for x in todos]
+            fields["todos"] = [Todo(text=x) for x in todos]
         else:
             help_panel = render.HelpPanel("The [green]--todo[/] option only applies to [post]Post[/] elements")
             manager.console.print(help_panel)
 
     if start_date is not None:
         if isinstance(element, Post):
-            element.start_date = start_date
+            fields["start_date"] = start_date
         else:
             help_panel = render.HelpPanel("The [green]--start-date[/] option only applies to [post]Post[/] elements")
             manager.console.print(help_panel)
 
     if end_date is not None:
         if isinstance(element, Post):
-            element.end_date = end_date
+            fields["end_date"] = end_date
         else:
             help_panel = render.HelpPanel("The [green]--end-date[/] option only applies to [post]Post[/] elements")
             manager.console.print(help_panel)
 
+    manager.update_element(group, post, **fields)
     manager.save_board()
     info = render.ElementInfo(element, token, manager.config)
     manager.console.print(info)
@@ -305,8 +353,8 @@ def edit_element(
 @app.command("describe", rich_help_panel=HelpPanel.DATA)
 def edit_description(
     ctx: typer.Context,
-    token: Annotated[Optional[IndexToken], typer.Argument(parser=IndexToken)] = None,
-    description: Annotated[Optional[str], typer.Argument(parser=IndexToken)] = None,
+    token: Annotated[Optional[Token], typer.Argument(parser=Token.parse)] = None,
+    description: Annotated[Optional[str], typer.Argument()] = None,
 ) -> None:
     """
     Add or edit the description of the given Element
@@ -317,13 +365,18 @@ def edit_description(
         manager.print_kanban()
         token = manager.ask_token()
 
+    token = manager.resolve_token(token)
     group, post = manager.get_tree_by_index(token)
     element = group if post is None else post
 
     if description is None:
-        description = click.edit(element.description)
+        import click
+
+        manager.require_interactive("Editing a description")
 
-    element.description = description
+        description = click.edit(manager.read_description(element))
+
+    manager.update_element(group, post, description=description)
     manager.save_board()
 
     panel = render.ElementInfo(element, token, manager.config)
@@ -334,7 +387,7 @@ def edit_description(
 def insert_element(
     ctx: typer.Context,
     title: str,
-    token: Annotated[Optional[IndexToken], typer.Argument(parser=IndexToken)] = None,
+    token: Annotated[Optional[Token], typer.Argument(parser=Token.parse)] = None,
     description: Annotated[Optional[str], typer.Option("--description", "-d")] = None,
     tags: Annotated[Optional[List[str]], typer.Option("--tag", "-t")] = None,
     todos: Annotated[Optional[List[str]], typer.Option("--todo", "-x")] = None,
@@ -351,6 +404,7 @@ def insert_element(
         manager.print_kanban()
         token = manager.ask_token()
 
+    token = manager.resolve_token(token)
     group, post = manager.get_tree_by_index(token)
 
     if post is None:
@@ -362,8 +416,7 @@ def insert_element(
             comments=[Comment(text=x) for x in comments],
             posts=[Post(title=x) for x in posts],
         )
-        idx = manager.board.posts.index(group)
-        manager.board.posts.insert(idx, element)
+        manager.add_group(element, manager.get_path(group)[0])
     else:
         element = Post(
             title=title,
@@ -375,54 +428,125 @@ def insert_element(
             startDate=start_date,
             endDate=end_date,
         )
-        idx = group.posts.index(post)
-        group.posts.insert(idx, element)
+        manager.add_post(group, element, manager.get_path(group, post)[1])
 
     manager.save_board()
     manager.print_kanban()
 
 
 @app.command("archive", rich_help_panel=HelpPanel.VIEW)
-def archive_elements() -> None:
-    """[dim]Coming soon... :smile:[/]"""
-    pass
+def archive_elements(
+    ctx: typer.Context,
+    targets: Annotated[
+        Optional[List[str]], typer.Argument(help="Tokens to archive, or archive entry numbers with --restore")
+    ] = None,
+    list_entries: Annotated[bool, typer.Option("--list", "-l", help="List the archived elements")] = False,
+    search: Annotated[
+        Optional[str], typer.Option("--search", "-s", help="List the archived elements that contain the text")
+    ] = None,
+    restore: Annotated[bool, typer.Option("--restore", "-r", help="Move archive entries back to the board")] = False,
+) -> None:
+    """
+    Move elements out of the board to its archive, tokens can be ranges like [token]B3:B40[/] or [token]C:[/]
+    """
+    manager: BebopContext = ctx.obj
+
+    if list_entries or search is not None:
+        entries = manager.archive if search is None else manager.archive.search(search)
+        manager.console.print(render.ArchiveList(entries, manager.config))
+        return
+
+    if not targets:
+        raise typer.BadParameter("Missing tokens or archive entry numbers", param_hint="TARGETS")
+
+    if restore:
+        manager.restore_elements(parse_entry_numbers(targets))
+    else:
+        try:
+            tokens = [Token.parse(x) for x in targets]
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="TARGETS")
+        manager.archive_elements([x for token in tokens for x in manager.iter_paths(token)])
+
+    manager.save_board()
+    manager.print_kanban()
+
+
+def parse_entry_numbers(values: List[str]) -> Set[int]:
+    """
+    Obtener los números de entradas del archivo, admite rangos como 3:7
+
+    :raises typer.BadParameter: Si algún valor no es un número o un rango de números
+    """
+    numbers = set()
+    for value in values:
+        start, _, end = value.partition(":")
+        if not start.isdigit() or not (end or start).isdigit():
+            raise typer.BadParameter(f"'{value}' is not an archive entry number", param_hint="TARGETS")
+        numbers.update(range(int(start), int(end or start) + 1))
+    return numbers
+
+
+@app.command("search", rich_help_panel=HelpPanel.VIEW)
+def search_elements(
+    ctx: typer.Context,
+    query: Annotated[List[str], typer.Argument(help="Words to find, a word ending in * matches as a prefix")],
+    limit: Annotated[int, typer.Option("--limit", "-n", min=1, help="Maximum number of results")] = 20,
+) -> None:
+    """
+    Find groups and posts by their title, tags, description, todos and comments
+    """
+    manager: BebopContext | BoardSet = ctx.obj
+    results = manager.search(" ".join(query), limit)
+    manager.console.print(render.SearchResults(results, manager.config))
+
+
+@app.command("tags", rich_help_panel=HelpPanel.VIEW)
+def list_tags(ctx: typer.Context) -> None:
+    """
+    List the tags of the board with the number of elements using each one
+    """
+    manager: BebopContext | BoardSet = ctx.obj
+    counts = manager.tag_counts() if isinstance(manager, BoardSet) else manager.tags.counts()
+    manager.console.print(render.TagList(counts))
 
 
 @app.command("todo", rich_help_panel=HelpPanel.DATA)
 def append_todo(
     ctx: typer.Context,
     text: str,
-    token: Annotated[Optional[IndexToken], typer.Argument(parser=IndexToken)] = None,
+    token: Annotated[Optional[Token], typer.Argument(parser=Token.parse)] = None,
     checked: Annotated[bool, typer.Option("--checked", "-X")] = False,
 ) -> None:
     """
-    Append a new To-Do to the given [blue]Post[/]
+    Append a new To-Do to the given [blue]Post[/], or to every Post of a range like [token]B3:B40[/]
     """
     manager: BebopContext = ctx.obj
     if token is None:
         manager.print_kanban()
         token = manager.ask_token()
 
-    group, post = manager.get_tree_by_index(token)
-    if post is None:
-        error = render.ErrorPanel("A [group]PostGroup[/] element does not support todos")
-        manager.console.print(error)
-        raise typer.Abort()
+    paths = list(manager.iter_paths(token))
+    if any(len(x) == 1 for x in paths):
+        manager.abort("A [group]PostGroup[/] element does not support todos")
 
-    todo = Todo(text=text, checked=checked)
-    post.todos.append(todo)
+    manager.add_todos(paths, Todo(text=text, checked=checked))
 
     manager.save_board()
 
-    info = render.ElementInfo(post, token, manager.config)
-    manager.console.print(info)
+    if isinstance(token, TokenRange):
+        manager.print_kanban()
+    else:
+        post = get_element(manager.board, paths[0])
+        info = render.ElementInfo(post, IndexToken.from_index(*paths[0]), manager.config)
+        manager.console.print(info)
 
 
 @app.command("comment", rich_help_panel=HelpPanel.DATA)
 def append_comment(
     ctx: typer.Context,
     text: str,
-    token: Annotated[Optional[IndexToken], typer.Argument(parser=IndexToken)] = None,
+    token: Annotated[Optional[Token], typer.Argument(parser=Token.parse)] = None,
 ) -> None:
     """
     Append a new comment to the given Element
@@ -432,11 +556,12 @@ def append_comment(
         manager.print_kanban()
         token = manager.ask_token()
 
+    token = manager.resolve_token(token)
     group, post = manager.get_tree_by_index(token)
     element = group if post is None else post
 
     comment = Comment(text=text)
-    element.comments.append(comment)
+    manager.add_comment(group, post, comment)
     manager.save_board()
 
     info = render.ElementInfo(element, token, manager.config)
@@ -446,7 +571,7 @@ def append_comment(
 @app.command("checkmarks", rich_help_panel=HelpPanel.DATA)
 def edit_post_checkmarks(
     ctx: typer.Context,
-    token: Annotated[Optional[IndexToken], typer.Argument(parser=IndexToken)] = None,
+    token: Annotated[Optional[Token], typer.Argument(parser=Token.parse)] = None,
 ) -> None:
     """
     Edit the checkmarks of the given [blue]Post[/] To-Do's
@@ -456,11 +581,10 @@ def edit_post_checkmarks(
         manager.print_kanban()
         token = manager.ask_token()
 
-    _, post = manager.get_tree_by_index(token)
+    token = manager.resolve_token(token)
+    group, post = manager.get_tree_by_index(token)
     if post is None:
-        error = render.ErrorPanel("A [group]PostGroup[/] element does not support todos")
-        manager.console.print(error)
-        raise typer.Abort()
+        manager.abort("A [group]PostGroup[/] element does not support todos")
 
     if not len(post.todos):
         error = render.ErrorPanel(
@@ -469,21 +593,242 @@ def edit_post_checkmarks(
         manager.console.print(error)
         raise typer.Exit()
 
+    import curses
+    from bebop.cli.helpers import render_checkmarks_menu
+
+    manager.require_interactive("Editing checkmarks")
+
     curses.wrapper(render_checkmarks_menu(post))
+    manager.update_element(group, post, todos=post.todos)
     manager.save_board()
 
     info = render.ElementInfo(post, token, manager.config)
     manager.console.print(info)
 
 
+@app.command("watch", rich_help_panel=HelpPanel.VIEW)
+def watch_board(
+    ctx: typer.Context,
+    delay: Annotated[
+        float, typer.Option("--delay", "-d", help="Seconds without changes to wait before reloading the board")
+    ] = 0.2,
+    poll: Annotated[bool, typer.Option("--poll", help="Check the board files periodically instead of inotify")] = False,
+) -> None:
+    """
+    Display the Kanban and redraw it every time the board is saved, until stopped with Ctrl+C
+    """
+    from bebop.cli.watch import BoardWatch, FrameWriter, PollingWatcher, get_watcher
+
+    manager: BebopContext = ctx.obj
+    manager.require_interactive("Watching the board")
+    manager.board
+    paths = manager.storage.content_paths()
+    watcher = PollingWatcher(paths) if poll else get_watcher(paths)
+    try:
+        with manager.console.screen(hide_cursor=True):
+            BoardWatch(manager, FrameWriter(manager.console.file)).run(watcher, delay)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+@app.command("tui", rich_help_panel=HelpPanel.VIEW)
+def open_board_tui(ctx: typer.Context) -> None:
+    """
+    Browse and edit the board in a full screen terminal interface
+    """
+    manager: BebopContext = ctx.obj
+    import curses
+    from bebop.cli.tui import run_board_tui
+
+    manager.require_interactive("The terminal interface")
+    curses.wrapper(run_board_tui(manager))
+
+
 @app.command("open", rich_help_panel=HelpPanel.UTILS)
 def open_board_file(ctx: typer.Context) -> None:
     """
     Open the current board file in your preferred editor
     """
     manager: BebopContext = ctx.obj
+    manager.compact_board()
     typer.launch(str(manager.board_path))
 
 
+@app.command("migrate", rich_help_panel=HelpPanel.UTILS)
+def migrate_board(
+    ctx: typer.Context,
+    target: Annotated[StorageKind, typer.Argument(help="Storage format to convert the board to")],
+    force: Annotated[bool, typer.Option("--force", "-f", help="Overwrite the target file if it exists")] = False,
+) -> None:
+    """
+    Convert the current board to another storage format
+    """
+    manager: BebopContext = ctx.obj
+    storage = manager.get_storage(target)
+
+    if storage.path == manager.board_path:
+        manager.compact_board()
+    elif storage.exists() and not force:
+        manager.abort(f"The file '{storage.path}' already exists, use [green]--force[/] to overwrite it")
+    elif not manager.dry_run:
+        with manager.lock.acquire(exclusive=True):
+            storage.write(manager.board)
+
+    help_panel = render.HelpPanel(
+        f"The board [board]{manager.board.title}[/] is stored in '{storage.path}'.\n"
+        f'Set [green]"storage": "{target}"[/] in \'{manager.config.get_config_path()}\' to use it'
+    )
+    manager.console.print(help_panel)
+
+
+@app.command("export", rich_help_panel=HelpPanel.UTILS)
+def export_board(
+    ctx: typer.Context,
+    record_format: Annotated[RecordFormat, typer.Option("--format", "-f", help="Format of the records")] = "ndjson",
+) -> None:
+    """
+    Write the groups and posts of the board to the standard output, one record per element
+    """
+    from bebop.storage.records import WRITERS, iter_records
+
+    manager: BebopContext = ctx.obj
+    records = iter_records(manager.board, manager.selection, manager.descriptions.read)
+    with span("export"):
+        WRITERS[record_format](records, sys.stdout)
+    sys.stdout.flush()
+
+
+@app.command("import", rich_help_panel=HelpPanel.UTILS)
+def import_elements(
+    ctx: typer.Context,
+    path: Annotated[
+        Path, typer.Argument(exists=True, dir_okay=False, allow_dash=True, help="File with the records, - for stdin")
+    ],
+    record_format: Annotated[
+        Optional[RecordFormat],
+        typer.Option("--format", "-f", help="Format of the records, by default taken from the file extension"),
+    ] = None,
+    on_group: Annotated[
+        Optional[Token], typer.Option("--on-group", "-o", parser=Token.parse, help="Group of every imported post")
+    ] = None,
+) -> None:
+    """
+    Add the groups and posts of an NDJSON or CSV file, like the ones written by [green]export[/]
+
+    Groups are matched by title, posts go to the group of their [green]group[/] field, which is created if it
+    doesn't exist. Nothing is saved if any record is invalid.
+    """
+    from bebop.storage.records import READERS, RecordError, iter_batches
+
+    manager: BebopContext = ctx.obj
+    record_format = record_format or (RecordFormat.CSV if path.suffix.lower() == ".csv" else RecordFormat.NDJSON)
+    if record_format not in READERS:
+        raise typer.BadParameter(f"Records can't be imported from {record_format}", param_hint="'--format'")
+
+    target = manager.get_tree(on_group)[0] if on_group is not None else None
+    target_idx = index_of(manager.board.posts, target) if target is not None else None
+    groups = {}
+    for idx, group in iter_elements(manager.board.posts):
+        groups.setdefault(get_field(group, "title"), idx)
+
+    added = {PostGroup: 0, Post: 0}
+    source = sys.stdin if str(path) == "-" else path.open(newline="", encoding="utf-8")
+    try:
+        for batch in iter_batches(READERS[record_format](source)):
+            # Los posts de cada lote se agregan a su grupo con una sola operación
+            posts: Dict[int, List[Post]] = {}
+            for number, element, title in batch:
+                if isinstance(element, PostGroup):
+                    if element.title in groups:
+                        continue
+                    manager.add_group(element)
+                    groups[element.title] = len(manager.board.posts) - 1
+                elif target is not None:
+                    posts.setdefault(target_idx, []).append(element)
+                elif title is None:
+                    manager.abort(f"Record {number}: the post has no group, use [green]--on-group[/] to choose one")
+                else:
+                    if title not in groups:
+                        manager.add_group(PostGroup(title=title))
+                        groups[title] = len(manager.board.posts) - 1
+                    posts.setdefault(groups[title], []).append(element)
+                added[type(element)] += 1
+            for idx, items in posts.items():
+                manager.add_posts(manager.board.posts[idx], items)
+    except RecordError as e:
+        manager.abort(str(e))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    manager.save_board()
+    manager.console.print(
+        render.HelpPanel(
+            f"Imported {added[PostGroup]} groups and {added[Post]} posts to [board]{manager.board.title}[/]"
+        )
+    )
+
+
+@app.command("batch", rich_help_panel=HelpPanel.UTILS)
+def run_batch(
+    ctx: typer.Context,
+    source: Annotated[typer.FileText, typer.Argument(help="File with one command per line, by default stdin")] = "-",
+    atomic: Annotated[bool, typer.Option("--atomic", "-a", help="Do not save anything if a command fails")] = False,
+    print_output: Annotated[bool, typer.Option("--print", "-p", help="Print the output of every command")] = False,
+) -> None:
+    """
+    Run many commands over the board, loading and saving it only once
+
+    Each line is a command with its arguments, like [green]post "Title" A[/],
+    or a JSON list of arguments. Empty lines and lines starting with # are ignored.
+    """
+    from rich.console import Console
+    from bebop.cli.batch import run_commands, iter_commands
+
+    manager: BebopContext = ctx.obj
+    report_console = manager.console
+    if not print_output:
+        manager.console = Console(theme=manager.theme, quiet=True)
+    manager.interactive = False
+    manager.autosave = False
+
+    results = run_commands(ctx.parent, iter_commands(source), stop_on_error=atomic)
+    failed = any(not x.ok for x in results)
+
+    manager.console = report_console
+    manager.autosave = True
+    if not (atomic and failed):
+        manager.save_board()
+    manager.console.print(render.BatchReport(results, saved=not (atomic and failed) and not manager.dry_run))
+    if failed:
+        raise typer.Exit(1)
+
+
+@app.command("daemon", rich_help_panel=HelpPanel.UTILS)
+def run_daemon(
+    ctx: typer.Context,
+    socket_path: Annotated[Optional[str], typer.Option("--socket", envvar="BEBOP_SOCKET")] = None,
+) -> None:
+    """
+    Keep the boards in memory and run the commands sent by [green]bebop[/], until stopped with Ctrl+C
+    """
+    import asyncio
+    import os
+    from bebop.cli.client import get_socket_path
+    from bebop.cli.daemon import Daemon, is_running
+
+    manager: BebopContext = ctx.obj
+    path = socket_path or get_socket_path()
+    if is_running(path):
+        manager.abort(f"A daemon is already listening on '{path}'")
+    if os.path.exists(path):
+        os.unlink(path)
+
+    manager.console.print(render.HelpPanel(f"Listening on '{path}'"))
+    asyncio.run(Daemon(manager.config, path).serve())
+
+
 if __name__ == "__main__":
     app()
@@ -1,16 +1,26 @@
-from dataclasses import dataclass
-from typing import List, Union
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from rich import box
 from rich.console import RenderResult, ConsoleOptions, Console, ConsoleRenderable, Group
-from rich.markdown import Markdown
 from rich.panel import Panel
+from rich.markup import escape
 from rich.table import Table
 
 from bebop.models import Board, PostGroup, Post, Comment
+from bebop.storage.archive import ArchiveEntry
+from bebop.storage.names import get_field, iter_elements
+from bebop.storage.tags import TagFilter, TagSelection
 from bebop.token import IndexToken
+from bebop.trace import SpanSummary, span
+from .batch import CommandResult
 from .config import BebopConfig
 
+if TYPE_CHECKING:
+    from bebop.storage.search import SearchResult
+
 
 def tags_line(tags: List[str]) -> str:
     return " ".join([f"[tag]{x}[/]" for x in tags])
@@ -84,12 +94,22 @@ class PostPlate:
 
 @dataclass
 class DescriptionBox:
-    """Renderizar panel de descripción"""
+    """Renderizar panel de descripción, la de un archivo se lee al renderizar"""
 
-    description: str
+    description: Optional[str] = None
+    path: Optional[Path] = None
 
     def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
-        group = Group("", Markdown(self.description), "")
+        from rich.markdown import Markdown
+
+        from bebop.storage.descriptions import read_text
+
+        description = self.description if self.path is None else read_text(self.path)
+        if description is None:
+            content = f"[error]The description file '{escape(str(self.path))}' doesn't exist[/]"
+        else:
+            content = Markdown(description)
+        group = Group("", content, "")
         yield Panel(
             group,
             title=":memo: Description",
@@ -188,14 +208,20 @@ class ElementInfo:
             parts.append(DescriptionBox(self.element.description))
             parts.append("")
 
+        if self.element.description_file is not None:
+            parts.append(DescriptionBox(path=self.config.get_root_path() / self.element.description_file))
+            parts.append("")
+
         if len(getattr(self.element, "todos", [])):
             parts.append(TodosBox(self.element))
             parts.append("")
 
         if getattr(self.element, "posts", None) is not None:
             if len(self.element.posts):
-                for sub_idx, post in enumerate(self.element.posts):
-                    token = IndexToken.from_index(self.token.main_index, sub_idx)
+                tokens = IndexToken.iter_group(self.token.main_index, len(self.element.posts))
+                if self.token.board is not None:
+                    tokens = (x.with_board(self.token.board) for x in tokens)
+                for post, token in zip(self.element.posts, tokens):
                     parts.append(PostPlate(post, token, self.config))
             else:
                 help_panel = HelpPanel(
@@ -213,15 +239,68 @@ class ElementInfo:
             parts.append("")
 
         group = Group(*parts)
-        yield Panel(group, border_style=f"{self.style}.box", subtitle=self.element.author)
+        # Las partes se renderizan al consumir el panel, como la descripción guardada en un archivo
+        with span("render.element"):
+            yield Panel(group, border_style=f"{self.style}.box", subtitle=self.element.author)
+
+
+@dataclass
+class KanbanView:
+    """
+    Representa la ventana de filas y columnas del Kanban que se renderiza, y el filtro de etiquetas de los posts
+
+    Si se indica el tablero, los tokens se muestran precedidos por su nombre.
+    """
+
+    rows: Optional[int] = None
+    columns: slice = field(default_factory=lambda: slice(None))
+    page: int = 1
+    tags: TagFilter = field(default_factory=TagFilter)
+    board: Optional[str] = None
+
+    @property
+    def is_windowed(self) -> bool:
+        return self.rows is not None or self.columns != slice(None) or not self.tags.is_empty
+
+    @property
+    def row_slice(self) -> slice:
+        if self.rows is None:
+            return slice(None)
+        return slice((self.page - 1) * self.rows, self.page * self.rows)
+
+
+def iter_active(items: List[Any]) -> Iterator[Tuple[int, Any]]:
+    """Recorrer las posiciones de los elementos no archivados sin validar los que están en formato JSON"""
+    for idx, item in iter_elements(items):
+        if not get_field(item, "archived", False):
+            yield idx, item
 
 
 @dataclass
 class Kanban:
-    """Renderiza el Kanban"""
+    """
+    Renderiza el Kanban
+
+    Sólo se crean las tarjetas de los grupos y posts que entran en la ventana de la vista. Con un filtro
+    de etiquetas los posts se toman de la selección del índice, sin recorrer los que no la cumplen.
+    """
 
     board: Board
     config: BebopConfig
+    view: KanbanView = field(default_factory=KanbanView)
+    selection: Optional[TagSelection] = None
+
+    def _iter_posts(self, main_idx: int, group: Any) -> Iterator[Tuple[int, Any]]:
+        posts = get_field(group, "posts", [])
+        if self.selection is None:
+            return iter_active(posts)
+        return (
+            (idx, x) for idx, x in self.selection.iter_posts(main_idx, posts) if not get_field(x, "archived", False)
+        )
+
+    def _token(self, idx: int, sub_idx: Optional[int] = None) -> IndexToken:
+        token = IndexToken.from_index(idx, sub_idx)
+        return token if self.view.board is None else token.with_board(self.view.board)
 
     def _render_group(self, group: PostGroup, token: IndexToken) -> ConsoleRenderable:
         return Group(
@@ -231,35 +310,210 @@ class Kanban:
             icons_line(group),
         )
 
+    def _columns(self) -> List["KanbanColumn"]:
+        """Obtener los grupos de la ventana con las posiciones y los posts de la página"""
+        positions = range(len(self.board.posts))[self.view.columns]
+        columns = []
+        for idx, _ in iter_active(self.board.posts[self.view.columns]):
+            group = self.board.posts[positions[idx]]
+            posts = list(
+                islice(self._iter_posts(positions[idx], group), self.view.row_slice.start, self.view.row_slice.stop)
+            )
+            columns.append((self, positions[idx], group, posts))
+        return columns
+
+    def _counts(self) -> Tuple[List[str], int]:
+        """Obtener el número de posts de cada grupo y el número de páginas de las columnas de la ventana"""
+        counts = []
+        pages = 1
+        visible = set(range(len(self.board.posts))[self.view.columns])
+        for idx, group in iter_active(self.board.posts):
+            count = sum(1 for _ in self._iter_posts(idx, group))
+            counts.append(f"[token]{self._token(idx)}[/] [group]{get_field(group, 'title')}[/] {count}")
+            if self.view.rows is not None and idx in visible:
+                pages = max(pages, -(-count // self.view.rows))
+        return counts, pages
+
+    def _render_summary(self) -> str:
+        counts, pages = self._counts()
+        return f"{'  '.join(counts)}\n[dim]Page {self.view.page}/{pages}[/]"
+
     def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
-        if not len(self.board.active_posts):
+        if next(iter_active(self.board.posts), None) is None:
             yield HelpPanel("Hola", self.config)
 
-        table = Table(
-            title=self.board.title,
-            title_style="board",
-            caption=self.board.author,
-            box=box.MINIMAL,
-            border_style="board.box",
-            expand=True,
-        )
+        if self.view.is_windowed:
+            yield self._render_summary()
+        yield kanban_table(self.board.title, self.board.author, self._columns())
+
+
+KanbanColumn = Tuple[Kanban, int, Any, List[Tuple[int, Any]]]
+
+
+def kanban_table(title: str, caption: Optional[str], columns: List[KanbanColumn]) -> Table:
+    """Crear la tabla del Kanban con una columna por grupo, cada grupo con los tokens de su Kanban"""
+    table = Table(
+        title=title,
+        title_style="board",
+        caption=caption,
+        box=box.MINIMAL,
+        border_style="board.box",
+        expand=True,
+    )
+    for kanban, main_idx, group, _ in columns:
+        table.add_column(kanban._render_group(group, kanban._token(main_idx)))
+
+    for row_idx in range(max([len(x[3]) for x in columns], default=0)):
+        row = []
+        for kanban, main_idx, group, posts in columns:
+            cell = ""
+            if row_idx < len(posts):
+                sub_idx = posts[row_idx][0]
+                cell = PostPlate(group.posts[sub_idx], kanban._token(main_idx, sub_idx), kanban.config)
+            row.append(cell)
+        table.add_row(*row)
+    return table
+
+
+@dataclass
+class MergedKanban:
+    """
+    Renderiza los Kanban de varios tableros en una sola tabla
+
+    Las columnas son los grupos de todos los tableros, en el orden de los tableros, y el resumen reúne
+    los grupos de todos con una sola cuenta de páginas.
+    """
+
+    kanbans: List[Kanban]
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        view = self.kanbans[0].view
+        if view.is_windowed:
+            counts = [x._counts() for x in self.kanbans]
+            lines = "  ".join(x for board_counts, _ in counts for x in board_counts)
+            yield f"{lines}\n[dim]Page {view.page}/{max(x[1] for x in counts)}[/]"
+
+        columns = [x for kanban in self.kanbans for x in kanban._columns()]
+        yield kanban_table(", ".join(x.board.title for x in self.kanbans), None, columns)
+
 
-        max_idx = 0
-        for idx, group in enumerate(self.board.active_posts):
-            token = IndexToken.from_index(idx)
-            header = self._render_group(group, token)
-            table.add_column(header)
-            max_idx = max(max_idx, len(group.active_posts))
-
-        for sub_idx in range(max_idx):
-            row = []
-            for main_idx, group in enumerate(self.board.active_posts):
-                cell = ""
-                if sub_idx < len(group.active_posts):
-                    post = group.posts[sub_idx]
-                    token = IndexToken.from_index(main_idx, sub_idx)
-                    cell = PostPlate(post, token, self.config)
-                row.append(cell)
-            table.add_row(*row)
+@dataclass
+class BatchReport:
+    """Renderiza el resultado de los comandos de un lote"""
+
+    results: List[CommandResult]
+    saved: bool
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        table = Table(box=box.SIMPLE, expand=True)
+        table.add_column("Line", justify="right", style="dim")
+        table.add_column("Command")
+        table.add_column("Result")
+        for result in self.results:
+            status = "[green]ok[/]" if result.ok else f"[error]{result.message}[/]"
+            table.add_row(str(result.line), escape(result.command), status)
+        yield table
+
+        failed = sum(1 for x in self.results if not x.ok)
+        summary = f"{len(self.results)} commands, {failed} failed. "
+        yield summary + ("Changes saved" if self.saved else "[error]Changes not saved[/]")
+
+
+@dataclass
+class ArchiveList:
+    """Renderiza las entradas del archivo de un tablero"""
+
+    entries: Iterable[Tuple[int, ArchiveEntry]]
+    config: BebopConfig
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        table = Table(box=box.SIMPLE, expand=True)
+        table.add_column("#", justify="right", style="token")
+        table.add_column("Title")
+        table.add_column("Group")
+        table.add_column("Tags")
+        table.add_column("Archived", style="date")
+        for number, entry in self.entries:
+            if entry.is_group:
+                title = f"[group]{escape(entry.title)}[/] [dim]({len(entry.data.get('posts', []))} posts)[/]"
+                group = ""
+            else:
+                title = f"[post]{escape(entry.title)}[/]"
+                group = f"[group]{escape(entry.group)}[/]"
+            tags = tags_line([escape(x) for x in entry.data.get("tags", [])])
+            table.add_row(str(number), title, group, tags, entry.archived_at.strftime(self.config.datetime_format))
+
+        if not table.row_count:
+            yield "[dim]No archived elements[/]"
+            return
+        yield table
+
+
+@dataclass
+class TagList:
+    """Renderiza las etiquetas del tablero con el número de elementos que las usan"""
 
+    counts: Dict[str, int]
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        if not len(self.counts):
+            yield "[dim]No tags[/]"
+            return
+
+        table = Table(box=box.SIMPLE)
+        table.add_column("Tag")
+        table.add_column("Elements", justify="right")
+        for tag, count in sorted(self.counts.items(), key=lambda x: (-x[1], x[0])):
+            table.add_row(f"[tag]{escape(tag)}[/]", str(count))
+        yield table
+
+
+@dataclass
+class SearchResults:
+    """Renderiza los resultados de una búsqueda con el fragmento de texto que coincide"""
+
+    results: List["SearchResult"]
+    config: BebopConfig
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        from bebop.storage.search import iter_snippet
+
+        if not len(self.results):
+            yield "[dim]No elements found[/]"
+            return
+
+        table = Table(box=box.SIMPLE, expand=True)
+        table.add_column("Token", style="token")
+        # Los títulos largos se recortan para que el fragmento siempre tenga espacio
+        table.add_column("Title", ratio=1, max_width=40, overflow="ellipsis", no_wrap=True)
+        table.add_column("Match", ratio=2, min_width=30, overflow="fold")
+        for result in self.results:
+            style = "group" if len(result.path) == 1 else "post"
+            snippet = "".join(
+                f"[bold]{escape(x)}[/]" if match else escape(x) for x, match in iter_snippet(result.snippet)
+            )
+            token = IndexToken.from_index(*result.path).with_board(result.board)
+            table.add_row(str(token), f"[{style}]{escape(result.title)}[/]", snippet)
+        yield table
+
+
+@dataclass
+class TraceSummary:
+    """Renderiza el tiempo y los contadores de los intervalos medidos durante un comando"""
+
+    spans: List[SpanSummary]
+    elapsed: int
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        table = Table(box=box.SIMPLE, title="Trace", title_style="dim")
+        table.add_column("Span")
+        table.add_column("Calls", justify="right")
+        table.add_column("Time", justify="right")
+        table.add_column("%", justify="right", style="dim")
+        table.add_column("Counts", style="dim")
+        for summary in self.spans:
+            counts = " ".join(f"{name}={value:,}" for name, value in summary.counts.items())
+            share = summary.duration * 100 / self.elapsed if self.elapsed else 0
+            table.add_row(summary.name, str(summary.calls), f"{summary.duration / 1e6:.2f} ms", f"{share:.0f}", counts)
+        table.add_row("total", "", f"{self.elapsed / 1e6:.2f} ms", "100", "", style="bold")
         yield table
@@ -0,0 +1,437 @@
+import curses
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from bebop.models import Comment, Post, PostGroup, Todo
+from bebop.storage.names import get_field
+from bebop.token import IndexToken
+from .context import BebopContext
+from .helpers import BACKSPACE_KEYS, ENTER_KEYS, ESCAPE_KEY, ChecklistState, ChecklistView, Key
+from .helpers import handle_key as handle_checklist_key
+from .render import iter_active
+
+HEADER_ROWS = 2
+FOOTER_ROWS = 1
+MIN_COLUMN_WIDTH = 24
+HELP = (
+    "Arrows move, H/J/K/L move the post, <n> new, <e> edit, <a> todo, <c> comment, <t> todos, <d> delete, "
+    "<s> save, <q> quit"
+)
+
+Cell = Tuple[int, int]
+
+
+@dataclass
+class Prompt:
+    """Representa un texto que se escribe en la línea de estado, al confirmarlo se pasa a `submit`"""
+
+    label: str
+    text: str
+    submit: Callable[[str], None]
+
+
+class BoardState:
+    """
+    Representa el estado de la interfaz de un tablero, separado de curses
+
+    Cada columna es un grupo no archivado, con su propio cursor y la posición de su primera fila visible.
+    Las acciones anotan las columnas y celdas que cambian para redibujar sólo esas. Los cambios se guardan
+    cuando pasan `save_delay` segundos sin otro cambio, así una ráfaga de ediciones produce una sola escritura.
+    """
+
+    def __init__(self, context: BebopContext, height: int, save_delay: float):
+        self.context = context
+        self.height = max(height, 1)
+        self.save_delay = save_delay
+        self.col = 0
+        self.left = 0
+        self.visible_columns = 1
+        self.rows: Dict[int, int] = {}
+        self.tops: Dict[int, int] = {}
+        self.dirty: Set[int] = set()
+        self.cells: Set[Cell] = set()
+        self.redraw = True
+        self.changed_at: Optional[float] = None
+        self.prompt: Optional[Prompt] = None
+        self.message = ""
+        self.groups: List[int] = []
+        self.sync()
+
+    def sync(self) -> None:
+        """Volver a leer las posiciones de los grupos, después de que el tablero cambie por otra vía"""
+        self.board = self.context.board
+        self.groups = [idx for idx, _ in iter_active(self.board.posts)]
+        self.col = min(self.col, max(len(self.groups) - 1, 0))
+        for col in range(len(self.groups)):
+            self.set_row(col, self.rows.get(col, 0))
+        self.redraw = True
+
+    @property
+    def group(self) -> Optional[PostGroup]:
+        return self.get_group(self.col)
+
+    @property
+    def row(self) -> int:
+        return self.rows.get(self.col, 0)
+
+    @property
+    def post(self) -> Optional[Post]:
+        group = self.group
+        if group is None or self.row >= len(group.posts):
+            return None
+        return group.posts[self.row]
+
+    @property
+    def token(self) -> IndexToken:
+        post = self.post
+        return IndexToken.from_index(self.groups[self.col], self.row if post is not None else None)
+
+    def get_group(self, col: int) -> Optional[PostGroup]:
+        return self.board.posts[self.groups[col]] if col < len(self.groups) else None
+
+    def get_size(self, col: int) -> int:
+        return len(self.get_group(col).posts)
+
+    def resize(self, height: int, visible_columns: int) -> None:
+        self.height = max(height, 1)
+        self.visible_columns = max(visible_columns, 1)
+        for col in range(len(self.groups)):
+            self.set_row(col, self.rows.get(col, 0))
+        self.scroll_columns()
+        self.redraw = True
+
+    def set_row(self, col: int, row: int) -> None:
+        """Mover el cursor de una columna, desplazando su ventana si hace falta para que contenga el cursor"""
+        size = self.get_size(col)
+        row = min(max(row, 0), max(size - 1, 0))
+        top = self.tops.get(col, 0)
+        top = min(max(top, row - self.height + 1), row)
+        top = max(min(top, size - self.height), 0)
+        if top != self.tops.get(col, 0):
+            self.dirty.add(col)
+        self.cells.update({(col, self.rows.get(col, 0)), (col, row)})
+        self.rows[col] = row
+        self.tops[col] = top
+
+    def scroll_columns(self) -> None:
+        left = min(max(self.left, self.col - self.visible_columns + 1), self.col)
+        left = max(min(left, len(self.groups) - self.visible_columns), 0)
+        if left != self.left:
+            self.left = left
+            self.redraw = True
+
+    def move(self, delta: int) -> None:
+        if len(self.groups):
+            self.set_row(self.col, self.row + delta)
+
+    def move_to(self, row: int) -> None:
+        if len(self.groups):
+            self.set_row(self.col, row)
+
+    def page(self, pages: int) -> None:
+        self.move(pages * self.height)
+
+    def move_column(self, delta: int) -> None:
+        col = min(max(self.col + delta, 0), len(self.groups) - 1)
+        if col == self.col or col < 0:
+            return
+        self.cells.update({(self.col, self.row), (col, self.rows.get(col, 0))})
+        self.col = col
+        self.scroll_columns()
+
+    def changed(self, *columns: int) -> None:
+        """Anotar un cambio del tablero en las columnas indicadas, reinicia la espera del guardado"""
+        self.dirty.update(columns)
+        self.changed_at = time.monotonic()
+
+    def move_post(self, columns: int = 0, rows: int = 0) -> None:
+        """Mover el post del cursor a otra posición de su grupo o a la misma fila de otro grupo"""
+        post = self.post
+        if post is None:
+            return
+        source = self.group
+        target_col = min(max(self.col + columns, 0), len(self.groups) - 1)
+        target = self.get_group(target_col)
+        if target_col != self.col:
+            row = self.row
+        else:
+            row = min(max(self.row + rows, 0), len(source.posts) - 1)
+            if row == self.row:
+                return
+
+        # El destino es el post antes del que se inserta, que al bajar en el mismo grupo es el siguiente
+        index = row + 1 if target is source and row > self.row else row
+        anchor = target.posts[index] if index < len(target.posts) else None
+        self.context.move_element((source, post), (target, anchor))
+        self.changed(self.col, target_col)
+        self.col = target_col
+        # Sin un post destino se agrega al final, si no queda en la fila del cursor
+        self.set_row(target_col, len(target.posts) - 1 if anchor is None else row)
+        self.scroll_columns()
+
+    def ask(self, label: str, submit: Callable[[str], None], text: str = "") -> None:
+        self.prompt = Prompt(label, text, submit)
+
+    def add_post(self, title: str) -> None:
+        group = self.group
+        if group is None or title == "":
+            return
+        self.context.add_post(group, Post(title=title))
+        self.changed(self.col)
+        self.set_row(self.col, len(group.posts) - 1)
+
+    def edit_title(self, title: str) -> None:
+        if self.post is None or title == "":
+            return
+        self.context.update_element(self.group, self.post, title=title)
+        self.changed()
+        self.cells.add((self.col, self.row))
+
+    def add_todo(self, text: str) -> None:
+        if self.post is None or text == "":
+            return
+        self.context.add_todo(self.group, self.post, Todo(text=text))
+        self.changed()
+        self.cells.add((self.col, self.row))
+
+    def add_comment(self, text: str) -> None:
+        if self.post is None or text == "":
+            return
+        self.context.add_comment(self.group, self.post, Comment(text=text))
+        self.changed()
+        self.cells.add((self.col, self.row))
+
+    def update_todos(self) -> None:
+        """Guardar las tareas del post del cursor después de editarlas"""
+        self.context.update_element(self.group, self.post, todos=self.post.todos)
+        self.changed()
+        self.redraw = True
+
+    def remove_post(self, answer: str) -> None:
+        if self.post is None or answer.lower() not in ("y", "yes"):
+            return
+        self.context.remove_element(self.group, self.post)
+        self.changed(self.col)
+        self.set_row(self.col, self.row)
+
+    def is_save_due(self, now: float) -> bool:
+        return self.changed_at is not None and now - self.changed_at >= self.save_delay
+
+    def save(self) -> None:
+        """Guardar los cambios pendientes, si otro proceso cambió el tablero se redibuja completo"""
+        if self.changed_at is None:
+            return
+        self.context.save_board()
+        self.changed_at = None
+        self.message = f"Saved revision {self.context.revision}"
+        if self.context.board is not self.board or len(self.groups) != sum(1 for _ in iter_active(self.board.posts)):
+            self.sync()
+
+
+KEYS: Dict[Key, Callable[[BoardState], None]] = {
+    curses.KEY_UP: lambda x: x.move(-1),
+    curses.KEY_DOWN: lambda x: x.move(1),
+    curses.KEY_LEFT: lambda x: x.move_column(-1),
+    curses.KEY_RIGHT: lambda x: x.move_column(1),
+    curses.KEY_PPAGE: lambda x: x.page(-1),
+    curses.KEY_NPAGE: lambda x: x.page(1),
+    curses.KEY_HOME: lambda x: x.move_to(0),
+    curses.KEY_END: lambda x: x.move_to(x.get_size(x.col) - 1),
+    "k": lambda x: x.move(-1),
+    "j": lambda x: x.move(1),
+    "h": lambda x: x.move_column(-1),
+    "l": lambda x: x.move_column(1),
+    "g": lambda x: x.move_to(0),
+    "G": lambda x: x.move_to(x.get_size(x.col) - 1),
+    "K": lambda x: x.move_post(rows=-1),
+    "J": lambda x: x.move_post(rows=1),
+    "H": lambda x: x.move_post(columns=-1),
+    "L": lambda x: x.move_post(columns=1),
+    "n": lambda x: x.ask("New post", x.add_post),
+    "e": lambda x: x.post is not None and x.ask("Title", x.edit_title, x.post.title),
+    "a": lambda x: x.post is not None and x.ask("New todo", x.add_todo),
+    "c": lambda x: x.post is not None and x.ask("New comment", x.add_comment),
+    "d": lambda x: x.post is not None and x.ask(f"Delete {x.token}? (y/n)", x.remove_post),
+    "s": BoardState.save,
+}
+
+
+def handle_key(state: BoardState, key: Key) -> bool:
+    """Aplicar una tecla sobre el estado de la interfaz, devuelve False si debe terminar"""
+    prompt = state.prompt
+    if prompt is not None:
+        if key in ENTER_KEYS:
+            state.prompt = None
+            prompt.submit(prompt.text)
+        elif key == ESCAPE_KEY:
+            state.prompt = None
+        elif key in BACKSPACE_KEYS:
+            prompt.text = prompt.text[:-1]
+        elif isinstance(key, str) and key.isprintable():
+            prompt.text += key
+        return True
+
+    state.message = ""
+    if key in ("q", "Q"):
+        return False
+    if key in KEYS:
+        KEYS[key](state)
+    return True
+
+
+class BoardView:
+    """
+    Renderiza el estado de la interfaz en una ventana de curses
+
+    Sólo se dibujan las columnas que entran en el ancho de la ventana y, de cada una, las filas de su
+    ventana. Entre teclas sólo se redibujan las columnas y celdas que el estado anotó y la línea de estado,
+    así el tiempo de cada cuadro no depende del tamaño del tablero.
+    """
+
+    def __init__(self, window: "curses.window", state: BoardState):
+        self.window = window
+        self.state = state
+        self.width = MIN_COLUMN_WIDTH
+
+    def layout(self) -> None:
+        """Ajustar el número y el ancho de las columnas y el alto de las filas al tamaño de la ventana"""
+        rows, columns = self.window.getmaxyx()
+        count = max(min(len(self.state.groups), columns // MIN_COLUMN_WIDTH), 1)
+        self.width = max(columns // count, 1)
+        self.state.resize(rows - HEADER_ROWS - FOOTER_ROWS, count)
+
+    def draw(self) -> None:
+        state = self.state
+        if state.redraw:
+            self.window.erase()
+            rows, columns = self.window.getmaxyx()
+            self.write(0, 0, f" {state.board.title}", columns, curses.A_BOLD | curses.A_UNDERLINE)
+            visible = range(state.left, min(state.left + state.visible_columns, len(state.groups)))
+            for col in visible:
+                self.draw_column(col)
+        else:
+            for col in sorted(state.dirty):
+                if self.is_visible(col):
+                    self.draw_column(col)
+            for col, row in sorted(state.cells):
+                if col not in state.dirty and self.is_visible(col):
+                    self.draw_cell(col, row)
+
+        self.draw_status()
+        state.dirty.clear()
+        state.cells.clear()
+        state.redraw = False
+        self.window.refresh()
+
+    def is_visible(self, col: int) -> bool:
+        return self.state.left <= col < self.state.left + self.state.visible_columns and col < len(self.state.groups)
+
+    def draw_column(self, col: int) -> None:
+        state = self.state
+        group = state.get_group(col)
+        x = (col - state.left) * self.width
+        attr = curses.A_BOLD | (curses.A_REVERSE if col == state.col and state.post is None else 0)
+        header = f"{IndexToken.from_index(state.groups[col])} {group.title} ({state.get_size(col)})"
+        self.write(1, x, header, self.width - 1, attr)
+        top = state.tops.get(col, 0)
+        for row in range(top, top + state.height):
+            self.draw_cell(col, row)
+
+    def draw_cell(self, col: int, row: int) -> None:
+        state = self.state
+        top = state.tops.get(col, 0)
+        if not top <= row < top + state.height:
+            return
+
+        y = HEADER_ROWS + row - top
+        x = (col - state.left) * self.width
+        group = state.get_group(col)
+        if row >= len(group.posts):
+            self.write(y, x, "", self.width - 1)
+            return
+
+        post = group.posts[row]
+        token = IndexToken.from_index(state.groups[col], row)
+        counts = ""
+        if len(post.todos):
+            counts += f" [{len(post.checked_todos)}/{len(post.todos)}]"
+        if len(post.comments):
+            counts += f" ({len(post.comments)})"
+        attr = curses.A_REVERSE if col == state.col and row == state.rows.get(col, 0) else 0
+        if get_field(post, "archived", False):
+            attr |= curses.A_DIM
+        self.write(y, x, f" {token} {post.title}{counts}", self.width - 1, attr)
+
+    def draw_status(self) -> None:
+        rows, columns = self.window.getmaxyx()
+        state = self.state
+        if state.prompt is not None:
+            text, attr = f" {state.prompt.label}: {state.prompt.text}_", curses.A_BOLD
+        else:
+            pending = " [modified]" if state.changed_at is not None else ""
+            text, attr = f" {state.message or HELP}{pending}", curses.A_DIM
+        self.write(rows - 1, 0, text, columns - 1, attr)
+
+    def write(self, y: int, x: int, text: str, width: int, attr: int = 0) -> None:
+        rows, columns = self.window.getmaxyx()
+        width = min(width, columns - x - 1)
+        if y >= rows or width <= 0:
+            return
+        # Se rellena con espacios para borrar el texto anterior sin limpiar el resto de la fila
+        self.window.addnstr(y, x, text.ljust(width), width, attr)
+
+
+def edit_todos(window: "curses.window", state: BoardState) -> None:
+    """Editar las tareas del post del cursor con el editor de tareas, en la misma ventana"""
+    post = state.post
+    if post is None or not len(post.todos):
+        state.message = "The post does not have any todos, add one with <a>"
+        return
+
+    checklist = ChecklistState(post.todos, ChecklistView.get_height(window.getmaxyx()[0]))
+    view = ChecklistView(window, checklist, post.title)
+    window.timeout(-1)
+    while True:
+        view.draw()
+        key = window.get_wch()
+        if key == curses.KEY_RESIZE:
+            checklist.resize(ChecklistView.get_height(window.getmaxyx()[0]))
+        elif not handle_checklist_key(checklist, key):
+            break
+    state.update_todos()
+
+
+def run_board_tui(context: BebopContext) -> Callable[["curses.window"], None]:
+    def inner(window: "curses.window") -> None:
+        window.keypad(True)
+        curses.cbreak()
+        curses.noecho()
+        curses.set_escdelay(25)
+
+        state = BoardState(context, 1, context.config.daemon_save_delay)
+        view = BoardView(window, state)
+        view.layout()
+        try:
+            while True:
+                if state.is_save_due(time.monotonic()):
+                    state.save()
+                view.draw()
+                # Sin teclas pendientes la espera termina a tiempo para el guardado
+                window.timeout(100 if state.changed_at is not None else -1)
+                try:
+                    key = window.get_wch()
+                except curses.error:
+                    continue
+
+                if key == curses.KEY_RESIZE:
+                    view.layout()
+                elif key == "t" and state.prompt is None:
+                    edit_todos(window, state)
+                    state.redraw = True
+                elif not handle_key(state, key):
+                    break
+        finally:
+            state.save()
+
+    return inner
@@ -0,0 +1,254 @@
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import struct
+import sys
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import IO, Dict, List, Optional, Tuple
+
+from .context import BebopContext
+from . import render
+
+DEBOUNCE_DELAY = 0.2
+POLL_INTERVAL = 0.5
+# Tiempo máximo de espera entre comprobaciones del tamaño de la terminal
+RESIZE_INTERVAL = 1.0
+HASH_CHUNK = 1 << 20
+
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+EVENTS_BUFFER = 64 * 1024
+
+
+def content_hash(paths: List[Path]) -> str:
+    """Obtener un hash del contenido de los archivos, los que no existen también cuentan"""
+    digest = hashlib.blake2b()
+    for path in paths:
+        try:
+            with path.open("rb") as f:
+                digest.update(b"+")
+                while chunk := f.read(HASH_CHUNK):
+                    digest.update(chunk)
+        except FileNotFoundError:
+            digest.update(b"-")
+    return digest.hexdigest()
+
+
+class Watcher(ABC):
+    """Representa la espera de cambios en unos archivos"""
+
+    @abstractmethod
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Esperar un cambio hasta `timeout` segundos, devuelve False si no hubo ninguno"""
+
+    def settle(self, delay: float) -> None:
+        """Esperar a que pasen `delay` segundos sin cambios, así una ráfaga de escrituras cuenta como un cambio"""
+        while self.wait(delay):
+            pass
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher(Watcher):
+    """
+    Espera los cambios con inotify, sin consumir CPU mientras no hay eventos
+
+    Se vigilan los directorios de los archivos y no los archivos, porque guardar reemplaza el archivo
+    con un renombrado. Los eventos de otros archivos del directorio, como el temporal, se descartan.
+
+    :raises OSError: Si inotify no está disponible
+    """
+
+    def __init__(self, paths: List[Path]):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.names: Dict[int, set] = {}
+        try:
+            for directory in {x.parent for x in paths}:
+                wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+                if wd < 0:
+                    raise OSError(ctypes.get_errno(), f"Can't watch '{directory}'")
+                self.names[wd] = {os.fsencode(x.name) for x in paths if x.parent == directory}
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return False
+            if self.read_events():
+                return True
+
+    def read_events(self) -> bool:
+        """Leer los eventos pendientes, devuelve True si alguno es de los archivos vigilados"""
+        try:
+            data = os.read(self.fd, EVENTS_BUFFER)
+        except BlockingIOError:
+            return False
+
+        matched = False
+        offset = 0
+        while offset < len(data):
+            wd, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            matched = matched or name in self.names.get(wd, ())
+        return matched
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingWatcher(Watcher):
+    """Espera los cambios comparando el inodo, el tamaño y la fecha de modificación de los archivos cada `interval`"""
+
+    def __init__(self, paths: List[Path], interval: float = POLL_INTERVAL):
+        self.paths = paths
+        self.interval = interval
+        self.stats = self.read_stats()
+
+    def read_stats(self) -> List[Optional[Tuple[int, int, int]]]:
+        stats = []
+        for path in self.paths:
+            try:
+                stat = path.stat()
+                stats.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+            except FileNotFoundError:
+                stats.append(None)
+        return stats
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = self.interval if deadline is None else deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.interval, remaining))
+            stats = self.read_stats()
+            if stats != self.stats:
+                self.stats = stats
+                return True
+
+
+def get_watcher(paths: List[Path]) -> Watcher:
+    """Obtener el watcher con inotify, o con sondeo si inotify no está disponible"""
+    try:
+        return InotifyWatcher(paths)
+    except (OSError, AttributeError):
+        return PollingWatcher(paths)
+
+
+class FrameWriter:
+    """
+    Escribe los cuadros de una vista de terminal a pantalla completa
+
+    Recuerda las líneas del cuadro anterior y sólo reescribe las que cambian, mueve el cursor a cada
+    una con secuencias ANSI y borra el resto de la línea.
+    """
+
+    def __init__(self, file: IO[str]):
+        self.file = file
+        self.lines: List[str] = []
+
+    def reset(self) -> None:
+        self.lines = []
+        self.file.write("\x1b[H\x1b[2J")
+
+    def draw(self, lines: List[str]) -> int:
+        """Escribir el cuadro, devuelve el número de líneas escritas"""
+        output = []
+        for y, line in enumerate(lines):
+            if y < len(self.lines) and self.lines[y] == line:
+                continue
+            output.append(f"\x1b[{y + 1};1H{line}\x1b[0m\x1b[K")
+        if len(lines) < len(self.lines):
+            output.append(f"\x1b[{len(lines) + 1};1H\x1b[J")
+
+        self.lines = lines
+        self.file.write("".join(output))
+        self.file.flush()
+        return len(output)
+
+
+class BoardWatch:
+    """
+    Mantiene el Kanban de un tablero al día con el tablero guardado
+
+    Ante un cambio de los archivos del tablero primero se compara su firma y luego el hash de su contenido,
+    y sólo si el contenido cambió se vuelve a cargar el tablero y a renderizar el Kanban.
+    """
+
+    def __init__(self, context: BebopContext, writer: FrameWriter):
+        self.context = context
+        self.writer = writer
+        self.signature: Optional[str] = None
+        self.digest: Optional[str] = None
+        self.size = None
+
+    def refresh(self) -> bool:
+        """Volver a cargar el tablero si su contenido cambió, devuelve True si se cargó"""
+        context = self.context
+        # Con el bloqueo compartido no se lee un guardado a medias
+        with context.lock.acquire():
+            if not context.storage.exists():
+                return False
+            signature = context.storage.signature()
+            if signature == self.signature:
+                return False
+            self.signature = signature
+            digest = content_hash(context.storage.content_paths())
+            if digest == self.digest:
+                return False
+            self.digest = digest
+            context.refresh_board()
+            context.board
+        return True
+
+    def render(self) -> List[str]:
+        """Renderizar el Kanban a las líneas de un cuadro, recortado al alto de la terminal"""
+        console = self.context.console
+        with console.capture() as capture:
+            console.print(
+                render.Kanban(self.context.board, self.context.config, self.context.view, self.context.selection)
+            )
+        return capture.get().splitlines()[: console.height]
+
+    def draw(self) -> int:
+        size = self.context.console.size
+        if size != self.size:
+            self.size = size
+            self.writer.reset()
+        return self.writer.draw(self.render())
+
+    def run(self, watcher: Watcher, delay: float = DEBOUNCE_DELAY) -> None:
+        self.refresh()
+        self.draw()
+        while True:
+            changed = watcher.wait(RESIZE_INTERVAL)
+            if changed:
+                watcher.settle(delay)
+            if (changed and self.refresh()) or self.context.console.size != self.size:
+                self.draw()
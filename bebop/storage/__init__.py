@@ -0,0 +1,3 @@
+from .lazy import LazyList, load_board, dump_board, dump_element
+from .base import BoardStorage
+from .jsonfile import JsonStorage, JournalStorage
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.alias_generators import to_camel
+
+from bebop.models import Board
+from .names import get_field, iter_elements
+from .operations import ElementPath
+
+SEARCH_FIELDS = ("title", "description", "name")
+
+
+class ArchiveEntry(BaseModel):
+    """
+    Representa un elemento archivado junto al grupo del que salió
+
+    `id` se escribe con la entrada y la identifica aunque otras entradas se eliminen del archivo.
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    archived_at: datetime = Field(default_factory=datetime.now)
+    group: Optional[str] = Field(default=None)
+    group_name: Optional[str] = Field(default=None)
+    data: Dict[str, Any]
+
+    @property
+    def is_group(self) -> bool:
+        return self.group is None
+
+    @property
+    def title(self) -> str:
+        return self.data.get("title", "")
+
+    def matches(self, text: str) -> bool:
+        """Comprobar si el texto aparece en el elemento, sus etiquetas, tareas, comentarios o posts"""
+        text = text.lower()
+        pending = [self.data]
+        while len(pending):
+            element = pending.pop()
+            values = [element.get(x) for x in SEARCH_FIELDS] + element.get("tags", [])
+            values.extend(x.get("text") for x in element.get("todos", []) + element.get("comments", []))
+            if any(text in x.lower() for x in values if x is not None):
+                return True
+            pending.extend(element.get("posts", []))
+        return False
+
+
+class Archive:
+    """
+    Representa el archivo frío de un tablero
+
+    Cada elemento archivado es una línea JSON que se agrega al final del archivo, que puede estar
+    comprimido con gzip. Sólo se lee al listar, buscar o restaurar, y las entradas se recorren sin
+    cargar el archivo completo. Las entradas se listan con su número de línea, empezando en 1, pero
+    se eliminan por su id, porque los números cambian cuando otro proceso restaura entradas.
+    """
+
+    def __init__(self, path: Path, compress: bool = False):
+        self.path = path.with_suffix(".archive.jsonl.gz" if compress else ".archive.jsonl")
+        self.compress = compress
+
+    def exists(self) -> bool:
+        return self.path.is_file()
+
+    def open(self, mode: str, path: Optional[Path] = None) -> IO[bytes]:
+        import gzip
+
+        path = path or self.path
+        # Agregar a un gzip crea un nuevo miembro, que se lee a continuación de los anteriores
+        return gzip.open(path, mode) if self.compress else path.open(mode)
+
+    def append(self, entries: List[ArchiveEntry]) -> None:
+        if not len(entries):
+            return
+
+        lines = [x.model_dump_json(by_alias=True).encode() + b"\n" for x in entries]
+        with self.open("ab") as f:
+            f.write(b"".join(lines))
+
+    def __iter__(self) -> Iterator[Tuple[int, ArchiveEntry]]:
+        """Recorrer las entradas con su número"""
+        for number, line in self._iter_lines():
+            yield number, load_entry(line)
+
+    def search(self, text: str) -> Iterator[Tuple[int, ArchiveEntry]]:
+        """Recorrer las entradas que contienen el texto, sin validar las líneas que no lo contienen"""
+        # El texto se busca primero como aparece escrito en el JSON y luego en los campos
+        needle = json.dumps(text.lower(), ensure_ascii=False)[1:-1]
+        for number, line in self._iter_lines():
+            if needle in line.decode().lower():
+                entry = load_entry(line)
+                if entry.matches(text):
+                    yield number, entry
+
+    def remove(self, ids: Set[str]) -> None:
+        """Eliminar las entradas con los ids indicados reescribiendo el archivo"""
+        if not len(ids):
+            return
+
+        temp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with self.open("wb", temp) as f:
+            for _, line in self._iter_lines():
+                if entry_id(line) not in ids:
+                    f.write(line)
+        temp.rename(self.path)
+
+    def _iter_lines(self) -> Iterator[Tuple[int, bytes]]:
+        if not self.exists():
+            return
+
+        with self.open("rb") as f:
+            for number, line in enumerate(f, start=1):
+                yield number, line
+
+
+def legacy_id(line: bytes) -> str:
+    """Obtener el id de una entrada escrita sin id, a partir del contenido de su línea"""
+    return hashlib.blake2b(line.strip(), digest_size=16).hexdigest()
+
+
+def entry_id(line: bytes) -> str:
+    """Obtener el id de la entrada de una línea sin validarla"""
+    value = json.loads(line).get("id")
+    return value if isinstance(value, str) else legacy_id(line)
+
+
+def load_entry(line: bytes) -> ArchiveEntry:
+    """Validar la entrada de una línea, las escritas sin id se identifican por su contenido"""
+    entry = ArchiveEntry.model_validate_json(line)
+    if "id" not in entry.model_fields_set:
+        entry.id = legacy_id(line)
+    return entry
+
+
+def get_date(element: Any, name: str) -> Optional[datetime]:
+    """Obtener una fecha de un modelo o de sus datos en formato JSON"""
+    if not isinstance(element, dict):
+        return getattr(element, name)
+
+    value = element.get(to_camel(name))
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def last_change(element: Any) -> datetime:
+    """Obtener la fecha más reciente del elemento entre su creación, su modificación y su fecha de fin"""
+    dates = [get_date(element, x) for x in ("created_at", "updated_at", "end_date")]
+    return max(x.replace(tzinfo=None) for x in dates if x is not None)
+
+
+def find_expired(board: Board, groups: Iterable[str], days: int, now: Optional[datetime] = None) -> List[ElementPath]:
+    """
+    Obtener las rutas de los posts que se deben archivar automáticamente
+
+    Son los posts marcados como archivados y los de los grupos indicados (por nombre o título) que no
+    han cambiado en los últimos `days` días. Los posts en formato JSON no se validan.
+    """
+    limit = (now or datetime.now()) - timedelta(days=days)
+    groups = {x.lower() for x in groups}
+
+    paths = []
+    for main_idx, group in iter_elements(board.posts):
+        names = {str(get_field(group, "name")).lower(), str(get_field(group, "title")).lower()}
+        expires = len(names & groups) > 0
+        for idx, post in iter_elements(get_field(group, "posts", [])):
+            if get_field(post, "archived", False) or (expires and last_change(post) < limit):
+                paths.append([main_idx, idx])
+    return paths
@@ -0,0 +1,47 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import ClassVar, List
+
+from bebop.models import Board
+from .operations import Operation
+
+
+def file_signature(path: Path) -> str:
+    """Obtener una firma que cambia cada vez que se reemplaza o modifica el archivo"""
+    stat = path.stat()
+    return f"{stat.st_ino}-{stat.st_size}-{stat.st_mtime_ns}"
+
+
+class BoardStorage(ABC):
+    """Representa el almacenamiento persistente de un tablero"""
+
+    suffix: ClassVar[str]
+
+    def __init__(self, path: Path):
+        self.path = path.with_suffix(self.suffix)
+
+    def exists(self) -> bool:
+        return self.path.is_file()
+
+    def content_paths(self) -> List[Path]:
+        """Obtener los archivos cuyo contenido determina el tablero guardado"""
+        return [self.path]
+
+    def signature(self) -> str:
+        """Obtener una firma del contenido almacenado, cambia con cada escritura"""
+        return file_signature(self.path) if self.exists() else ""
+
+    @abstractmethod
+    def load(self) -> Board:
+        """Cargar el tablero"""
+
+    @abstractmethod
+    def write(self, board: Board) -> None:
+        """Escribir el tablero completo, reemplazando el contenido anterior"""
+
+    def save(self, board: Board, operations: List[Operation]) -> None:
+        """Persistir las operaciones aplicadas sobre el tablero desde la última vez que se guardó"""
+        self.write(board)
+
+    def compact(self, board: Board) -> None:
+        """Dejar el archivo del tablero con todos los cambios aplicados"""
@@ -0,0 +1,374 @@
+import struct
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from bebop.models import Board, Post
+from .base import BoardStorage
+from .lazy import LazyList, load_group
+
+MAGIC = b"BEBOP\x00"
+VERSION = 2
+# La versión 1 no guarda las cadenas que usa cada bloque
+SUPPORTED_VERSIONS = {1, 2}
+# Parte de la tabla de cadenas sin uso a partir de la que se reconstruye al guardar
+MAX_UNUSED_STRINGS = 0.25
+HEADER = struct.Struct("<6sH")
+SECTION = struct.Struct("<Q")
+
+EPOCH = datetime(1970, 1, 1)
+NONE = -(2**63)
+AWARE = NONE + 1
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+FIELD_NAMES = {field.alias: name for name, field in Post.model_fields.items()}
+FIELD_NAMES.update(posts="posts", text="text", checked="checked")
+
+
+class FormatError(ValueError):
+    """Representa un archivo binario que no se puede leer"""
+
+
+def pack_sections(sections: List[bytes]) -> bytes:
+    chunks = []
+    for section in sections:
+        chunks.append(SECTION.pack(len(section)))
+        chunks.append(section)
+    return b"".join(chunks)
+
+
+def unpack_sections(data: bytes, offset: int = 0) -> List[bytes]:
+    sections = []
+    while offset < len(data):
+        (size,) = SECTION.unpack_from(data, offset)
+        offset += SECTION.size
+        sections.append(data[offset : offset + size])
+        offset += size
+    return sections
+
+
+def dump_array(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def load_array(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def dump_strings(values: List[Optional[str]]) -> List[bytes]:
+    """
+    Serializar una lista de cadenas como sus longitudes y un único bloque UTF-8
+
+    Las longitudes se guardan en caracteres para separar las cadenas después de decodificar el
+    bloque una sola vez, una longitud de -1 representa None.
+    """
+    lengths = array("i", [-1 if x is None else len(x) for x in values])
+    return [dump_array(lengths), "".join(x for x in values if x is not None).encode()]
+
+
+def load_strings(lengths: bytes, blob: bytes) -> List[Optional[str]]:
+    sizes = load_array("i", lengths)
+    text = blob.decode()
+    ends = accumulate(max(x, 0) for x in sizes)
+    return [None if size < 0 else text[end - size : end] for size, end in zip(sizes, ends)]
+
+
+def get_fields(element: Any) -> Dict[str, Any]:
+    """Obtener los campos de un modelo o de sus datos en formato JSON por su nombre"""
+    if isinstance(element, BaseModel):
+        return element.__dict__
+    return {FIELD_NAMES.get(key, key): value for key, value in element.items()}
+
+
+class GroupChunk:
+    """
+    Representa un grupo sin decodificar de un archivo binario
+
+    Sus cadenas repetidas son índices de la tabla `strings` del archivo del que se leyó.
+    """
+
+    def __init__(self, data: bytes, strings: List[str]):
+        self.data = data
+        self.strings = strings
+
+    def refs(self) -> Optional[array]:
+        """Obtener los índices de las cadenas que usa el bloque, None si el archivo no los guarda"""
+        sections = unpack_sections(memoryview(self.data))
+        return load_array("i", sections[4]) if len(sections) > 4 else None
+
+
+class ChunkEncoder:
+    """
+    Codifica un bloque del formato binario
+
+    Los campos se escriben en orden como enteros de 64 bits: las fechas en microsegundos desde
+    1970, las cadenas repetidas como índices de la tabla compartida y los textos en su propia
+    lista. El estado de las tareas se guarda en un bitset, y al final los índices de las cadenas
+    que usa el bloque.
+    """
+
+    def __init__(self, strings: List[str], indexes: Dict[str, int]):
+        self.strings = strings
+        self.indexes = indexes
+        self.used: Set[int] = set()
+        self.ints = array("q")
+        self.texts: List[Optional[str]] = []
+        self.checked = bytearray()
+        self.todo_count = 0
+
+    def dump(self) -> bytes:
+        refs = dump_array(array("i", sorted(self.used)))
+        return pack_sections([dump_array(self.ints), *dump_strings(self.texts), bytes(self.checked), refs])
+
+    def string(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+
+        index = self.indexes.get(value)
+        if index is None:
+            index = self.indexes[value] = len(self.strings)
+            self.strings.append(value)
+        self.used.add(index)
+        return index
+
+    def date(self, value: Any) -> None:
+        if value is None:
+            self.ints.append(NONE)
+            return
+
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        offset = value.utcoffset()
+        if offset is None:
+            self.ints.append((value - EPOCH) // ONE_MICROSECOND)
+        else:
+            wall = value.replace(tzinfo=None)
+            self.ints.extend([AWARE, (wall - EPOCH) // ONE_MICROSECOND, offset // ONE_MICROSECOND])
+
+    def base(self, data: Dict[str, Any]) -> None:
+        self.date(data["created_at"])
+        self.date(data["updated_at"])
+        self.ints.append(self.string(data["author"]))
+
+    def element(self, data: Dict[str, Any]) -> None:
+        self.base(data)
+        self.texts.extend([data["title"], data["description"], data["description_file"]])
+        self.ints.append(self.string(data["name"]))
+        self.ints.append(len(data["tags"]))
+        self.ints.extend([self.string(x) for x in data["tags"]])
+        self.ints.append(len(data["comments"]))
+        for comment in data["comments"]:
+            comment = get_fields(comment)
+            self.base(comment)
+            self.texts.append(comment["text"])
+
+    def group(self, data: Dict[str, Any]) -> None:
+        self.element(data)
+        self.ints.append(data["archived"])
+        self.ints.append(len(data["posts"]))
+        posts = data["posts"]
+        for post in posts.data if isinstance(posts, LazyList) else posts:
+            self.post(get_fields(post))
+
+    def post(self, data: Dict[str, Any]) -> None:
+        self.element(data)
+        self.ints.append(data["archived"])
+        self.date(data["start_date"])
+        self.date(data["end_date"])
+        self.ints.append(len(data["todos"]))
+        for todo in data["todos"]:
+            todo = get_fields(todo)
+            self.base(todo)
+            self.texts.append(todo["text"])
+            if self.todo_count % 8 == 0:
+                self.checked.append(0)
+            if todo["checked"]:
+                self.checked[-1] |= 1 << (self.todo_count % 8)
+            self.todo_count += 1
+
+
+class ChunkDecoder:
+    """Decodifica un bloque del formato binario a los datos en formato JSON que validan los modelos"""
+
+    def __init__(self, data: bytes, strings: List[str]):
+        ints, lengths, blob, checked, *_ = unpack_sections(data)
+        self.strings = strings
+        self.ints: Iterator[int] = iter(load_array("q", ints))
+        self.texts: Iterator[Optional[str]] = iter(load_strings(lengths, blob))
+        self.checked = checked
+        self.todo_count = 0
+
+    def date(self) -> Optional[datetime]:
+        value = next(self.ints)
+        if value == NONE:
+            return None
+        if value == AWARE:
+            wall = EPOCH + timedelta(microseconds=next(self.ints))
+            return wall.replace(tzinfo=timezone(timedelta(microseconds=next(self.ints))))
+        return EPOCH + timedelta(microseconds=value)
+
+    def string(self) -> Optional[str]:
+        index = next(self.ints)
+        return None if index < 0 else self.strings[index]
+
+    def base(self) -> Dict[str, Any]:
+        return {"createdAt": self.date(), "updatedAt": self.date(), "author": self.string()}
+
+    def element(self) -> Dict[str, Any]:
+        data = self.base()
+        data["title"] = next(self.texts)
+        data["description"] = next(self.texts)
+        data["descriptionFile"] = next(self.texts)
+        data["name"] = self.string()
+        data["tags"] = [self.strings[next(self.ints)] for _ in range(next(self.ints))]
+        data["comments"] = [{**self.base(), "text": next(self.texts)} for _ in range(next(self.ints))]
+        return data
+
+    def group(self) -> Dict[str, Any]:
+        data = self.element()
+        data["archived"] = bool(next(self.ints))
+        data["posts"] = [self.post() for _ in range(next(self.ints))]
+        return data
+
+    def post(self) -> Dict[str, Any]:
+        data = self.element()
+        data["archived"] = bool(next(self.ints))
+        data["startDate"] = self.date()
+        data["endDate"] = self.date()
+        data["todos"] = [self.todo() for _ in range(next(self.ints))]
+        return data
+
+    def todo(self) -> Dict[str, Any]:
+        data = self.base()
+        data["text"] = next(self.texts)
+        data["checked"] = bool(self.checked[self.todo_count // 8] >> (self.todo_count % 8) & 1)
+        self.todo_count += 1
+        return data
+
+
+def encode_chunks(board: Board, strings: List[str]) -> Tuple[List[bytes], Optional[Set[int]]]:
+    """
+    Codificar el bloque del tablero y los de sus grupos ampliando la tabla `strings`
+
+    Los grupos sin decodificar que se leyeron con la misma tabla se copian sin cambios. Devuelve también
+    los índices de las cadenas que usan los bloques, None si alguno copiado no los guarda.
+    """
+    indexes = {value: idx for idx, value in enumerate(strings)}
+    encoder = ChunkEncoder(strings, indexes)
+    encoder.element(get_fields(board))
+    chunks = [encoder.dump()]
+    used: Optional[Set[int]] = set(encoder.used)
+
+    groups = board.posts.data if isinstance(board.posts, LazyList) else board.posts
+    for group in groups:
+        if isinstance(group, GroupChunk) and group.strings is strings:
+            chunks.append(group.data)
+            refs = group.refs()
+            used = None if used is None or refs is None else used.union(refs)
+            continue
+
+        if isinstance(group, GroupChunk):
+            group = ChunkDecoder(group.data, group.strings).group()
+        encoder = ChunkEncoder(strings, indexes)
+        encoder.group(get_fields(group))
+        chunks.append(encoder.dump())
+        if used is not None:
+            used.update(encoder.used)
+    return chunks, used
+
+
+def encode_board(board: Board, strings: Optional[List[str]] = None) -> bytes:
+    """
+    Codificar un tablero en el formato binario
+
+    El archivo guarda la tabla de cadenas repetidas, un bloque con los campos del tablero y un
+    bloque por grupo. Si se indica la tabla `strings` de la que se leyó el tablero, se amplía
+    sin cambiar sus índices y los grupos que no se han decodificado se copian sin cambios. Cuando
+    más de una cuarta parte de la tabla ya no se usa se reconstruye con las cadenas en uso: la
+    tabla se reemplaza en la misma lista y los grupos sin decodificar pasan a usarla.
+    """
+    if strings is None:
+        strings = []
+        chunks, _ = encode_chunks(board, strings)
+    else:
+        chunks, used = encode_chunks(board, strings)
+        if used is None or len(used) < len(strings) * (1 - MAX_UNUSED_STRINGS):
+            table: List[str] = []
+            chunks, _ = encode_chunks(board, table)
+            groups = board.posts.data if isinstance(board.posts, LazyList) else board.posts
+            for group, chunk in zip(groups, chunks[1:]):
+                if isinstance(group, GroupChunk) and group.strings is strings:
+                    group.data = chunk
+            strings[:] = table
+
+    return HEADER.pack(MAGIC, VERSION) + pack_sections([*dump_strings(strings), pack_sections(chunks)])
+
+
+def decode_board(data: bytes, lazy: bool = False) -> Board:
+    """
+    Cargar un tablero del formato binario
+
+    Con `lazy` cada grupo se decodifica la primera vez que se accede a él.
+
+    :raises FormatError: Si los datos no son un tablero en un formato soportado
+    """
+    if len(data) < HEADER.size or HEADER.unpack_from(data)[0] != MAGIC:
+        raise FormatError("The file is not a bebop board")
+    version = HEADER.unpack_from(data)[1]
+    if version not in SUPPORTED_VERSIONS:
+        raise FormatError(f"Unsupported board format version {version}")
+
+    lengths, blob, body = unpack_sections(data, HEADER.size)
+    strings = load_strings(lengths, blob)
+    board_chunk, *group_chunks = unpack_sections(body)
+
+    raw = ChunkDecoder(board_chunk, strings).element()
+    if not lazy:
+        raw["posts"] = [ChunkDecoder(x, strings).group() for x in group_chunks]
+        return Board.model_validate(raw)
+
+    def load_chunk(chunk: GroupChunk):
+        return load_group(ChunkDecoder(chunk.data, chunk.strings).group())
+
+    board = Board.model_validate({**raw, "posts": []})
+    board.posts = LazyList([GroupChunk(x, strings) for x in group_chunks], load_chunk)
+    return board
+
+
+class BinaryStorage(BoardStorage):
+    """
+    Almacena el tablero como una instantánea binaria compacta
+
+    Se conserva la tabla de cadenas del último archivo leído para copiar sin cambios los
+    grupos que no se han decodificado.
+    """
+
+    suffix = ".bebop"
+
+    def __init__(self, path: Path, lazy: bool = False):
+        super().__init__(path)
+        self.lazy = lazy
+        self.strings: Optional[List[str]] = None
+
+    def load(self) -> Board:
+        board = decode_board(self.path.read_bytes(), self.lazy)
+        if isinstance(board.posts, LazyList) and len(board.posts):
+            self.strings = board.posts.data[0].strings
+        return board
+
+    def write(self, board: Board) -> None:
+        temp = self.path.with_suffix(".bebop.tmp")
+        temp.write_bytes(encode_board(board, self.strings))
+        temp.rename(self.path)
@@ -0,0 +1,99 @@
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Any, Iterator, Optional, Set
+
+from bebop.models import Board
+from .names import get_field, iter_elements
+from .operations import Operation, RemoveOperation, UpdateOperation
+
+# Los archivos recién escritos pueden pertenecer a cambios de otro proceso que aún no se han guardado
+COLLECT_GRACE = 3600.0
+
+
+def get_description_file(element: Any) -> Optional[str]:
+    """Obtener el archivo de descripción de un modelo o de sus datos en formato JSON"""
+    if isinstance(element, dict):
+        return element.get("descriptionFile")
+    return element.description_file
+
+
+def iter_description_files(board: Board) -> Iterator[str]:
+    """Recorrer los archivos de descripción que usa el tablero, sin validar los elementos en formato JSON"""
+    for _, group in iter_elements(board.posts):
+        for element in [group] + [x for _, x in iter_elements(get_field(group, "posts", []))]:
+            name = get_description_file(element)
+            if name is not None:
+                yield name
+
+
+def changes_description_file(operation: Operation) -> bool:
+    """Comprobar si después de la operación el tablero puede haber dejado de usar algún archivo de descripción"""
+    if isinstance(operation, UpdateOperation):
+        return "descriptionFile" in operation.fields
+    return isinstance(operation, RemoveOperation)
+
+
+def read_text(path: Path) -> Optional[str]:
+    """Leer un archivo de texto proyectándolo en memoria, None si no existe"""
+    import mmap
+
+    try:
+        with path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return data[:].decode(errors="replace")
+    except FileNotFoundError:
+        return None
+
+
+class DescriptionStore:
+    """
+    Representa los archivos de las descripciones largas de un tablero
+
+    Cada descripción se guarda en un archivo con el hash de su contenido como nombre, dentro del
+    directorio `<tablero>.descriptions` junto al tablero. Los elementos guardan la ruta relativa
+    al directorio raíz en `description_file`, así el tablero no carga ni reescribe el texto.
+    """
+
+    def __init__(self, root: Path, board_name: str):
+        self.root = root
+        self.prefix = f"{board_name}.descriptions"
+        self.directory = root / self.prefix
+
+    def is_managed(self, name: Optional[str]) -> bool:
+        return name is not None and name.startswith(f"{self.prefix}/")
+
+    def put(self, text: str) -> str:
+        """Guardar la descripción y obtener el nombre de su archivo"""
+        data = text.encode()
+        name = f"{self.prefix}/{hashlib.sha256(data).hexdigest()}.md"
+        path = self.root / name
+        if path.is_file():
+            # Renovar la fecha para que la limpieza no lo elimine antes de guardar el tablero
+            path.touch()
+            return name
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(f".{os.getpid()}.tmp")
+        temp.write_bytes(data)
+        temp.rename(path)
+        return name
+
+    def read(self, name: str) -> Optional[str]:
+        return read_text(self.root / name)
+
+    def collect(self, used: Set[str], grace: float = COLLECT_GRACE) -> int:
+        """Eliminar los archivos que ningún elemento usa, salvo los modificados hace menos de `grace` segundos"""
+        if not self.directory.is_dir():
+            return 0
+
+        limit = time.time() - grace
+        removed = 0
+        for path in self.directory.glob("*.md"):
+            if f"{self.prefix}/{path.name}" not in used and path.stat().st_mtime < limit:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
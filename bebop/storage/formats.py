@@ -0,0 +1,9 @@
+from enum import StrEnum
+
+
+class RecordFormat(StrEnum):
+    """Representa los formatos de exportación e importación de los elementos"""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+    MARKDOWN = "markdown"
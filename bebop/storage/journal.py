@@ -0,0 +1,97 @@
+import json
+import os
+from pathlib import Path
+from typing import List
+
+import pydantic
+
+from bebop.trace import span
+from .base import file_signature
+from .operations import Operation, get_operation_adapter
+
+TAIL_CHUNK = 4096
+
+
+class Journal:
+    """
+    Representa el registro de operaciones pendientes de compactar de un tablero
+
+    La primera línea del archivo guarda la firma de la instantánea sobre la que se
+    registraron las operaciones, si la instantánea cambia el registro se descarta.
+    """
+
+    def __init__(self, snapshot_path: Path):
+        self.snapshot_path = snapshot_path
+        self.path = snapshot_path.with_suffix(".journal")
+        self.count = 0
+
+    @property
+    def size(self) -> int:
+        return self.path.stat().st_size if self.path.is_file() else 0
+
+    def is_current(self) -> bool:
+        if not self.path.is_file() or not self.snapshot_path.is_file():
+            return False
+
+        with self.path.open("rb") as f:
+            header = f.readline()
+        try:
+            return json.loads(header).get("base") == file_signature(self.snapshot_path)
+        except ValueError:
+            return False
+
+    def read(self) -> List[Operation]:
+        """Leer las operaciones registradas sobre la instantánea actual"""
+        if not self.is_current():
+            self.count = 0
+            return []
+
+        operations = []
+        adapter = get_operation_adapter()
+        with self.path.open("rb") as f:
+            f.readline()
+            for line in f:
+                try:
+                    operations.append(adapter.validate_json(line))
+                except (pydantic.ValidationError, ValueError):
+                    # Una escritura interrumpida sólo puede dejar incompleta la última línea
+                    break
+        self.count = len(operations)
+        return operations
+
+    def append(self, operations: List[Operation]) -> None:
+        if not self.is_current():
+            header = json.dumps({"base": file_signature(self.snapshot_path)})
+            self.path.write_text(header + "\n")
+            self.count = 0
+        else:
+            self.repair()
+
+        with span("storage.serialize") as serialize:
+            # Los posts de las operaciones se escriben con los nombres de campo del tablero
+            data = "".join(x.model_dump_json(by_alias=True) + "\n" for x in operations)
+            serialize.add(bytes=len(data), operations=len(operations))
+        with span("storage.write", bytes=len(data)):
+            with self.path.open("a") as f:
+                f.write(data)
+        self.count += len(operations)
+
+    def repair(self) -> None:
+        """Eliminar la última línea si una escritura interrumpida la dejó incompleta, para leer las siguientes"""
+        with self.path.open("r+b") as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(position - TAIL_CHUNK, 0)
+                f.seek(start)
+                chunk = f.read(position - start)
+                newline = chunk.rfind(b"\n")
+                if newline >= 0:
+                    if start + newline + 1 < end:
+                        f.truncate(start + newline + 1)
+                    return
+                position = start
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+        self.count = 0
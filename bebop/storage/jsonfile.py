@@ -0,0 +1,72 @@
+from pathlib import Path
+from typing import List
+
+from bebop.models import Board
+from bebop.trace import span
+from .base import BoardStorage, file_signature
+from .journal import Journal
+from .lazy import load_board, dump_board
+from .operations import Operation, apply_operation
+
+
+class JsonStorage(BoardStorage):
+    """Almacena el tablero como un único archivo JSON"""
+
+    suffix = ".json"
+
+    def __init__(self, path: Path, lazy: bool = False):
+        super().__init__(path)
+        self.lazy = lazy
+        self.journal = Journal(self.path)
+
+    def load(self) -> Board:
+        with span("storage.read") as read:
+            data = self.path.read_bytes()
+            read.add(bytes=len(data))
+        with span("storage.validate"):
+            board = load_board(data) if self.lazy else Board.model_validate_json(data)
+
+        with span("journal.replay") as replay:
+            operations = self.journal.read()
+            for operation in operations:
+                apply_operation(board, operation)
+            replay.add(operations=len(operations))
+        return board
+
+    def content_paths(self) -> List[Path]:
+        return [self.path, self.journal.path]
+
+    def signature(self) -> str:
+        journal = file_signature(self.journal.path) if self.journal.path.is_file() else ""
+        return f"{super().signature()}:{journal}"
+
+    def write(self, board: Board) -> None:
+        with span("storage.serialize") as serialize:
+            dump = dump_board(board)
+            serialize.add(bytes=len(dump))
+        with span("storage.write", bytes=len(dump)):
+            temp = self.path.with_suffix(".json.tmp")
+            with temp.open("wb") as f:
+                f.write(dump)
+            temp.rename(self.path)
+            self.journal.clear()
+
+    def compact(self, board: Board) -> None:
+        if self.journal.is_current():
+            self.write(board)
+
+
+class JournalStorage(JsonStorage):
+    """Almacena el tablero como una instantánea JSON y un registro de operaciones"""
+
+    def __init__(self, path: Path, lazy: bool = False, max_operations: int = 500, max_bytes: int = 1024 * 1024):
+        super().__init__(path, lazy)
+        self.max_operations = max_operations
+        self.max_bytes = max_bytes
+
+    def save(self, board: Board, operations: List[Operation]) -> None:
+        if len(operations):
+            self.journal.append(operations)
+
+        if self.journal.count >= self.max_operations or self.journal.size >= self.max_bytes:
+            self.write(board)
@@ -0,0 +1,114 @@
+from collections import UserList
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+import pydantic_core
+from pydantic import BaseModel
+
+from bebop.models import Board, PostGroup, Post
+
+Loader = Callable[[Any], BaseModel]
+BulkLoader = Callable[[List[Any]], List[BaseModel]]
+
+
+class LazyList(UserList):
+    """
+    Representa una lista cuyos elementos se validan al ser accedidos
+
+    Si se indica un `bulk_loader`, al recorrer la lista se cargan de una vez todos los elementos pendientes.
+    """
+
+    def __init__(
+        self,
+        initlist: Optional[Iterable] = None,
+        loader: Optional[Loader] = None,
+        bulk_loader: Optional[BulkLoader] = None,
+    ):
+        super().__init__(initlist)
+        self.loader = loader
+        self.bulk_loader = bulk_loader
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.__class__(self.data[i], self.loader, self.bulk_loader)
+
+        item = self.data[i]
+        if not isinstance(item, BaseModel):
+            item = self.loader(item)
+            self.data[i] = item
+        return item
+
+    def __iter__(self) -> Iterator[BaseModel]:
+        if self.bulk_loader is not None:
+            self.load_all()
+
+        for idx in range(len(self.data)):
+            yield self[idx]
+
+    def __eq__(self, other) -> bool:
+        self.load_all()
+        if isinstance(other, LazyList):
+            other.load_all()
+        return super().__eq__(other)
+
+    def copy(self) -> "LazyList":
+        return self.__class__(self.data, self.loader, self.bulk_loader)
+
+    def is_loaded(self, i: int) -> bool:
+        return isinstance(self.data[i], BaseModel)
+
+    def load_all(self) -> None:
+        pending = [idx for idx, item in enumerate(self.data) if not isinstance(item, BaseModel)]
+        if not len(pending):
+            return
+
+        if self.bulk_loader is None:
+            for idx in pending:
+                self[idx]
+            return
+
+        models = self.bulk_loader([self.data[idx] for idx in pending])
+        for idx, model in zip(pending, models):
+            self.data[idx] = model
+
+
+def load_post(raw: dict) -> Post:
+    return Post.model_validate(raw)
+
+
+def load_group(raw: dict) -> PostGroup:
+    group = PostGroup.model_validate({**raw, "posts": []})
+    group.posts = LazyList(raw.get("posts", []), load_post)
+    return group
+
+
+def load_raw_board(raw: dict) -> Board:
+    """Cargar un tablero de sus datos sin validar, validando únicamente sus campos de primer nivel"""
+    board = Board.model_validate({**raw, "posts": []})
+    board.posts = LazyList(raw.get("posts", []), load_group)
+    return board
+
+
+def load_board(data: bytes | str) -> Board:
+    """Cargar un tablero validando únicamente sus campos de primer nivel"""
+    return load_raw_board(pydantic_core.from_json(data))
+
+
+def dump_element(element: Any) -> Any:
+    """Serializar un elemento, conservando sin cambios los subárboles no visitados"""
+    if not isinstance(element, BaseModel):
+        return element
+
+    # Los campos están en el diccionario del modelo, getattr pasa por el __getattr__ de pydantic en los posts
+    posts = element.__dict__.get("posts")
+    if not isinstance(posts, LazyList):
+        return element.model_dump(mode="json", by_alias=True)
+
+    data = element.model_dump(mode="json", by_alias=True, exclude={"posts"})
+    data["posts"] = [x if isinstance(x, dict) else dump_element(posts[idx]) for idx, x in enumerate(posts.data)]
+    return data
+
+
+def dump_board(board: Board) -> bytes:
+    if not isinstance(board.posts, LazyList):
+        return board.model_dump_json(indent=2, by_alias=True).encode()
+    return pydantic_core.to_json(dump_element(board), indent=2)
@@ -0,0 +1,82 @@
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+REVISION_WIDTH = 20
+
+
+class BoardLock:
+    """
+    Representa el bloqueo consultivo de un tablero entre procesos
+
+    El archivo de bloqueo guarda la revisión del tablero, que aumenta cada vez que se guarda. Se lee
+    y se escribe con el bloqueo adquirido, sin leer el tablero. En los sistemas sin `fcntl` el bloqueo
+    no tiene efecto pero la revisión se sigue registrando.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.fd: Optional[int] = None
+        self.exclusive = False
+        self.wait = 0.0
+
+    @contextmanager
+    def acquire(self, exclusive: bool = False) -> Iterator["BoardLock"]:
+        """
+        Adquirir el bloqueo compartido o exclusivo mientras dure el bloque
+
+        Si el bloqueo ya está adquirido en este proceso se reutiliza, un bloqueo exclusivo también
+        sirve para leer.
+        """
+        if self.fd is not None:
+            if exclusive and not self.exclusive:
+                raise RuntimeError("A shared board lock can't be upgraded")
+            yield self
+            return
+
+        try:
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            # Sin acceso al directorio se trabaja sin bloqueo, los errores de escritura los muestra el almacenamiento
+            yield self
+            return
+
+        self.exclusive = exclusive
+        try:
+            if fcntl is not None:
+                start = time.perf_counter()
+                fcntl.flock(self.fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                self.wait += time.perf_counter() - start
+            yield self
+        finally:
+            # Cerrar el descriptor libera el bloqueo
+            os.close(self.fd)
+            self.fd = None
+            self.exclusive = False
+
+    def read_revision(self) -> int:
+        """Leer la revisión guardada, 0 si el tablero nunca se ha guardado con bloqueo"""
+        with self.acquire():
+            if self.fd is None:
+                return 0
+            data = os.pread(self.fd, REVISION_WIDTH, 0)
+        try:
+            return int(data)
+        except ValueError:
+            return 0
+
+    def write_revision(self, revision: int) -> None:
+        """Guardar la revisión, requiere el bloqueo exclusivo si el archivo de bloqueo está disponible"""
+        if self.fd is None:
+            return
+        if not self.exclusive:
+            raise RuntimeError("Writing the revision requires the exclusive board lock")
+        # Ancho fijo para sobrescribir el valor anterior con una sola escritura
+        os.pwrite(self.fd, str(revision).rjust(REVISION_WIDTH).encode(), 0)
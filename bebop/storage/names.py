@@ -0,0 +1,138 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from bebop.models import Board
+from .operations import (
+    Operation,
+    InsertOperation,
+    ExtendOperation,
+    RemoveOperation,
+    MoveOperation,
+    UpdateOperation,
+    ElementPath,
+    raw_items,
+)
+
+IndexPath = Tuple[int, ...]
+
+
+def iter_elements(items: List[Any]) -> Iterator[Tuple[int, Any]]:
+    """Recorrer los elementos de una lista sin validar los que están en formato JSON"""
+    data = raw_items(items)
+    if not all(isinstance(x, (dict, BaseModel)) for x in data):
+        data = list(items)
+    return enumerate(data)
+
+
+def get_field(element: Any, field: str, default: Any = None) -> Any:
+    if isinstance(element, dict):
+        return element.get(field, default)
+    return getattr(element, field, default)
+
+
+class NameIndex:
+    """
+    Representa el índice de nombres de los elementos de un tablero
+
+    Cada nombre apunta a las rutas de los elementos que lo usan, la búsqueda devuelve
+    el primero en el orden del tablero.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, List[IndexPath]]] = None):
+        self.entries: Dict[str, List[IndexPath]] = entries or {}
+
+    def get(self, name: str) -> Optional[ElementPath]:
+        paths = self.entries.get(name.lower())
+        return list(min(paths)) if paths else None
+
+    def add(self, name: Optional[str], path: IndexPath) -> None:
+        if name:
+            self.entries.setdefault(name.lower(), []).append(path)
+
+    @classmethod
+    def build(cls, board: Board) -> "NameIndex":
+        index = cls()
+        for main_idx, group in iter_elements(board.posts):
+            index._add_element((main_idx,), group)
+        return index
+
+    def apply(self, operation: Operation) -> None:
+        """Actualizar las rutas del índice con una operación aplicada al tablero"""
+        path = tuple(operation.path)
+
+        if isinstance(operation, InsertOperation):
+            self._shift(path, 1)
+            self._add_element(path, operation.data)
+
+        elif isinstance(operation, ExtendOperation):
+            self._shift(path, len(operation.posts))
+            for offset, post in enumerate(operation.posts):
+                self.add(post.name, (path[0], path[1] + offset))
+
+        elif isinstance(operation, RemoveOperation):
+            self._pop_subtree(path)
+            self._shift(path, -1)
+
+        elif isinstance(operation, MoveOperation):
+            moved = self._pop_subtree(path)
+            self._shift(path, -1)
+            target = tuple(operation.target)
+            self._shift(target, 1)
+            for name, suffix in moved:
+                self.add(name, target + suffix)
+
+        elif isinstance(operation, UpdateOperation) and "name" in operation.fields:
+            for name, suffix in self._pop_subtree(path):
+                if len(suffix):
+                    self.add(name, path + suffix)
+            self.add(operation.fields["name"], path)
+
+    @classmethod
+    def read(cls, path: Path, signature: str) -> Optional["NameIndex"]:
+        """Leer el índice guardado, si corresponde a la firma del tablero"""
+        if not path.is_file():
+            return None
+
+        try:
+            data = json.loads(path.read_text())
+        except ValueError:
+            return None
+        if data.get("signature") != signature:
+            return None
+        return cls({name: [tuple(x) for x in paths] for name, paths in data["names"].items()})
+
+    def write(self, path: Path, signature: str) -> None:
+        temp = path.with_suffix(".tmp")
+        temp.write_text(json.dumps({"signature": signature, "names": self.entries}))
+        temp.rename(path)
+
+    def _add_element(self, path: IndexPath, element: Any) -> None:
+        self.add(get_field(element, "name"), path)
+        if len(path) == 1:
+            for sub_idx, post in iter_elements(get_field(element, "posts", [])):
+                self.add(get_field(post, "name"), path + (sub_idx,))
+
+    def _shift(self, path: IndexPath, delta: int) -> None:
+        """Desplazar las rutas de los elementos que están a partir de `path` en su misma lista"""
+        level = len(path) - 1
+        for name, paths in self.entries.items():
+            for idx, item in enumerate(paths):
+                if len(item) > level and item[:level] == path[:level] and item[level] >= path[level]:
+                    paths[idx] = item[:level] + (item[level] + delta,) + item[level + 1 :]
+
+    def _pop_subtree(self, path: IndexPath) -> List[Tuple[str, IndexPath]]:
+        """Eliminar las rutas del elemento y sus descendientes, devolviendo las rutas relativas"""
+        removed = []
+        size = len(path)
+        for name in list(self.entries):
+            paths = self.entries[name]
+            kept = [x for x in paths if x[:size] != path]
+            removed.extend((name, x[size:]) for x in paths if x[:size] == path)
+            if len(kept):
+                self.entries[name] = kept
+            else:
+                del self.entries[name]
+        return removed
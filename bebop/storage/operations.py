@@ -0,0 +1,166 @@
+from datetime import datetime
+from functools import cache
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
+from bebop.models import Board, PostGroup, Post, Todo, Comment
+from .lazy import LazyList
+
+ElementPath = List[int]
+ITEM_MODELS = {"todos": Todo, "comments": Comment}
+
+
+class Operation(BaseModel):
+    """
+    Representa una modificación sobre un elemento del tablero
+
+    `element` es la clave del elemento en `path` cuando se registró la operación, al volver a aplicarla
+    sobre otro tablero se comprueba que la ruta siga indicando ese elemento. No se guarda con la operación.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+    op: str
+    path: ElementPath
+    element: Optional[str] = Field(default=None, exclude=True)
+
+
+class InsertOperation(Operation):
+    """Inserta un elemento en la posición indicada"""
+
+    op: Literal["insert"] = "insert"
+    data: Dict[str, Any]
+
+
+class RemoveOperation(Operation):
+    """Elimina un elemento"""
+
+    op: Literal["remove"] = "remove"
+
+
+class ExtendOperation(Operation):
+    """Inserta varios posts seguidos a partir de la posición indicada, sin copiar sus datos"""
+
+    op: Literal["extend"] = "extend"
+    posts: List[Post]
+
+
+class MoveOperation(Operation):
+    """Mueve un elemento, la ruta destino se interpreta tras eliminar el origen"""
+
+    op: Literal["move"] = "move"
+    target: ElementPath
+
+
+class UpdateOperation(Operation):
+    """Asigna nuevos valores a los campos de un elemento"""
+
+    op: Literal["update"] = "update"
+    fields: Dict[str, Any]
+
+
+class AppendOperation(Operation):
+    """Agrega un elemento a una lista de un elemento (todos, comentarios)"""
+
+    op: Literal["append"] = "append"
+    field: str
+    data: Dict[str, Any]
+
+
+AnyOperation = Annotated[
+    Union[InsertOperation, ExtendOperation, RemoveOperation, MoveOperation, UpdateOperation, AppendOperation],
+    Field(discriminator="op"),
+]
+
+
+@cache
+def get_operation_adapter() -> TypeAdapter[AnyOperation]:
+    """Obtener el validador de operaciones, se construye la primera vez que se usa"""
+    return TypeAdapter(AnyOperation)
+
+
+def raw_items(items: List[Any]) -> List[Any]:
+    """Obtener la lista subyacente, sin validar los elementos pendientes"""
+    return items.data if isinstance(items, LazyList) else items
+
+
+def index_of(items: List[Any], element: Any) -> int:
+    """Obtener la posición de un elemento por identidad, sin comparar su contenido"""
+    for idx, item in enumerate(raw_items(items)):
+        if item is element:
+            return idx
+    raise ValueError(f"{element!r} is not in list")
+
+
+def element_key(element: Any) -> Optional[str]:
+    """
+    Obtener una clave que identifica a un elemento aunque cambie de posición
+
+    Los elementos pendientes en formato JSON se identifican sin validarlos, devuelve None para los que
+    cada almacenamiento guarda en su propio formato.
+    """
+    if isinstance(element, BaseModel):
+        return f"{element.created_at.isoformat()}/{element.title}"
+    if isinstance(element, dict) and "createdAt" in element:
+        created_at = element["createdAt"]
+        if isinstance(created_at, str):
+            created_at = datetime.fromisoformat(created_at)
+        return f"{created_at.isoformat()}/{element.get('title')}"
+    return None
+
+
+def path_key(items: List[Any], index: int) -> str:
+    """Obtener la clave del elemento en una posición de la lista, cargándolo sólo si sus datos no la tienen"""
+    key = element_key(raw_items(items)[index])
+    return element_key(items[index]) if key is None else key
+
+
+def get_parent_list(board: Board, path: ElementPath) -> List[Any]:
+    if len(path) == 1:
+        return board.posts
+    return board.posts[path[0]].posts
+
+
+def get_element(board: Board, path: ElementPath) -> PostGroup | Post:
+    return get_parent_list(board, path)[path[-1]]
+
+
+def dump_fields(element: PostGroup | Post, names: List[str]) -> Dict[str, Any]:
+    """Serializar los campos indicados de un elemento con el formato del tablero"""
+    return element.model_dump(mode="json", by_alias=True, include=set(names))
+
+
+def apply_operation(board: Board, operation: Operation) -> None:
+    """Aplicar una operación sobre el tablero"""
+    target_list = get_parent_list(board, operation.path)
+    index = operation.path[-1]
+
+    if operation.element is not None and element_key(target_list[index]) != operation.element:
+        raise ValueError(f"The element at {operation.path} is not the one the change was made on")
+
+    if isinstance(operation, InsertOperation):
+        # Los elementos pendientes de las listas perezosas están en el formato de cada almacenamiento
+        model = PostGroup if len(operation.path) == 1 else Post
+        target_list.insert(index, model.model_validate(operation.data))
+
+    elif isinstance(operation, ExtendOperation):
+        raw_items(target_list)[index:index] = operation.posts
+
+    elif isinstance(operation, RemoveOperation):
+        del raw_items(target_list)[index]
+
+    elif isinstance(operation, MoveOperation):
+        element = raw_items(target_list).pop(index)
+        get_parent_list(board, operation.target).insert(operation.target[-1], element)
+
+    elif isinstance(operation, UpdateOperation):
+        element = target_list[index]
+        names = {field.alias or name: name for name, field in element.model_fields.items()}
+        for key, value in operation.fields.items():
+            element.__pydantic_validator__.validate_assignment(element, names.get(key, key), value)
+
+    elif isinstance(operation, AppendOperation):
+        element = target_list[index]
+        item = ITEM_MODELS[operation.field].model_validate(operation.data)
+        getattr(element, operation.field).append(item)
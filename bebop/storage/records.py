@@ -0,0 +1,166 @@
+import csv
+import json
+from itertools import islice
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+
+from bebop.models import Board, PostGroup, Post
+from bebop.token import IndexToken
+from .formats import RecordFormat
+from .names import get_field, iter_elements
+from .tags import TagSelection
+
+CSV_FIELDS = ["type", "token", "group", "title", "name", "description", "tags", "todos", "startDate", "endDate"]
+# Campos de los registros que no son del elemento
+RECORD_FIELDS = {"type", "token", "group"}
+CHECKED_PREFIX = "[x] "
+BATCH_SIZE = 1000
+
+Record = Dict[str, Any]
+
+
+class RecordError(ValueError):
+    """Representa un registro que no se puede importar, con su número empezando en 1"""
+
+    def __init__(self, number: int, message: str):
+        super().__init__(f"Record {number}: {message}")
+        self.number = number
+
+
+def dump_record_data(element: Any) -> Record:
+    """Serializar un elemento sin sus posts, sin validar los que están en formato JSON"""
+    if isinstance(element, dict):
+        return {key: value for key, value in element.items() if key != "posts"}
+    return element.model_dump(mode="json", by_alias=True, exclude={"posts"})
+
+
+def iter_records(
+    board: Board,
+    selection: Optional[TagSelection] = None,
+    read_description: Optional[Callable[[str], Optional[str]]] = None,
+) -> Iterator[Record]:
+    """
+    Recorrer un registro por cada grupo seguido de uno por cada uno de sus posts, en el orden del tablero
+
+    Los elementos se serializan a medida que se recorren. Con `read_description` las descripciones guardadas
+    en archivos se incluyen en el registro.
+    """
+    for main_idx, group in iter_elements(board.posts):
+        title = get_field(group, "title")
+        elements = [([main_idx], group)]
+        elements.extend(([main_idx, idx], x) for idx, x in iter_elements(get_field(group, "posts", [])))
+        for path, element in elements:
+            if selection is not None and path not in selection:
+                continue
+            data = dump_record_data(element)
+            if read_description is not None and data.get("descriptionFile") is not None:
+                data["description"] = read_description(data.pop("descriptionFile"))
+            kind = "group" if len(path) == 1 else "post"
+            yield {"type": kind, "token": str(IndexToken.from_index(*path)), "group": title, **data}
+
+
+def write_ndjson(records: Iterable[Record], output: IO[str]) -> None:
+    for record in records:
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def write_csv(records: Iterable[Record], output: IO[str]) -> None:
+    """Escribir los registros en CSV, las etiquetas separadas por comas y una tarea por línea"""
+    writer = csv.DictWriter(output, CSV_FIELDS, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    for record in records:
+        todos = (f"{CHECKED_PREFIX if x.get('checked') else ''}{x['text']}" for x in record.get("todos", []))
+        writer.writerow({**record, "tags": ",".join(record.get("tags", [])), "todos": "\n".join(todos)})
+
+
+def write_markdown(records: Iterable[Record], output: IO[str]) -> None:
+    """Escribir los registros como una lista de Markdown por grupo, con las tareas de cada post"""
+    for record in records:
+        tags = "".join(f" `{x}`" for x in record.get("tags", []))
+        if record["type"] == "group":
+            output.write(f"\n## {record['token']} {record['title']}{tags}\n\n")
+            continue
+
+        output.write(f"- **{record['token']}** {record['title']}{tags}\n")
+        for todo in record.get("todos", []):
+            output.write(f"  - [{'x' if todo.get('checked') else ' '}] {todo['text']}\n")
+
+
+WRITERS: Dict[RecordFormat, Callable[[Iterable[Record], IO[str]], None]] = {
+    RecordFormat.NDJSON: write_ndjson,
+    RecordFormat.CSV: write_csv,
+    RecordFormat.MARKDOWN: write_markdown,
+}
+
+
+def read_ndjson(source: IO[str]) -> Iterator[Record]:
+    for number, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise RecordError(number, f"invalid JSON, {e}")
+
+
+def read_csv(source: IO[str]) -> Iterator[Record]:
+    """Leer los registros de un CSV con las columnas de la exportación, las columnas vacías se omiten"""
+    for row in csv.DictReader(source):
+        record = {key: value for key, value in row.items() if key is not None and value not in (None, "")}
+        if "tags" in record:
+            record["tags"] = [x.strip() for x in record["tags"].split(",") if x.strip()]
+        if "todos" in record:
+            lines = [x for x in record["todos"].splitlines() if x.strip()]
+            record["todos"] = [
+                {"text": x.removeprefix(CHECKED_PREFIX), "checked": x.startswith(CHECKED_PREFIX)} for x in lines
+            ]
+        yield record
+
+
+READERS: Dict[RecordFormat, Callable[[IO[str]], Iterator[Record]]] = {
+    RecordFormat.NDJSON: read_ndjson,
+    RecordFormat.CSV: read_csv,
+}
+
+
+def iter_batches(
+    records: Iterable[Record], size: int = BATCH_SIZE
+) -> Iterator[List[Tuple[int, PostGroup | Post, Optional[str]]]]:
+    """
+    Recorrer los elementos de los registros validados por lotes, con el número de su registro y el grupo de los posts
+
+    Sólo se mantiene en memoria un lote de registros. Los registros sin tipo son posts.
+
+    :raises RecordError: Si un registro no es un elemento válido
+    """
+    adapters = {"group": TypeAdapter(List[PostGroup]), "post": TypeAdapter(List[Post])}
+    records = iter(records)
+    number = 0
+    while batch := list(islice(records, size)):
+        positions = []
+        data: Dict[str, List[Record]] = {"group": [], "post": []}
+        for offset, record in enumerate(batch):
+            if not isinstance(record, dict):
+                raise RecordError(number + offset + 1, "a record must be an object")
+            kind = record.get("type", "post")
+            if kind not in data:
+                raise RecordError(number + offset + 1, f"unknown type '{kind}'")
+            positions.append((kind, len(data[kind])))
+            data[kind].append({key: value for key, value in record.items() if key not in RECORD_FIELDS})
+
+        validated = {}
+        for kind, adapter in adapters.items():
+            try:
+                validated[kind] = adapter.validate_python(data[kind])
+            except ValidationError as e:
+                error = e.errors()[0]
+                offset = positions.index((kind, error["loc"][0]))
+                field = ".".join(str(x) for x in error["loc"][1:])
+                raise RecordError(number + offset + 1, f"{field}: {error['msg']}" if field else error["msg"])
+
+        yield [
+            (number + offset + 1, validated[kind][idx], batch[offset].get("group"))
+            for offset, (kind, idx) in enumerate(positions)
+        ]
+        number += len(batch)
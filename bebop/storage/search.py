@@ -0,0 +1,258 @@
+import re
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from bebop.models import Board
+from .names import get_field, iter_elements
+from .operations import (
+    Operation,
+    InsertOperation,
+    ExtendOperation,
+    RemoveOperation,
+    MoveOperation,
+    ElementPath,
+    get_element,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    group_position INTEGER NOT NULL,
+    post_position INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS docs_position ON docs (group_position, post_position);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS texts USING fts5(
+    title, tags, description, todos, comments, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# Posición de los documentos de grupos en la columna de posts, y grupo temporal de los documentos que se mueven
+GROUP = -1
+MOVING = -2
+RANK = "bm25(10.0, 5.0, 3.0, 1.0, 1.0)"
+SNIPPET_START = "\x02"
+SNIPPET_END = "\x03"
+
+
+@dataclass
+class SearchResult:
+    """Representa un elemento encontrado junto al fragmento de texto que coincide"""
+
+    path: ElementPath
+    title: str
+    snippet: str
+    score: float
+    board: Optional[str] = None
+
+
+def build_query(text: str) -> str:
+    """Obtener la consulta FTS5 que busca todas las palabras del texto, las que terminan en * como prefijo"""
+    return " ".join(f'"{word}"{prefix}' for word, prefix in re.findall(r"(\w+)(\*?)", text))
+
+
+def get_data(element: Any) -> Dict[str, Any]:
+    """Obtener los datos de un elemento en formato JSON sin sus posts"""
+    if isinstance(element, BaseModel):
+        return element.model_dump(mode="json", by_alias=True, exclude={"posts"})
+    return element
+
+
+class SearchIndex:
+    """
+    Representa el índice invertido de texto completo de un tablero
+
+    Se guarda en una base de datos SQLite con FTS5. Cada grupo y cada post es un documento con su
+    título, etiquetas, descripción (incluido el archivo de descripción), tareas y comentarios, y su
+    posición en el tablero se guarda aparte para actualizarla con las operaciones sin reindexar el texto.
+    """
+
+    def __init__(self, path: Path, root: Path):
+        self.path = path
+        self.root = root
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path)
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    @property
+    def signature(self) -> str:
+        """Firma del tablero sobre el que está construido el índice"""
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+        return "" if row is None else row[0]
+
+    def set_signature(self, signature: str) -> None:
+        self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('signature', ?)", [signature])
+
+    def rebuild(self, board: Board, signature: str) -> None:
+        """Construir el índice desde cero, los elementos en formato JSON no se validan"""
+        with self.connection:
+            self.connection.execute("DELETE FROM docs")
+            self.connection.execute("DELETE FROM texts")
+            self.connection.execute("INSERT INTO texts (texts, rank) VALUES ('rank', ?)", [RANK])
+            for main_idx, group in iter_elements(board.posts):
+                self._insert(main_idx, GROUP, group)
+                for idx, post in iter_elements(get_field(group, "posts", [])):
+                    self._insert(main_idx, idx, post)
+            self.set_signature(signature)
+
+    def apply(self, operations: List[Operation], board: Board, signature: str) -> None:
+        """
+        Actualizar el índice con las operaciones guardadas
+
+        Los elementos insertados se indexan con los datos de la operación. Los que se modifican se
+        reindexan al final, leyéndolos del tablero, una sola vez aunque tengan varias operaciones.
+        """
+        dirty: Set[int] = set()
+        with self.connection:
+            for operation in operations:
+                self._apply(operation, dirty)
+
+            for doc_id in dirty:
+                row = self.connection.execute(
+                    "SELECT group_position, post_position FROM docs WHERE id = ?", [doc_id]
+                ).fetchone()
+                if row is not None:
+                    path = [row[0]] if row[1] == GROUP else list(row)
+                    self.connection.execute("DELETE FROM texts WHERE rowid = ?", [doc_id])
+                    self._insert_text(doc_id, get_element(board, path))
+            self.set_signature(signature)
+
+    def search(self, text: str, limit: int = 20) -> List[SearchResult]:
+        """Obtener los elementos que contienen todas las palabras, ordenados por relevancia"""
+        query = build_query(text)
+        if query == "":
+            return []
+
+        # Los fragmentos se obtienen sólo para los mejores resultados, después de ordenar
+        rows = self.connection.execute(
+            "SELECT docs.group_position, docs.post_position, texts.title, ranked.rank, "
+            f"snippet(texts, -1, '{SNIPPET_START}', '{SNIPPET_END}', '…', 12) "
+            "FROM (SELECT rowid, rank FROM texts WHERE texts MATCH ?1 ORDER BY rank LIMIT ?2) AS ranked "
+            "JOIN texts ON texts.rowid = ranked.rowid JOIN docs ON docs.id = ranked.rowid "
+            "WHERE texts MATCH ?1 ORDER BY ranked.rank",
+            [query, limit],
+        )
+        return [
+            SearchResult([group] if post == GROUP else [group, post], title, snippet, -score)
+            for group, post, title, score, snippet in rows
+        ]
+
+    def read_description_file(self, name: Optional[str]) -> str:
+        if name is None:
+            return ""
+        path = self.root / name
+        return path.read_text(errors="replace") if path.is_file() else ""
+
+    def _apply(self, operation: Operation, dirty: Set[int]) -> None:
+        path = operation.path
+        group, post = path[0], path[1] if len(path) > 1 else GROUP
+
+        if isinstance(operation, InsertOperation):
+            self._shift(path, 1)
+            self._insert(group, post, operation.data)
+            for idx, child in enumerate(operation.data.get("posts", []) if post == GROUP else []):
+                self._insert(group, idx, child)
+
+        elif isinstance(operation, ExtendOperation):
+            self._shift(path, len(operation.posts))
+            for offset, child in enumerate(operation.posts):
+                self._insert(group, post + offset, child)
+
+        elif isinstance(operation, RemoveOperation):
+            ids = self._select(path)
+            self.connection.executemany("DELETE FROM texts WHERE rowid = ?", [(x,) for x in ids])
+            self.connection.executemany("DELETE FROM docs WHERE id = ?", [(x,) for x in ids])
+            self._shift(path, -1, after=True)
+
+        elif isinstance(operation, MoveOperation):
+            ids = self._select(path)
+            self.connection.executemany("UPDATE docs SET group_position = ? WHERE id = ?", [(MOVING, x) for x in ids])
+            self._shift(path, -1, after=True)
+            target = operation.target
+            self._shift(target, 1)
+            if post == GROUP:
+                self.connection.execute(
+                    "UPDATE docs SET group_position = ? WHERE group_position = ?", [target[0], MOVING]
+                )
+            else:
+                self.connection.execute(
+                    "UPDATE docs SET group_position = ?, post_position = ? WHERE group_position = ?",
+                    [target[0], target[1], MOVING],
+                )
+
+        else:
+            dirty.update(self._select(path, subtree=False))
+
+    def _select(self, path: ElementPath, subtree: bool = True) -> List[int]:
+        """Obtener los documentos del elemento, con los de sus posts si es un grupo y `subtree`"""
+        if len(path) == 1 and subtree:
+            rows = self.connection.execute("SELECT id FROM docs WHERE group_position = ?", [path[0]])
+        else:
+            post = path[1] if len(path) > 1 else GROUP
+            rows = self.connection.execute(
+                "SELECT id FROM docs WHERE group_position = ? AND post_position = ?", [path[0], post]
+            )
+        return [x for (x,) in rows]
+
+    def _shift(self, path: ElementPath, delta: int, after: bool = False) -> None:
+        """Desplazar las posiciones de los elementos desde la ruta, o a partir de la siguiente con `after`"""
+        start = path[-1] + (1 if after else 0)
+        if len(path) == 1:
+            self.connection.execute(
+                "UPDATE docs SET group_position = group_position + ? WHERE group_position >= ?", [delta, start]
+            )
+        else:
+            self.connection.execute(
+                "UPDATE docs SET post_position = post_position + ? WHERE group_position = ? AND post_position >= ?",
+                [delta, path[0], start],
+            )
+
+    def _insert(self, group: int, post: int, element: Any) -> None:
+        cursor = self.connection.execute(
+            "INSERT INTO docs (group_position, post_position) VALUES (?, ?)", [group, post]
+        )
+        self._insert_text(cursor.lastrowid, element)
+
+    def _insert_text(self, doc_id: int, element: Any) -> None:
+        data = get_data(element)
+        description = "\n".join(
+            x for x in (data.get("description"), self.read_description_file(data.get("descriptionFile"))) if x
+        )
+        self.connection.execute(
+            "INSERT INTO texts (rowid, title, tags, description, todos, comments) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                doc_id,
+                data.get("title", ""),
+                " ".join(data.get("tags", [])),
+                description,
+                "\n".join(x["text"] for x in data.get("todos", [])),
+                "\n".join(x["text"] for x in data.get("comments", [])),
+            ],
+        )
+
+
+def iter_snippet(snippet: str) -> Iterator[Tuple[str, bool]]:
+    """Recorrer los fragmentos del texto indicando si coinciden con la búsqueda"""
+    for idx, part in enumerate(re.split(f"[{SNIPPET_START}{SNIPPET_END}]", snippet)):
+        if part != "":
+            yield part, idx % 2 == 1
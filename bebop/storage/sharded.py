@@ -0,0 +1,152 @@
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, List, Optional
+
+import pydantic_core
+
+from bebop.models import Board, PostGroup
+from bebop.trace import span
+from .base import BoardStorage, file_signature
+from .lazy import LazyList, dump_element, load_group
+from .operations import Operation, InsertOperation, RemoveOperation, MoveOperation
+
+# Segundos que se conservan los archivos de grupos que el manifiesto deja de usar
+RETIRED_GRACE = 3600.0
+
+
+class ShardedStorage(BoardStorage):
+    """
+    Almacena el tablero como un directorio con un manifiesto y un archivo por grupo
+
+    El manifiesto guarda los campos del tablero y los archivos de sus grupos en orden, y cada grupo
+    se lee la primera vez que se accede a él. Al guardar sólo se escriben los grupos que cambiaron,
+    siempre en archivos nuevos, y el manifiesto reemplazado es el que confirma el cambio: una escritura
+    interrumpida deja el tablero anterior completo. Los archivos que el manifiesto deja de usar se
+    conservan una hora, para los procesos que leyeron el manifiesto anterior y aún no leyeron sus grupos.
+    """
+
+    suffix = ".board"
+
+    def __init__(self, path: Path, lazy: bool = False):
+        super().__init__(path)
+        self.lazy = lazy
+        self.manifest_path = self.path / "manifest.json"
+        self.groups_path = self.path / "groups"
+        # Archivos de los grupos en el orden del tablero leído o escrito por última vez
+        self.files: Optional[List[str]] = None
+
+    def exists(self) -> bool:
+        return self.manifest_path.is_file()
+
+    def content_paths(self) -> List[Path]:
+        # Los grupos se escriben en archivos nuevos antes que el manifiesto
+        return [self.manifest_path]
+
+    def signature(self) -> str:
+        return file_signature(self.manifest_path) if self.exists() else ""
+
+    def load(self) -> Board:
+        with span("storage.read") as read:
+            data = self.manifest_path.read_bytes()
+            read.add(bytes=len(data))
+        raw = pydantic_core.from_json(data)
+        self.files = raw.pop("groups")
+        board = Board.model_validate({**raw, "posts": []})
+        board.posts = LazyList(list(self.files), self.load_group)
+        return board
+
+    def load_group(self, name: Any) -> PostGroup:
+        if isinstance(name, dict):
+            # Los grupos agregados al repetir operaciones ya están en memoria
+            return load_group(name) if self.lazy else PostGroup.model_validate(name)
+
+        with span("storage.read") as read:
+            data = (self.groups_path / name).read_bytes()
+            read.add(bytes=len(data))
+        with span("storage.validate"):
+            if self.lazy:
+                return load_group(pydantic_core.from_json(data))
+            return PostGroup.model_validate_json(data)
+
+    def write(self, board: Board) -> None:
+        """Escribir todos los grupos, los que no se han leído de este directorio se conservan sin leerlos"""
+        files = []
+        unchanged = set(self.files or [])
+        for idx, item in enumerate(getattr(board.posts, "data", board.posts)):
+            if isinstance(item, str) and item in unchanged:
+                files.append(item)
+            else:
+                files.append(self._write_group(board.posts[idx]))
+        self._commit(board, files)
+
+    def save(self, board: Board, operations: List[Operation]) -> None:
+        files = self._replay(operations)
+        if files is None or len(files) != len(board.posts):
+            self.write(board)
+            return
+
+        written = [x if x is not None else self._write_group(board.posts[idx]) for idx, x in enumerate(files)]
+        self._commit(board, written)
+
+    def _replay(self, operations: List[Operation]) -> Optional[List[Optional[str]]]:
+        """
+        Obtener los archivos de los grupos después de las operaciones, None en los grupos que cambiaron
+
+        Devuelve None si no se conocen los archivos del tablero guardado.
+        """
+        if self.files is None or not self.exists():
+            return None
+
+        files: List[Optional[str]] = list(self.files)
+        for operation in operations:
+            path = operation.path
+            if len(path) == 1 and isinstance(operation, InsertOperation):
+                files.insert(path[0], None)
+            elif len(path) == 1 and isinstance(operation, RemoveOperation):
+                files.pop(path[0])
+            elif len(path) == 1 and isinstance(operation, MoveOperation):
+                files.insert(operation.target[0], files.pop(path[0]))
+            else:
+                files[path[0]] = None
+                if isinstance(operation, MoveOperation):
+                    files[operation.target[0]] = None
+        return files
+
+    def _write_group(self, group: PostGroup) -> str:
+        name = f"{uuid.uuid4().hex}.json"
+        with span("storage.serialize") as serialize:
+            data = pydantic_core.to_json(dump_element(group))
+            serialize.add(bytes=len(data), groups=1)
+        with span("storage.write", bytes=len(data)):
+            self.groups_path.mkdir(parents=True, exist_ok=True)
+            temp = self.groups_path / f"{name}.tmp"
+            temp.write_bytes(data)
+            temp.rename(self.groups_path / name)
+        return name
+
+    def _commit(self, board: Board, files: List[str]) -> None:
+        """Reemplazar el manifiesto y eliminar los archivos de grupos que ya no usa"""
+        data = board.model_dump(mode="json", by_alias=True, exclude={"posts"})
+        data["groups"] = files
+        with span("storage.write") as write:
+            self.path.mkdir(parents=True, exist_ok=True)
+            manifest = json.dumps(data, indent=2).encode()
+            temp = self.manifest_path.with_suffix(".json.tmp")
+            temp.write_bytes(manifest)
+            temp.rename(self.manifest_path)
+            write.add(bytes=len(manifest))
+
+        used = set(files)
+        now = time.time()
+        for name in set(self.files or []) - used:
+            try:
+                os.utime(self.groups_path / name, (now, now))
+            except FileNotFoundError:
+                pass
+        for path in self.groups_path.glob("*.json"):
+            if path.name not in used and path.stat().st_mtime < now - RETIRED_GRACE:
+                path.unlink(missing_ok=True)
+        self.files = files
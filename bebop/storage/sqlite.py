@@ -0,0 +1,363 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from pydantic.alias_generators import to_camel
+
+from bebop.models import Board, PostGroup, Post, Todo, Comment
+from .base import BoardStorage
+from .lazy import LazyList
+from .operations import (
+    Operation,
+    InsertOperation,
+    ExtendOperation,
+    RemoveOperation,
+    MoveOperation,
+    UpdateOperation,
+    AppendOperation,
+    ElementPath,
+    ITEM_MODELS,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS board (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS groups (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT,
+    author TEXT,
+    title TEXT NOT NULL,
+    name TEXT,
+    description TEXT,
+    description_file TEXT,
+    archived INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY,
+    group_id INTEGER NOT NULL REFERENCES groups (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT,
+    author TEXT,
+    title TEXT NOT NULL,
+    name TEXT,
+    description TEXT,
+    description_file TEXT,
+    archived INTEGER NOT NULL DEFAULT 0,
+    start_date TEXT,
+    end_date TEXT
+);
+
+CREATE TABLE IF NOT EXISTS todos (
+    id INTEGER PRIMARY KEY,
+    post_id INTEGER NOT NULL REFERENCES posts (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT,
+    author TEXT,
+    text TEXT NOT NULL,
+    checked INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS comments (
+    id INTEGER PRIMARY KEY,
+    group_id INTEGER REFERENCES groups (id) ON DELETE CASCADE,
+    post_id INTEGER REFERENCES posts (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT,
+    author TEXT,
+    text TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tags (
+    group_id INTEGER REFERENCES groups (id) ON DELETE CASCADE,
+    post_id INTEGER REFERENCES posts (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS groups_position ON groups (position);
+CREATE INDEX IF NOT EXISTS groups_name ON groups (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS groups_archived ON groups (archived);
+CREATE INDEX IF NOT EXISTS posts_group ON posts (group_id, position);
+CREATE INDEX IF NOT EXISTS posts_name ON posts (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS posts_archived ON posts (archived);
+CREATE INDEX IF NOT EXISTS posts_created_at ON posts (created_at);
+CREATE INDEX IF NOT EXISTS posts_start_date ON posts (start_date);
+CREATE INDEX IF NOT EXISTS posts_end_date ON posts (end_date);
+CREATE INDEX IF NOT EXISTS todos_post ON todos (post_id, position);
+CREATE INDEX IF NOT EXISTS comments_group ON comments (group_id, position);
+CREATE INDEX IF NOT EXISTS comments_post ON comments (post_id, position);
+CREATE INDEX IF NOT EXISTS tags_tag ON tags (tag);
+CREATE INDEX IF NOT EXISTS tags_group ON tags (group_id, position);
+CREATE INDEX IF NOT EXISTS tags_post ON tags (post_id, position);
+"""
+
+GROUP_COLUMNS = ["created_at", "updated_at", "author", "title", "name", "description", "description_file", "archived"]
+POST_COLUMNS = GROUP_COLUMNS + ["start_date", "end_date"]
+ITEM_COLUMNS = {
+    "todos": ["created_at", "updated_at", "author", "text", "checked"],
+    "comments": ["created_at", "updated_at", "author", "text"],
+}
+
+
+def row_data(columns: List[str], values: Tuple[Any, ...]) -> Dict[str, Any]:
+    """Convertir una fila a los campos del modelo, con el nombre de sus alias"""
+    return {to_camel(column): value for column, value in zip(columns, values)}
+
+
+def owner_column(path: ElementPath) -> str:
+    return "group_id" if len(path) == 1 else "post_id"
+
+
+class SqliteStorage(BoardStorage):
+    """
+    Almacena el tablero en una base de datos SQLite
+
+    Los grupos y posts se cargan al ser accedidos y los cambios se guardan como
+    actualizaciones de filas, sin reescribir el tablero completo.
+    """
+
+    suffix = ".db"
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path)
+            self._connection.execute("PRAGMA foreign_keys = ON")
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def load(self) -> Board:
+        (data,) = self.connection.execute("SELECT data FROM board").fetchone()
+        board = Board.model_validate_json(data)
+        rows = self.connection.execute("SELECT id FROM groups ORDER BY position")
+        board.posts = LazyList([x for (x,) in rows], self.load_group)
+        return board
+
+    def load_group(self, group_id: int) -> PostGroup:
+        columns = ", ".join(GROUP_COLUMNS)
+        row = self.connection.execute(f"SELECT {columns} FROM groups WHERE id = ?", [group_id]).fetchone()
+        data = row_data(GROUP_COLUMNS, row)
+        data["tags"] = self._select_tags("group_id", group_id)
+        data["comments"] = self._select_items("comments", "group_id", group_id)
+
+        group = PostGroup.model_validate(data)
+        rows = self.connection.execute("SELECT id FROM posts WHERE group_id = ? ORDER BY position", [group_id])
+        group.posts = LazyList([x for (x,) in rows], self.load_post, self.load_posts)
+        return group
+
+    def load_post(self, post_id: int) -> Post:
+        return self.load_posts([post_id])[0]
+
+    def load_posts(self, post_ids: List[int]) -> List[Post]:
+        """Cargar un conjunto de posts con una consulta por tabla"""
+        ids = json.dumps(post_ids)
+        columns = ", ".join(POST_COLUMNS)
+        rows = self.connection.execute(
+            f"SELECT id, {columns} FROM posts WHERE id IN (SELECT value FROM json_each(?))", [ids]
+        )
+        posts: Dict[int, Dict[str, Any]] = {}
+        for post_id, *values in rows:
+            posts[post_id] = {**row_data(POST_COLUMNS, values), "tags": [], "todos": [], "comments": []}
+
+        rows = self.connection.execute(
+            "SELECT post_id, tag FROM tags WHERE post_id IN (SELECT value FROM json_each(?)) "
+            "ORDER BY post_id, position",
+            [ids],
+        )
+        for post_id, tag in rows:
+            posts[post_id]["tags"].append(tag)
+
+        for field, item_columns in ITEM_COLUMNS.items():
+            columns = ", ".join(item_columns)
+            rows = self.connection.execute(
+                f"SELECT post_id, {columns} FROM {field} WHERE post_id IN (SELECT value FROM json_each(?)) "
+                "ORDER BY post_id, position",
+                [ids],
+            )
+            for post_id, *values in rows:
+                posts[post_id][field].append(row_data(item_columns, values))
+
+        return [Post.model_validate(posts[x]) for x in post_ids]
+
+    def write(self, board: Board) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM groups")
+            self.connection.execute("DELETE FROM board")
+            self.connection.execute(
+                "INSERT INTO board (id, data) VALUES (1, ?)",
+                [board.model_dump_json(by_alias=True, exclude={"posts"})],
+            )
+            for position, group in enumerate(board.posts):
+                self._insert_group(group, position)
+
+    def save(self, board: Board, operations: List[Operation]) -> None:
+        with self.connection:
+            for operation in operations:
+                self.apply(operation)
+
+    def apply(self, operation: Operation) -> None:
+        """Aplicar una operación como actualización de filas"""
+        path = operation.path
+
+        if isinstance(operation, InsertOperation):
+            if len(path) == 1:
+                self._shift("groups", None, path[0], 1)
+                self._insert_group(PostGroup.model_validate(operation.data), path[0])
+            else:
+                group_id = self._group_id(path[0])
+                self._shift("posts", group_id, path[1], 1)
+                self._insert_post(Post.model_validate(operation.data), group_id, path[1])
+
+        elif isinstance(operation, ExtendOperation):
+            group_id = self._group_id(path[0])
+            self._shift("posts", group_id, path[1], len(operation.posts))
+            for offset, post in enumerate(operation.posts):
+                self._insert_post(post, group_id, path[1] + offset)
+
+        elif isinstance(operation, RemoveOperation):
+            table, element_id, group_id = self._locate(path)
+            self.connection.execute(f"DELETE FROM {table} WHERE id = ?", [element_id])
+            self._shift(table, group_id, path[-1] + 1, -1)
+
+        elif isinstance(operation, MoveOperation):
+            table, element_id, group_id = self._locate(path)
+            self._shift(table, group_id, path[-1] + 1, -1)
+            target_group_id = None if len(path) == 1 else self._group_id(operation.target[0])
+            self._shift(table, target_group_id, operation.target[-1], 1)
+            if target_group_id is None:
+                self.connection.execute(
+                    "UPDATE groups SET position = ? WHERE id = ?", [operation.target[-1], element_id]
+                )
+            else:
+                self.connection.execute(
+                    "UPDATE posts SET group_id = ?, position = ? WHERE id = ?",
+                    [target_group_id, operation.target[-1], element_id],
+                )
+
+        elif isinstance(operation, UpdateOperation):
+            self._update(path, operation.fields)
+
+        elif isinstance(operation, AppendOperation):
+            _, element_id, _ = self._locate(path)
+            owner = owner_column(path)
+            (position,) = self.connection.execute(
+                f"SELECT COUNT(*) FROM {operation.field} WHERE {owner} = ?", [element_id]
+            ).fetchone()
+            item = ITEM_MODELS[operation.field].model_validate(operation.data)
+            self._insert_item(operation.field, owner, element_id, position, item)
+
+    def _select_tags(self, owner: str, owner_id: int) -> List[str]:
+        rows = self.connection.execute(f"SELECT tag FROM tags WHERE {owner} = ? ORDER BY position", [owner_id])
+        return [x for (x,) in rows]
+
+    def _select_items(self, table: str, owner: str, owner_id: int) -> List[Dict[str, Any]]:
+        columns = ITEM_COLUMNS[table]
+        rows = self.connection.execute(
+            f"SELECT {', '.join(columns)} FROM {table} WHERE {owner} = ? ORDER BY position", [owner_id]
+        )
+        return [row_data(columns, x) for x in rows]
+
+    def _group_id(self, position: int) -> int:
+        row = self.connection.execute("SELECT id FROM groups WHERE position = ?", [position]).fetchone()
+        if row is None:
+            raise IndexError(f"There is no group at position {position}")
+        return row[0]
+
+    def _locate(self, path: ElementPath) -> Tuple[str, int, Optional[int]]:
+        """Obtener la tabla, el id y el grupo contenedor del elemento en la ruta"""
+        group_id = self._group_id(path[0])
+        if len(path) == 1:
+            return "groups", group_id, None
+
+        row = self.connection.execute(
+            "SELECT id FROM posts WHERE group_id = ? AND position = ?", [group_id, path[1]]
+        ).fetchone()
+        if row is None:
+            raise IndexError(f"There is no post at position {path}")
+        return "posts", row[0], group_id
+
+    def _shift(self, table: str, group_id: Optional[int], start: int, delta: int) -> None:
+        """Desplazar las posiciones de los elementos a partir de `start`"""
+        if group_id is None:
+            self.connection.execute(f"UPDATE {table} SET position = position + ? WHERE position >= ?", [delta, start])
+        else:
+            self.connection.execute(
+                f"UPDATE {table} SET position = position + ? WHERE group_id = ? AND position >= ?",
+                [delta, group_id, start],
+            )
+
+    def _update(self, path: ElementPath, fields: Dict[str, Any]) -> None:
+        model: Type[BaseModel] = PostGroup if len(path) == 1 else Post
+        table, element_id, _ = self._locate(path)
+        names = {field.alias or name: name for name, field in model.model_fields.items()}
+        owner = owner_column(path)
+        columns = GROUP_COLUMNS if len(path) == 1 else POST_COLUMNS
+
+        for key, value in fields.items():
+            name = names.get(key, key)
+            if name in columns:
+                self.connection.execute(f"UPDATE {table} SET {name} = ? WHERE id = ?", [value, element_id])
+            elif name == "tags":
+                self.connection.execute(f"DELETE FROM tags WHERE {owner} = ?", [element_id])
+                self._insert_tags(owner, element_id, value)
+            elif name in ITEM_COLUMNS:
+                self.connection.execute(f"DELETE FROM {name} WHERE {owner} = ?", [element_id])
+                for position, data in enumerate(value):
+                    item = ITEM_MODELS[name].model_validate(data)
+                    self._insert_item(name, owner, element_id, position, item)
+
+    def _insert_group(self, group: PostGroup, position: int) -> int:
+        group_id = self._insert_row("groups", GROUP_COLUMNS, group, {"position": position})
+        self._insert_tags("group_id", group_id, group.tags)
+        for idx, comment in enumerate(group.comments):
+            self._insert_item("comments", "group_id", group_id, idx, comment)
+        for idx, post in enumerate(group.posts):
+            self._insert_post(post, group_id, idx)
+        return group_id
+
+    def _insert_post(self, post: Post, group_id: int, position: int) -> int:
+        post_id = self._insert_row("posts", POST_COLUMNS, post, {"group_id": group_id, "position": position})
+        self._insert_tags("post_id", post_id, post.tags)
+        for idx, todo in enumerate(post.todos):
+            self._insert_item("todos", "post_id", post_id, idx, todo)
+        for idx, comment in enumerate(post.comments):
+            self._insert_item("comments", "post_id", post_id, idx, comment)
+        return post_id
+
+    def _insert_item(self, table: str, owner: str, owner_id: int, position: int, item: Todo | Comment) -> int:
+        return self._insert_row(table, ITEM_COLUMNS[table], item, {owner: owner_id, "position": position})
+
+    def _insert_tags(self, owner: str, owner_id: int, tags: List[str]) -> None:
+        self.connection.executemany(
+            f"INSERT INTO tags ({owner}, position, tag) VALUES (?, ?, ?)",
+            [(owner_id, idx, tag) for idx, tag in enumerate(tags)],
+        )
+
+    def _insert_row(self, table: str, columns: List[str], model: BaseModel, extra: Dict[str, Any]) -> int:
+        values = {**extra, **model.model_dump(mode="json", include=set(columns))}
+        names = ", ".join(values)
+        placeholders = ", ".join("?" for _ in values)
+        cursor = self.connection.execute(
+            f"INSERT INTO {table} ({names}) VALUES ({placeholders})", list(values.values())
+        )
+        return cursor.lastrowid
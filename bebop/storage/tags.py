@@ -0,0 +1,215 @@
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from bebop.models import Board
+from .names import IndexPath, get_field, iter_elements
+from .operations import (
+    Operation,
+    InsertOperation,
+    ExtendOperation,
+    RemoveOperation,
+    MoveOperation,
+    UpdateOperation,
+    raw_items,
+)
+
+# Etiquetas de un grupo y de cada uno de sus posts, en listas paralelas a las del tablero
+TagNode = Tuple[List[str], List[List[str]]]
+
+
+@dataclass(frozen=True)
+class TagFilter:
+    """
+    Representa un filtro de etiquetas
+
+    Un elemento cumple el filtro si tiene alguna etiqueta de cada cláusula de `tags` y ninguna de `not_tags`.
+    """
+
+    tags: Tuple[Tuple[str, ...], ...] = ()
+    not_tags: Tuple[str, ...] = ()
+
+    @classmethod
+    def parse(cls, tags: Optional[List[str]] = None, not_tags: Optional[List[str]] = None) -> "TagFilter":
+        """Obtener el filtro de las opciones del CLI, las etiquetas separadas por comas son alternativas"""
+        clauses = [tuple(x.strip() for x in value.split(",") if x.strip()) for value in tags or []]
+        excluded = [x.strip() for value in not_tags or [] for x in value.split(",") if x.strip()]
+        return cls(tuple(x for x in clauses if len(x)), tuple(excluded))
+
+    @property
+    def is_empty(self) -> bool:
+        return not len(self.tags) and not len(self.not_tags)
+
+
+@dataclass
+class TagSelection:
+    """Representa las rutas de los elementos que cumplen un filtro, `include` es None si no lo limita"""
+
+    include: Optional[Set[IndexPath]]
+    exclude: Set[IndexPath]
+
+    def __contains__(self, path: Any) -> bool:
+        path = tuple(path)
+        return (self.include is None or path in self.include) and path not in self.exclude
+
+    def iter_posts(self, main_idx: int, posts: List[Any]) -> Iterator[Tuple[int, Any]]:
+        """Recorrer las posiciones de los posts del grupo que cumplen el filtro, sin validar los demás"""
+        if self.include is None:
+            indexes = range(len(posts))
+        else:
+            indexes = sorted(x[1] for x in self.include if len(x) == 2 and x[0] == main_idx)
+
+        items = raw_items(posts)
+        for idx in indexes:
+            if idx < len(items) and (main_idx, idx) not in self.exclude:
+                yield idx, items[idx]
+
+
+class TagIndex:
+    """
+    Representa el índice de etiquetas de los elementos de un tablero
+
+    Cada etiqueta apunta a las rutas de los elementos que la usan. Para aplicar operaciones el índice
+    se convierte en listas paralelas a las del tablero, donde insertar, eliminar o mover un elemento
+    desplaza los siguientes sin recorrer las rutas de todas las etiquetas.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, List[IndexPath]]] = None):
+        self._entries = entries or {}
+        self._tree: Optional[List[TagNode]] = None
+
+    @property
+    def entries(self) -> Dict[str, List[IndexPath]]:
+        if self._entries is None:
+            entries: Dict[str, List[IndexPath]] = {}
+            for main_idx, (group_tags, posts) in enumerate(self._tree):
+                for tag in group_tags:
+                    entries.setdefault(tag, []).append((main_idx,))
+                for sub_idx, tags in enumerate(posts):
+                    for tag in tags:
+                        entries.setdefault(tag, []).append((main_idx, sub_idx))
+            self._entries = entries
+        return self._entries
+
+    @property
+    def tree(self) -> List[TagNode]:
+        if self._tree is None:
+            tree: List[TagNode] = []
+            for tag, paths in self._entries.items():
+                for path in paths:
+                    group_tags, posts = self._node(tree, path[0])
+                    if len(path) == 1:
+                        group_tags.append(tag)
+                    else:
+                        self._post(posts, path[1]).append(tag)
+            self._tree = tree
+        return self._tree
+
+    def paths(self, tag: str) -> List[IndexPath]:
+        return self.entries.get(tag, [])
+
+    def counts(self) -> Dict[str, int]:
+        """Obtener el número de elementos que usan cada etiqueta"""
+        return {tag: len(paths) for tag, paths in self.entries.items()}
+
+    def select(self, tag_filter: TagFilter) -> TagSelection:
+        include = None
+        for clause in tag_filter.tags:
+            paths = {x for tag in clause for x in self.paths(tag)}
+            include = paths if include is None else include & paths
+        exclude = {x for tag in tag_filter.not_tags for x in self.paths(tag)}
+        return TagSelection(include, exclude)
+
+    @classmethod
+    def build(cls, board: Board) -> "TagIndex":
+        entries: Dict[str, List[IndexPath]] = {}
+        for main_idx, group in iter_elements(board.posts):
+            for tag in get_field(group, "tags", []):
+                entries.setdefault(tag, []).append((main_idx,))
+            for sub_idx, post in iter_elements(get_field(group, "posts", [])):
+                for tag in get_field(post, "tags", []):
+                    entries.setdefault(tag, []).append((main_idx, sub_idx))
+        return cls(entries)
+
+    def apply(self, operation: Operation) -> None:
+        """Actualizar el índice con una operación aplicada al tablero"""
+        tree = self.tree
+        path = operation.path
+
+        if isinstance(operation, InsertOperation):
+            data = operation.data
+            if len(path) == 1:
+                while len(tree) < path[0]:
+                    tree.append(([], []))
+                tree.insert(path[0], (list(data.get("tags", [])), [list(x.get("tags", [])) for x in data["posts"]]))
+            else:
+                posts = self._node(tree, path[0])[1]
+                while len(posts) < path[1]:
+                    posts.append([])
+                posts.insert(path[1], list(data.get("tags", [])))
+
+        elif isinstance(operation, ExtendOperation):
+            posts = self._node(tree, path[0])[1]
+            while len(posts) < path[1]:
+                posts.append([])
+            posts[path[1] : path[1]] = [list(x.tags) for x in operation.posts]
+
+        elif isinstance(operation, RemoveOperation):
+            self._pop(tree, path)
+
+        elif isinstance(operation, MoveOperation):
+            moved = self._pop(tree, path)
+            target = operation.target
+            items = tree if len(target) == 1 else self._node(tree, target[0])[1]
+            while len(items) < target[-1]:
+                items.append(([], []) if len(target) == 1 else [])
+            items.insert(target[-1], moved)
+
+        elif isinstance(operation, UpdateOperation) and "tags" in operation.fields:
+            group_tags, posts = self._node(tree, path[0])
+            tags = group_tags if len(path) == 1 else self._post(posts, path[1])
+            tags[:] = operation.fields["tags"]
+
+        else:
+            return
+        self._entries = None
+
+    @classmethod
+    def read(cls, path: Path, signature: str) -> Optional["TagIndex"]:
+        """Leer el índice guardado, si corresponde a la firma del tablero"""
+        if not path.is_file():
+            return None
+
+        try:
+            data = json.loads(path.read_text())
+        except ValueError:
+            return None
+        if data.get("signature") != signature:
+            return None
+        return cls({tag: [tuple(x) for x in paths] for tag, paths in data["tags"].items()})
+
+    def write(self, path: Path, signature: str) -> None:
+        temp = path.with_suffix(".tmp")
+        temp.write_text(json.dumps({"signature": signature, "tags": self.entries}))
+        temp.rename(path)
+
+    @staticmethod
+    def _node(tree: List[TagNode], main_idx: int) -> TagNode:
+        while len(tree) <= main_idx:
+            tree.append(([], []))
+        return tree[main_idx]
+
+    @staticmethod
+    def _post(posts: List[List[str]], sub_idx: int) -> List[str]:
+        while len(posts) <= sub_idx:
+            posts.append([])
+        return posts[sub_idx]
+
+    @staticmethod
+    def _pop(tree: List[TagNode], path: List[int]) -> Any:
+        """Eliminar el elemento de las listas, devolviendo sus etiquetas"""
+        if len(path) == 1:
+            return tree.pop(path[0]) if path[0] < len(tree) else ([], [])
+        posts = tree[path[0]][1] if path[0] < len(tree) else []
+        return posts.pop(path[1]) if path[1] < len(posts) else []
@@ -1,27 +1,55 @@
+import copy
 import re
 from collections import UserString
-from typing import Optional, ClassVar, Pattern
+from functools import lru_cache
+from typing import ClassVar, Iterable, Iterator, List, Optional, Pattern, Tuple
 
 ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
 reference_token_pattern = re.compile(r"^@[a-z0-9_]+$")
 index_token_pattern = re.compile(r"^[A-Z]+[0-9]*$")
 range_token_pattern = re.compile(r"^([A-Z]+[0-9]*)?:[A-Z]*[0-9]*$")
+BOARD_SEPARATOR = "/"
 
 
 class Token(UserString):
     """Representa un identificador de un elemento"""
 
     pattern: ClassVar[Pattern] = re.compile(r"^(@[a-z0-9_]+|(([A-Z]+[0-9]*)?:[A-Z]*[0-9]*|[A-Z]+[0-9]*))$")
+    # Tablero del elemento cuando se muestran varios a la vez, como en 'svc-a/B3'
+    board: Optional[str] = None
 
     def __init__(self, value: str):
         if self.pattern.match(value) is None:
             raise ValueError(f"'{value}' is not a valid {self.__class__.__name__}")
         super().__init__(value)
 
+    def __str__(self) -> str:
+        return self.data if self.board is None else f"{self.board}{BOARD_SEPARATOR}{self.data}"
+
+    def with_board(self, board: Optional[str]) -> "Token":
+        """Obtener una copia del token que identifica al elemento en el tablero indicado"""
+        token = copy.copy(self)
+        token.board = board
+        return token
+
     @classmethod
     def is_valid(cls, value: str) -> bool:
         return cls.pattern.match(value) is not None
 
+    @staticmethod
+    def parse(value: str) -> "IndexToken | RefToken | TokenRange":
+        """Obtener el token del tipo que corresponde al valor, con el tablero si lo precede como en 'svc-a/B3'"""
+        board, _, value = value.rpartition(BOARD_SEPARATOR)
+        if value.startswith("@"):
+            token = RefToken(value)
+        elif ":" in value:
+            token = TokenRange(value)
+        else:
+            token = IndexToken(value)
+        if board != "":
+            token.board = board
+        return token
+
 
 class RefToken(Token):
     """Representa un identificador de nombre de un elemento"""
@@ -33,7 +61,7 @@ class RefToken(Token):
 
     @property
     def name(self) -> str:
-        return self[1:]
+        return self.data[1:]
 
     @classmethod
     def from_name(cls, name: str) -> "RefToken":
@@ -41,49 +69,143 @@ class RefToken(Token):
 
 
 class IndexToken(Token):
-    """Representa un identificador de índice"""
+    """
+    Representa un identificador de índice
+
+    Las posiciones se calculan al crear el token, y la lectura de los valores más usados se guarda en caché.
+    """
 
     pattern = index_token_pattern
 
     def __init__(self, value: str):
-        super().__init__(value.upper())
+        value = value.upper()
+        self._main_index, self._sub_index = parse_index(value)
+        self.data = value
 
     @property
     def main_index(self) -> int:
-        chars = self._get_chars()
-        total = 0
-        length = len(chars) - 1
-        for char in chars:
-            index = ALPHABET.index(char) + 1
-            total += (26**length) * index
-            length -= 1
-        return total - 1
+        return self._main_index
 
     @property
     def sub_index(self) -> Optional[int]:
-        sub = re.sub(r"[A-Z]", "", str(self))
-        return int(sub) - 1 if sub != "" else None
-
-    def _get_chars(self) -> str:
-        return re.sub(r"\d", "", str(self))
+        return self._sub_index
 
     @classmethod
     def from_index(cls, idx: int, sub_idx: Optional[int] = None) -> "IndexToken":
-        idx = abs(idx) + 1
-        chars = ""
-        while idx > 0:
-            res = (idx - 1) % 26
-            chars = ALPHABET[res] + chars
-            idx = (idx - 1) // 26
-        sub = sub_idx + 1 if sub_idx is not None else ""
-        char = chars or "A"
-        return cls(f"{char}{sub}")
+        idx = abs(idx)
+        if sub_idx is not None and sub_idx < -1:
+            raise ValueError(f"'{group_letters(idx)}{sub_idx + 1}' is not a valid {cls.__name__}")
+        return cls._build(idx, sub_idx)
+
+    @classmethod
+    def iter_group(cls, idx: int, stop: int, start: int = 0) -> Iterator["IndexToken"]:
+        """Recorrer los tokens de los posts de un grupo entre dos posiciones, sin validar cada uno"""
+        letters = group_letters(idx)
+        for sub_idx in range(start, stop):
+            yield cls._build(idx, sub_idx, letters)
+
+    @classmethod
+    def iter_board(cls, sizes: Iterable[int]) -> Iterator[Tuple["IndexToken", List["IndexToken"]]]:
+        """Recorrer los tokens de cada grupo junto a los de sus posts, dado el número de posts de cada grupo"""
+        for idx, size in enumerate(sizes):
+            yield cls._build(idx, None), list(cls.iter_group(idx, size))
+
+    @classmethod
+    def _build(cls, idx: int, sub_idx: Optional[int], letters: Optional[str] = None) -> "IndexToken":
+        """Crear el token de posiciones válidas sin pasar por la validación del texto"""
+        token = cls.__new__(cls)
+        letters = letters or group_letters(idx)
+        token.data = letters if sub_idx is None else f"{letters}{sub_idx + 1}"
+        token._main_index, token._sub_index = idx, sub_idx
+        return token
+
+
+@lru_cache(maxsize=4096)
+def parse_index(value: str) -> Tuple[int, Optional[int]]:
+    """
+    Obtener las posiciones del grupo y del post de un IndexToken en mayúsculas
+
+    :raises ValueError: Si el valor no es un IndexToken
+    """
+    if index_token_pattern.match(value) is None:
+        raise ValueError(f"'{value}' is not a valid IndexToken")
+
+    total = 0
+    position = 0
+    for position, char in enumerate(value):
+        if char.isdigit():
+            break
+        total = total * 26 + ALPHABET.index(char) + 1
+    else:
+        return total - 1, None
+    return total - 1, int(value[position:]) - 1
+
+
+@lru_cache(maxsize=1024)
+def group_letters(idx: int) -> str:
+    """Obtener las letras del token de la posición de un grupo"""
+    idx += 1
+    chars = ""
+    while idx > 0:
+        chars = ALPHABET[(idx - 1) % 26] + chars
+        idx = (idx - 1) // 26
+    return chars or "A"
 
 
 class TokenRange(Token):
-    """Representa un identificador de rango de índices"""
+    """
+    Representa un identificador de rango de índices
+
+    Si el inicio indica un post o el final está vacío, es un rango de posts de un grupo ('B3:B40', 'B3:40', 'C:'),
+    si no es un rango de grupos ('A:F', ':C').
+    """
 
     pattern = range_token_pattern
 
     def __init__(self, value: str):
         super().__init__(value.upper())
+
+    @property
+    def start(self) -> Optional[IndexToken]:
+        value = self.data.split(":")[0]
+        return IndexToken(value) if value != "" else None
+
+    @property
+    def end(self) -> Optional[IndexToken]:
+        value = self.data.split(":")[1]
+        return IndexToken(value) if IndexToken.is_valid(value) else None
+
+    @property
+    def is_post_range(self) -> bool:
+        start, end = self.data.split(":")
+        return start != "" and (start[-1].isdigit() or end == "")
+
+    def post_slice(self) -> Tuple[int, slice]:
+        """
+        Obtener la posición del grupo y las posiciones de los posts del rango
+
+        :raises ValueError: Si el final del rango está en otro grupo
+        """
+        start, end = self.data.split(":")
+        first = IndexToken(start)
+        stop = None
+        if end.isdigit():
+            stop = int(end)
+        elif end != "":
+            last = IndexToken(end)
+            if last.main_index != first.main_index or last.sub_index is None:
+                raise ValueError(f"'{self}' is not a range of posts of a single group")
+            stop = last.sub_index + 1
+        return first.main_index, slice(first.sub_index or 0, stop)
+
+    def group_slice(self) -> slice:
+        """
+        Obtener las posiciones de los grupos del rango
+
+        :raises ValueError: Si el rango indica posiciones de posts
+        """
+        if any(x.isdigit() for x in self.data):
+            raise ValueError(f"'{self}' is not a range of groups")
+        start = self.start.main_index if self.start else None
+        stop = self.end.main_index + 1 if self.end else None
+        return slice(start, stop)
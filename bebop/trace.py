@@ -0,0 +1,153 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+TRACE_ENV = "BEBOP_TRACE"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class Span:
+    """Representa un intervalo medido, con los bytes y objetos procesados en él"""
+
+    name: str
+    start: int = 0
+    duration: int = 0
+    thread: int = 0
+    counts: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, **counts: int) -> None:
+        for name, value in counts.items():
+            self.counts[name] = self.counts.get(name, 0) + value
+
+
+class NullSpan(Span):
+    """Representa un intervalo que no se registra, ignora los contadores"""
+
+    def add(self, **counts: int) -> None:
+        pass
+
+
+NULL_SPAN = NullSpan("")
+
+
+class Tracer:
+    """
+    Representa el registro de intervalos de tiempo de una ejecución del CLI
+
+    Desactivado, medir un intervalo sólo cuesta comprobar un atributo. Los intervalos con el nombre de
+    otro que sigue abierto en el mismo hilo no se registran, para no contar dos veces las llamadas anidadas.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.spans: List[Span] = []
+        self.origin = time.perf_counter_ns()
+        self._local = threading.local()
+
+    def enable(self) -> None:
+        """Empezar a registrar intervalos, descartando los anteriores"""
+        self.enabled = True
+        self.spans = []
+        self.origin = time.perf_counter_ns()
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    @contextmanager
+    def span(self, name: str, **counts: int) -> Iterator[Span]:
+        """Medir el tiempo del bloque, el intervalo devuelto acumula los bytes u objetos que se le indiquen"""
+        if not self.enabled:
+            yield NULL_SPAN
+            return
+
+        open_names = getattr(self._local, "names", None)
+        if open_names is None:
+            open_names = self._local.names = set()
+        if name in open_names:
+            yield NULL_SPAN
+            return
+
+        span = Span(name, time.perf_counter_ns() - self.origin, thread=threading.get_ident(), counts=dict(counts))
+        open_names.add(name)
+        try:
+            yield span
+        finally:
+            open_names.discard(name)
+            span.duration = time.perf_counter_ns() - self.origin - span.start
+            self.spans.append(span)
+
+    def traced(self, name: str) -> Callable[[F], F]:
+        """Decorador que mide cada llamada a la función como un intervalo"""
+
+        def decorator(func: F) -> F:
+            @wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.span(name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def summary(self) -> List["SpanSummary"]:
+        """Obtener el tiempo total y los contadores de cada nombre, en el orden en el que empezaron"""
+        summaries: Dict[str, SpanSummary] = {}
+        for span in sorted(self.spans, key=lambda x: x.start):
+            summary = summaries.setdefault(span.name, SpanSummary(span.name))
+            summary.calls += 1
+            summary.duration += span.duration
+            for name, value in span.counts.items():
+                summary.counts[name] = summary.counts.get(name, 0) + value
+        return list(summaries.values())
+
+    @property
+    def elapsed(self) -> int:
+        return time.perf_counter_ns() - self.origin
+
+    def write_chrome_trace(self, path: Path) -> None:
+        """Escribir los intervalos en el formato de eventos de Chrome, que abren chrome://tracing y Perfetto"""
+        pid = os.getpid()
+        events = [
+            {
+                "name": x.name,
+                "cat": x.name.split(".")[0],
+                "ph": "X",
+                "ts": x.start / 1000,
+                "dur": x.duration / 1000,
+                "pid": pid,
+                "tid": x.thread,
+                "args": x.counts,
+            }
+            for x in self.spans
+        ]
+        path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+
+
+@dataclass
+class SpanSummary:
+    """Representa el total de los intervalos con el mismo nombre"""
+
+    name: str
+    calls: int = 0
+    duration: int = 0
+    counts: Dict[str, int] = field(default_factory=dict)
+
+
+def get_trace_path() -> Optional[Path]:
+    value = os.environ.get(TRACE_ENV)
+    return Path(value) if value else None
+
+
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced
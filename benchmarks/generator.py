@@ -0,0 +1,94 @@
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pydantic_core
+
+CREATED_AT = "2024-01-01T12:00:00"
+WORDS = "deploy login timeout cache query index report review release incident backup migration".split()
+
+
+@dataclass
+class BoardSpec:
+    """
+    Representa la forma de un tablero sintético
+
+    Los posts se reparten entre los grupos por igual. Cada post tiene `tags_per_post` etiquetas de un
+    vocabulario de `tags`, elegidas con una distribución de Zipf de exponente `tag_skew`, y una fracción
+    `descriptions` de los posts tiene una descripción de `description_bytes` bytes.
+    """
+
+    posts: int
+    groups: int = 10
+    todos: int = 3
+    comments: int = 2
+    descriptions: float = 0.2
+    description_bytes: int = 200
+    tags: int = 50
+    tags_per_post: int = 2
+    tag_skew: float = 1.0
+    names: float = 0.1
+    seed: int = 0
+
+    def is_named(self, number: int) -> bool:
+        """Comprobar si el post tiene nombre, los nombres se reparten a intervalos fijos"""
+        return self.names > 0 and number % max(1, round(1 / self.names)) == 0
+
+    def locate(self, number: int) -> Tuple[int, int]:
+        """Obtener la posición del grupo y del post con el número indicado"""
+        size, extra = divmod(self.posts, self.groups)
+        # Los primeros `extra` grupos tienen un post más
+        if number < extra * (size + 1):
+            return divmod(number, size + 1)
+        group, idx = divmod(number - extra * (size + 1), size)
+        return group + extra, idx
+
+
+def get_text(rng: random.Random, size: int) -> str:
+    words = []
+    length = 0
+    while length < size:
+        words.append(rng.choice(WORDS))
+        length += len(words[-1]) + 1
+    return " ".join(words)[:size]
+
+
+def generate_post(spec: BoardSpec, rng: random.Random, number: int, tags: List[str], weights: List[float]) -> Dict:
+    post: Dict[str, Any] = {"createdAt": CREATED_AT, "title": f"Post {number} {get_text(rng, 30)}"}
+    if spec.is_named(number):
+        post["name"] = f"post_{number}"
+    if rng.random() < spec.descriptions:
+        post["description"] = get_text(rng, spec.description_bytes)
+    if len(tags) and spec.tags_per_post:
+        post["tags"] = sorted(set(rng.choices(tags, weights, k=spec.tags_per_post)))
+    post["todos"] = [
+        {"createdAt": CREATED_AT, "text": get_text(rng, 40), "checked": rng.random() < 0.5} for _ in range(spec.todos)
+    ]
+    post["comments"] = [{"createdAt": CREATED_AT, "text": get_text(rng, 80)} for _ in range(spec.comments)]
+    return post
+
+
+def generate_board(spec: BoardSpec) -> Dict[str, Any]:
+    """Obtener los datos en formato JSON de un tablero con la forma indicada, siempre los mismos para una semilla"""
+    rng = random.Random(spec.seed)
+    tags = [f"tag{x}" for x in range(spec.tags)]
+    weights = [1 / (x + 1) ** spec.tag_skew for x in range(spec.tags)]
+
+    groups = []
+    number = 0
+    for group_idx in range(spec.groups):
+        count = spec.posts // spec.groups + (1 if group_idx < spec.posts % spec.groups else 0)
+        posts = []
+        for _ in range(count):
+            posts.append(generate_post(spec, rng, number, tags, weights))
+            number += 1
+        groups.append(
+            {"createdAt": CREATED_AT, "title": f"Group {group_idx}", "name": f"group_{group_idx}", "posts": posts}
+        )
+    return {"createdAt": CREATED_AT, "title": f"Benchmark {spec.posts}", "posts": groups}
+
+
+def write_board(spec: BoardSpec, path: Path) -> None:
+    """Escribir el tablero generado como archivo JSON, con el mismo formato que JsonStorage"""
+    path.write_bytes(pydantic_core.to_json(generate_board(spec), indent=2))
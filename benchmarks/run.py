@@ -0,0 +1,304 @@
+"""
+Benchmarks de bebop sobre tableros sintéticos
+
+    python -m benchmarks.run --sizes 100 10000 --output results.json
+    python -m benchmarks.run --sizes 100 10000 --compare baseline.json
+"""
+
+import io
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Annotated, Any, Callable, Dict, List, Optional
+
+import typer
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from .generator import BoardSpec, write_board
+
+BOARD_NAME = "bench"
+# Diferencia mínima para considerar una regresión, por debajo domina el ruido de la medición
+MIN_DELTA = 0.001
+
+Setup = Callable[["Bench"], Callable[[], Any]]
+
+
+@dataclass
+class Measure:
+    """Representa los tiempos de un caso para un tamaño de tablero, en segundos"""
+
+    case: str
+    posts: int
+    runs: int
+    min: float
+    median: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.case}@{self.posts}"
+
+
+@dataclass
+class Regression:
+    """Representa un caso más lento que en la referencia"""
+
+    key: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+class Bench:
+    """Representa un tablero sintético en un directorio de configuración temporal"""
+
+    def __init__(self, spec: BoardSpec, root: Path, storage: str, lazy: bool):
+        from bebop.cli.config import BebopConfig
+
+        self.spec = spec
+        self.root = root
+        # click usa XDG_CONFIG_HOME para el directorio de la aplicación
+        os.environ["XDG_CONFIG_HOME"] = str(root)
+        path = BebopConfig.get_root_path()
+        path.mkdir(parents=True)
+        self.config = BebopConfig(storage=storage, lazyLoad=lazy)
+        BebopConfig.get_config_path().write_text(self.config.model_dump_json(indent=2, by_alias=True))
+
+        json_config = BebopConfig(storage="json", lazyLoad=True)
+        write_board(spec, path / f"{BOARD_NAME}.json")
+        if storage != "json":
+            source = self.context(json_config)
+            source.get_storage(self.config.storage).write(source.board)
+
+        # Los índices auxiliares se guardan como lo haría el primer comando que los usa
+        context = self.context()
+        context.names
+        context.tags
+        context.save_board()
+
+        named = [x for x in range(spec.posts // 2, -1, -1) if spec.is_named(x)]
+        self.name = f"post_{named[0]}" if len(named) else None
+        self.middle = spec.locate(spec.posts // 2)
+
+    def context(self, config: Optional[Any] = None):
+        from bebop.cli.context import BebopContext
+
+        return BebopContext(config or self.config, BOARD_NAME)
+
+    def loaded(self):
+        context = self.context()
+        context.board
+        return context
+
+    @property
+    def token(self) -> str:
+        from bebop.token import IndexToken
+
+        return str(IndexToken.from_index(*self.middle))
+
+
+def case_load(bench: Bench) -> Callable[[], Any]:
+    context = bench.context()
+    return lambda: context.board
+
+
+def case_save(bench: Bench) -> Callable[[], Any]:
+    context = bench.loaded()
+    group = context.board.posts[bench.middle[0]]
+    context.update_element(group, group.posts[bench.middle[1]], title="saved")
+    return context.save_board
+
+
+def case_get_tree_by_index(bench: Bench) -> Callable[[], Any]:
+    from bebop.token import IndexToken
+
+    context = bench.loaded()
+    token = IndexToken(bench.token)
+    return lambda: context.get_tree_by_index(token)
+
+
+def case_get_tree_by_ref(bench: Bench) -> Callable[[], Any]:
+    from bebop.token import RefToken
+
+    context = bench.loaded()
+    token = RefToken.from_name(bench.name or "group_0")
+    return lambda: context.get_tree_by_ref(token)
+
+
+def case_kanban(bench: Bench) -> Callable[[], Any]:
+    from bebop.cli import render
+
+    context = bench.loaded()
+    console = Console(file=io.StringIO(), width=200, theme=context.theme)
+    kanban = render.Kanban(context.board, context.config, render.KanbanView(rows=50))
+    return lambda: console.print(kanban)
+
+
+def case_element_info(bench: Bench) -> Callable[[], Any]:
+    from bebop.cli import render
+    from bebop.token import IndexToken
+
+    context = bench.loaded()
+    group = context.board.posts[bench.middle[0]]
+    post = group.posts[bench.middle[1]]
+    console = Console(file=io.StringIO(), width=200, theme=context.theme)
+    info = render.ElementInfo(post, IndexToken.from_index(*bench.middle), context.config)
+    return lambda: console.print(info)
+
+
+def command_case(*args: str) -> Setup:
+    """Obtener un caso que ejecuta un comando del CLI, `{token}` se reemplaza por el post del medio del tablero"""
+
+    def setup(bench: Bench) -> Callable[[], Any]:
+        from typer.testing import CliRunner
+
+        from bebop.cli.main import app
+
+        runner = CliRunner()
+        argv = ["--board", BOARD_NAME, "--rows", "20", *[x.format(token=bench.token) for x in args]]
+
+        def run() -> None:
+            result = runner.invoke(app, argv)
+            if result.exit_code != 0:
+                raise RuntimeError(f"'bebop {' '.join(argv)}' failed:\n{result.output}") from result.exception
+
+        return run
+
+    return setup
+
+
+CASES: Dict[str, Setup] = {
+    "load": case_load,
+    "save": case_save,
+    "get_tree_by_index": case_get_tree_by_index,
+    "get_tree_by_ref": case_get_tree_by_ref,
+    "kanban": case_kanban,
+    "element_info": case_element_info,
+    "cmd_post": command_case("post", "bench post", "A"),
+    "cmd_push": command_case("push", "first", "second", "-o", "B"),
+    "cmd_insert": command_case("insert", "inserted", "{token}"),
+    "cmd_edit": command_case("edit", "{token}", "--title", "edited"),
+    "cmd_describe": command_case("describe", "{token}", "A new description"),
+    "cmd_mv": command_case("mv", "{token}", "A1"),
+    "cmd_todo": command_case("todo", "bench todo", "{token}"),
+    "cmd_comment": command_case("comment", "bench comment", "{token}"),
+    "cmd_rm": command_case("rm", "A1", "-y"),
+    "cmd_archive": command_case("archive", "A1"),
+}
+
+
+def measure(bench: Bench, name: str, setup: Setup, repeat: int, budget: float) -> Measure:
+    """Medir un caso hasta `repeat` veces, o menos si las ejecuciones superan el tiempo de `budget` segundos"""
+    times: List[float] = []
+    total = 0.0
+    while len(times) < repeat and (not len(times) or total < budget):
+        func = setup(bench)
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+        total += times[-1]
+    return Measure(name, bench.spec.posts, len(times), min(times), statistics.median(times))
+
+
+def compare(results: List[Measure], baseline: List[Measure], tolerance: float) -> List[Regression]:
+    """Obtener los casos cuya mediana supera la de la referencia en más de `tolerance` (0.2 es un 20%)"""
+    previous = {x.key: x for x in baseline}
+    regressions = []
+    for measure in results:
+        base = previous.get(measure.key)
+        if base is None:
+            continue
+        if measure.median > base.median * (1 + tolerance) and measure.median - base.median > MIN_DELTA:
+            regressions.append(Regression(measure.key, base.median, measure.median))
+    return regressions
+
+
+def read_results(path: Path) -> List[Measure]:
+    return [Measure(**x) for x in json.loads(path.read_text())["results"]]
+
+
+def write_results(path: Path, results: List[Measure], storage: str, lazy: bool) -> None:
+    data = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "storage": storage,
+        "lazy": lazy,
+        "results": [asdict(x) for x in results],
+    }
+    path.write_text(json.dumps(data, indent=2))
+
+
+def main(
+    sizes: Annotated[List[int], typer.Option("--sizes", help="Number of posts of each board")] = [
+        100,
+        10_000,
+        1_000_000,
+    ],
+    cases: Annotated[Optional[List[str]], typer.Option("--case", "-c", help="Cases to run, all by default")] = None,
+    storage: Annotated[str, typer.Option("--storage", help="Storage format of the boards")] = "json",
+    lazy: Annotated[bool, typer.Option("--lazy/--no-lazy", help="Load the boards lazily")] = False,
+    repeat: Annotated[int, typer.Option("--repeat", "-r", min=1, help="Maximum runs of each case")] = 5,
+    budget: Annotated[float, typer.Option("--budget", help="Seconds after which a case stops repeating")] = 2.0,
+    output: Annotated[Path, typer.Option("--output", "-o", help="File to write the results to")] = Path(
+        "benchmark-results.json"
+    ),
+    baseline: Annotated[Optional[Path], typer.Option("--compare", help="Results to compare against")] = None,
+    tolerance: Annotated[float, typer.Option("--tolerance", help="Allowed slowdown, 0.2 is 20%")] = 0.2,
+    results_path: Annotated[
+        Optional[Path], typer.Option("--results", help="Compare these results instead of running the benchmarks")
+    ] = None,
+) -> None:
+    """Run the bebop benchmarks on synthetic boards and compare them with a baseline"""
+    console = Console()
+    unknown = set(cases or []) - set(CASES)
+    if len(unknown):
+        raise typer.BadParameter(f"Unknown cases: {', '.join(sorted(unknown))}", param_hint="'--case'")
+
+    if results_path is not None:
+        results = read_results(results_path)
+    else:
+        results = []
+        for size in sizes:
+            with tempfile.TemporaryDirectory(prefix="bebop-bench-") as root:
+                console.print(f"[dim]Generating a board with {size} posts[/]")
+                bench = Bench(BoardSpec(posts=size), Path(root), storage, lazy)
+                for name in cases or list(CASES):
+                    results.append(measure(bench, name, CASES[name], repeat, budget))
+                    console.print(f"  {name:<20} {results[-1].median * 1000:10.2f} ms")
+        write_results(output, results, storage, lazy)
+        console.print(f"Results written to '{output}'")
+
+    if baseline is None:
+        return
+
+    regressions = compare(results, read_results(baseline), tolerance)
+    table = Table(box=box.SIMPLE, title=f"Regressions over {tolerance:.0%} against '{baseline}'")
+    table.add_column("Case")
+    table.add_column("Baseline", justify="right")
+    table.add_column("Current", justify="right")
+    table.add_column("Ratio", justify="right", style="red")
+    for regression in regressions:
+        table.add_row(
+            regression.key,
+            f"{regression.baseline * 1000:.2f} ms",
+            f"{regression.current * 1000:.2f} ms",
+            f"x{regression.ratio:.2f}",
+        )
+    console.print(table if len(regressions) else "[green]No regressions[/]")
+    if len(regressions):
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -1,5 +1,5 @@
-from bebop.cli.main import app
+from bebop.cli.client import main
 
 
 if __name__ == "__main__":
-    app()
+    main()
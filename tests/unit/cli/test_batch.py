@@ -0,0 +1,55 @@
+from typer.testing import CliRunner
+
+from bebop.cli.context import BebopContext
+from bebop.cli.main import app
+from bebop.storage import JsonStorage
+
+COMMANDS = """
+push first second -o A
+# the todo is added to A1
+["todo", "with spaces", "A1"]
+mv A1 B
+rm A9 -y
+bebop post "Last one" C -t foo
+"""
+
+
+class TestBatch:
+
+    def test_run_and_save_once(self, config, mocker):
+        """Comprobar que los comandos se aplican en orden y el tablero se guarda una sola vez"""
+        mocker.patch("bebop.cli.config.BebopConfig.load_config", return_value=config)
+        save = mocker.spy(JsonStorage, "save")
+        kanban = mocker.patch("bebop.cli.render.Kanban")
+
+        result = CliRunner().invoke(app, ["--board", "test", "batch"], input=COMMANDS)
+        assert result.exit_code == 1
+        assert "The Token 'A9' does not exists" in result.output
+        assert "5 commands, 1 failed. Changes saved" in result.output
+        save.assert_called_once()
+        kanban.assert_not_called()
+
+        board = BebopContext(config, "test").board
+        assert [x.title for x in board.posts[0].posts] == ["second"]
+        assert board.posts[1].posts[0].todos[0].text == "with spaces"
+        assert board.posts[2].posts[0].tags == ["foo"]
+
+    def test_atomic_does_not_save_on_error(self, config, mocker):
+        """Comprobar que con --atomic un comando fallido descarta todos los cambios sin guardar el tablero"""
+        mocker.patch("bebop.cli.config.BebopConfig.load_config", return_value=config)
+        BebopContext(config, "test").board
+
+        result = CliRunner().invoke(app, ["--board", "test", "batch", "--atomic"], input=COMMANDS)
+        assert result.exit_code == 1
+        assert "4 commands, 1 failed. Changes not saved" in result.output
+        assert not len(BebopContext(config, "test").board.posts[0].posts)
+
+    def test_prompts_fail(self, config, mocker):
+        """Comprobar que los comandos que piden datos al usuario fallan en lugar de esperar"""
+        mocker.patch("bebop.cli.config.BebopConfig.load_config", return_value=config)
+
+        result = CliRunner().invoke(app, ["--board", "test", "batch", "--print"], input="edit\nrm A\nnope\n")
+        assert "Asking for a token requires an interactive terminal" in result.output
+        assert "Confirming a removal requires an interactive terminal" in result.output
+        assert "No such command 'nope'" in result.output
+        assert len(BebopContext(config, "test").board.posts) == 3
@@ -0,0 +1,97 @@
+import pytest
+import typer
+from typer.testing import CliRunner
+
+from bebop.cli.boards import BoardSet, match_boards
+from bebop.cli.context import BebopContext
+from bebop.cli.main import app
+from bebop.models import Post
+from bebop.token import Token
+
+
+@pytest.fixture()
+def boards(config):
+    for name in ("svc-a", "svc-b", "other"):
+        context = BebopContext(config, name)
+        context.add_post(context.board.posts[0], Post(title=f"deploy {name}", tags=["ops"]))
+        context.add_post(context.board.posts[1], Post(title=f"review {name}"))
+        context.save_board()
+    yield config
+
+
+class TestBoardSet:
+
+    def test_match_boards(self, boards):
+        """Comprobar que se seleccionan los tableros por patrón o por lista, sin archivos auxiliares"""
+        assert match_boards(boards, "svc-*") == ["svc-a", "svc-b"]
+        assert match_boards(boards, "other, svc-*,svc-a") == ["other", "svc-a", "svc-b"]
+        with pytest.raises(typer.BadParameter):
+            match_boards(boards, "svc-a,missing")
+
+    def test_board_tokens(self, boards):
+        """Comprobar que los tokens precedidos por el tablero se resuelven en ese tablero"""
+        token = Token.parse("svc-b/B1")
+        assert str(token) == "svc-b/B1" and token.board == "svc-b" and token.main_index == 1
+
+        elements = BoardSet.from_pattern(boards, "svc-*").iter_elements([token])
+        assert [(x.title, str(y)) for x, y in elements] == [("review svc-b", "svc-b/B1")]
+        with pytest.raises(typer.Abort):
+            BebopContext(boards, "svc-a").get_tree(token)
+
+    def test_search_ranking(self, boards):
+        """Comprobar que los resultados de tableros de tamaños muy distintos se intercalan según su posición"""
+        # En el tablero grande la palabra es frecuente y sus puntuaciones son mucho menores que en el pequeño
+        context = BebopContext(boards, "svc-a")
+        for idx in range(40):
+            context.add_post(context.board.posts[2], Post(title=f"rollback {idx}", description="rollback " * (idx % 5)))
+        context.save_board()
+        context = BebopContext(boards, "svc-b")
+        for title in ("rollback plan", "notes about the rollback of the last release"):
+            context.add_post(context.board.posts[2], Post(title=title))
+        context.save_board()
+
+        board_set = BoardSet.from_pattern(boards, "svc-*")
+        best = {x.board_name: x.search("rollback", 3) for x in board_set.contexts}
+        assert best["svc-b"][-1].score > best["svc-a"][0].score
+
+        results = board_set.search("rollback", 4)
+        assert [(x.board, x.title) for x in results] == [
+            ("svc-a", best["svc-a"][0].title),
+            ("svc-b", "rollback plan"),
+            ("svc-a", best["svc-a"][1].title),
+            ("svc-b", "notes about the rollback of the last release"),
+        ]
+        assert [x.score for x in results] == sorted((x.score for x in results), reverse=True)
+
+    def test_merged_kanban(self, boards):
+        """Comprobar que los tableros se muestran en un solo Kanban con las columnas de todos y un resumen"""
+        context = BebopContext(boards, "svc-b")
+        for idx in range(3):
+            context.add_post(context.board.posts[2], Post(title=f"done {idx}"))
+        context.save_board()
+
+        result = CliRunner().invoke(app, ["-b", "svc-*", "--rows", "2"], env={"COLUMNS": "200"})
+        assert result.exit_code == 0
+        header = next(x for x in result.output.splitlines() if "svc-a/A" in x)
+        assert "svc-a/C" in header and "svc-b/A" in header and "svc-b/C" in header
+        assert result.output.count("Svc-A, Svc-B") == 1
+        assert result.output.count("Page 1/2") == 1 and "svc-b/C Done 3" in result.output
+
+    def test_cli(self, boards):
+        """Comprobar que el Kanban, show, search y los filtros abarcan todos los tableros seleccionados"""
+        runner = CliRunner()
+        result = runner.invoke(app, ["-b", "svc-*"], env={"COLUMNS": "200"})
+        assert result.exit_code == 0
+        assert "svc-a/A1" in result.output and "svc-b/B1" in result.output and "other" not in result.output
+
+        result = runner.invoke(app, ["-b", "svc-*", "--tag", "ops", "show"])
+        assert result.exit_code == 0
+        assert "deploy svc-a" in result.output and "deploy svc-b" in result.output
+        assert "review" not in result.output
+
+        result = runner.invoke(app, ["-b", "svc-a,other", "search", "review"])
+        assert result.exit_code == 0
+        assert "svc-a/B1" in result.output and "other/B1" in result.output
+
+        result = runner.invoke(app, ["-b", "svc-*", "post", "x", "A"])
+        assert result.exit_code != 0 and "single board" in result.output
@@ -0,0 +1,40 @@
+from io import StringIO
+
+from rich.console import Console
+
+from bebop.cli.context import BebopContext
+from bebop.models import PostGroup
+
+
+class TestRenderCache:
+
+    def test_reuse_output(self, config, mocker):
+        """Comprobar que la salida guardada se imprime sin cargar ni renderizar el tablero"""
+        expected = self.print_kanban(BebopContext(config, "test"))
+
+        context = BebopContext(config, "test")
+        kanban = mocker.patch("bebop.cli.render.Kanban")
+        load = mocker.patch("bebop.cli.context.BebopContext.load_board")
+        assert self.print_kanban(context) == expected
+        kanban.assert_not_called()
+        load.assert_not_called()
+
+    def test_changes_refresh_output(self, config):
+        """Comprobar que los cambios guardados y el ancho de la terminal invalidan la salida"""
+        first = self.print_kanban(BebopContext(config, "test"))
+
+        context = BebopContext(config, "test")
+        context.add_group(PostGroup(title="Added"))
+        assert "Added" in self.print_kanban(context)
+        context.save_board()
+        assert "Added" in self.print_kanban(BebopContext(config, "test"))
+
+        narrow = self.print_kanban(BebopContext(config, "test"), width=60)
+        assert narrow != first
+        assert max(len(x) for x in narrow.splitlines()) == 60
+
+    @staticmethod
+    def print_kanban(context: BebopContext, width: int = 100) -> str:
+        context.console = Console(file=StringIO(), width=width, theme=context.theme)
+        context.print_kanban()
+        return context.console.file.getvalue()
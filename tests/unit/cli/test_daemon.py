@@ -0,0 +1,73 @@
+import asyncio
+import threading
+
+import pytest
+
+from bebop.cli import client
+from bebop.cli.context import BebopContext
+from bebop.cli.daemon import Daemon, is_running
+
+
+@pytest.fixture
+def daemon(config, tmp_path, monkeypatch):
+    """Ejecutar un daemon en segundo plano mientras dure la prueba"""
+    monkeypatch.delenv(client.DISABLE_ENVVAR, raising=False)
+    monkeypatch.setenv("BEBOP_BOARD", "test")
+    config.daemon_save_delay = 60
+    path = str(tmp_path / "bebop.sock")
+    server = Daemon(config, path)
+    loop = asyncio.new_event_loop()
+    stop = asyncio.Event()
+    ready = threading.Event()
+
+    async def serve():
+        loop.call_soon(ready.set)
+        await server.serve(stop)
+
+    thread = threading.Thread(target=loop.run_until_complete, args=(serve(),))
+    thread.start()
+    ready.wait()
+    while not is_running(path):
+        pass
+
+    yield server
+    loop.call_soon_threadsafe(stop.set)
+    thread.join()
+    loop.close()
+
+
+class TestDaemon:
+
+    def test_forward_commands(self, config, daemon, capsys):
+        """Comprobar que los comandos se ejecutan en el daemon y los cambios se guardan al detenerlo"""
+        assert client.forward(["push", "first", "second", "-o", "A"], daemon.path) == 0
+        assert client.forward(["show", "A2"], daemon.path) == 0
+        assert "second" in capsys.readouterr().out
+
+        assert client.forward(["rm", "A9", "-y"], daemon.path) == 1
+        assert "The Token 'A9' does not exists" in capsys.readouterr().out
+        assert not len(BebopContext(config, "test").board.posts[0].posts)
+
+        daemon.pool.flush("test")
+        assert [x.title for x in BebopContext(config, "test").board.posts[0].posts] == ["first", "second"]
+
+    def test_fallback(self, daemon, tmp_path):
+        """Comprobar que los comandos que piden datos al usuario se ejecutan en el proceso"""
+        assert client.forward(["edit"], daemon.path) is None
+        assert client.forward(["--dry-run", "push", "x"], daemon.path) is None
+        assert client.forward([], str(tmp_path / "missing.sock")) is None
+        assert not client.is_forwardable(["batch"])
+        assert not client.is_forwardable(["push", "x", "--help"])
+
+    def test_reload_on_external_change(self, config, daemon):
+        """Comprobar que el daemon vuelve a cargar el tablero si otro proceso lo guardó"""
+        assert client.forward(["show"], daemon.path) == 0
+        context = BebopContext(config, "test")
+        context.board.posts[0].title = "Changed"
+        context.save_board()
+
+        assert client.forward(["push", "x", "-o", "A"], daemon.path) == 0
+        daemon.pool.flush("test")
+        board = BebopContext(config, "test").board
+        assert board.posts[0].title == "Changed"
+        assert board.posts[0].posts[0].title == "x"
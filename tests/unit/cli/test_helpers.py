@@ -0,0 +1,91 @@
+import curses
+
+from bebop.cli.helpers import ChecklistState, ChecklistView, handle_key
+from bebop.models import Todo
+
+
+class FakeWindow:
+    """Ventana de curses que guarda el texto de cada fila y las filas escritas"""
+
+    def __init__(self, rows: int, columns: int):
+        self.size = (rows, columns)
+        self.lines = {}
+        self.written = []
+
+    def getmaxyx(self):
+        return self.size
+
+    def erase(self):
+        self.lines.clear()
+
+    def move(self, y, x):
+        pass
+
+    def clrtoeol(self):
+        pass
+
+    def addnstr(self, y, x, text, n, attr=0):
+        self.lines[y] = text[:n]
+        self.written.append(y)
+
+    def refresh(self):
+        pass
+
+
+def get_todos(count: int):
+    return [Todo(text=f"task {x}") for x in range(count)]
+
+
+class TestChecklist:
+
+    def test_viewport(self):
+        """Comprobar que sólo se dibujan las filas visibles y al mover el cursor sólo las que cambian"""
+        window = FakeWindow(15, 40)
+        state = ChecklistState(get_todos(1000), ChecklistView.get_height(15))
+        view = ChecklistView(window, state, "Post")
+        view.draw()
+        assert state.height == 10 and sum(1 for x in window.lines.values() if "task" in x) == 10
+
+        window.written.clear()
+        handle_key(state, curses.KEY_DOWN)
+        view.draw()
+        assert sorted(window.written) == [3, 4, 13]
+        assert window.lines[4].startswith(" > ")
+
+        handle_key(state, curses.KEY_NPAGE)
+        handle_key(state, curses.KEY_NPAGE)
+        assert (state.cursor, state.top, state.redraw) == (21, 12, True)
+        handle_key(state, curses.KEY_END)
+        view.draw()
+        assert state.top == 990 and "task 999" in window.lines[12] and "1000/1000" in window.lines[13]
+
+    def test_filter(self):
+        """Comprobar que el filtro se aplica letra a letra y al borrar se recupera el resultado anterior"""
+        state = ChecklistState(get_todos(200), 10)
+        for key in "/12":
+            handle_key(state, key)
+        assert [x.text for x in state.visible][:3] == ["task 12", "task 112", "task 120"]
+        assert len(state.visible) == 12
+
+        handle_key(state, "\x7f")
+        assert len(state.visible) == 119 and state.editing
+        handle_key(state, "\n")
+        handle_key(state, "j")
+        assert not state.editing and state.current.text == "task 10"
+        handle_key(state, "\x1b")
+        assert len(state.visible) == 200
+
+    def test_multi_select(self):
+        """Comprobar que se cambian y eliminan a la vez las tareas marcadas"""
+        todos = get_todos(5)
+        state = ChecklistState(todos, 10)
+        for key in ["m", "j", "m", " "]:
+            handle_key(state, key)
+        assert [x.checked for x in todos] == [True, False, True, False, False]
+        assert state.dirty >= {0, 2}
+
+        handle_key(state, "d")
+        assert [x.text for x in todos] == ["task 1", "task 3", "task 4"] and not len(state.marked)
+        for key in ["d", "d", "d"]:
+            running = handle_key(state, key)
+        assert not running and todos == []
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+from typer.testing import CliRunner
+
+from bebop.cli.config import StorageKind
+from bebop.cli.context import BebopContext
+from bebop.cli.main import app
+from bebop.models import PostGroup, Post
+from bebop.token import Token
+
+
+def fill_board(context: BebopContext, groups: int = 4, posts: int = 8) -> None:
+    for i in range(groups):
+        context.add_group(PostGroup(title=f"G{i}", posts=[Post(title=f"P{i}-{j}") for j in range(posts)]))
+    context.save_board()
+
+
+def titles(context: BebopContext):
+    return [(x.title, [y.title for y in x.posts]) for x in context.board.posts]
+
+
+class TestRangeOperations:
+
+    @pytest.mark.parametrize("storage", [StorageKind.JOURNAL, StorageKind.SQLITE])
+    def test_bulk_moves_replay(self, config, storage):
+        """Comprobar que las operaciones registradas por los movimientos en bloque generan el mismo tablero"""
+        config.storage = storage
+        context = BebopContext(config, "test")
+        fill_board(context)
+        shuffle = random.Random(7)
+
+        for _ in range(20):
+            paths = [[idx, x] for idx, group in enumerate(context.board.posts) for x in range(len(group.posts))]
+            target_group = shuffle.choice(context.board.posts)
+            target_post = shuffle.choice([None, *target_group.posts])
+            context.move_elements(shuffle.sample(paths, 4), (target_group, target_post))
+            groups = [[x] for x in shuffle.sample(range(7), 3)]
+            context.move_elements(groups, (shuffle.choice(context.board.posts), None))
+        context.save_board()
+
+        assert sum(len(x.posts) for x in context.board.posts) == 32
+        assert titles(BebopContext(config, "test")) == titles(context)
+
+    def test_move_range_keeps_order(self, config):
+        context = BebopContext(config, "test")
+        fill_board(context, 2, 5)
+        context.move_elements(list(context.iter_paths(Token.parse("D2:D4"))), (context.board.posts[3], None))
+        assert titles(context)[3][1] == ["P0-0", "P0-4", "P0-1", "P0-2", "P0-3"]
+
+        target = context.board.posts[3].posts[1]
+        context.move_elements([[3, 0], [3, 3], [3, 4]], (context.board.posts[3], target))
+        assert titles(context)[3][1] == ["P0-0", "P0-2", "P0-3", "P0-4", "P0-1"]
+
+    def test_remove_by_position(self, config):
+        """Comprobar que se eliminan los elementos de las posiciones indicadas aunque haya otros iguales"""
+        context = BebopContext(config, "test")
+        group = PostGroup(title="same", posts=[Post(title="x", created_at="2024-01-01") for _ in range(6)])
+        context.add_group(group)
+        group.posts[4].title = "kept"
+        context.remove_elements(list(context.iter_paths(Token.parse("D2:4"))) + [[1], [3, 5]])
+        context.save_board()
+
+        expected = [("To Do", []), ("Done", []), ("same", ["x", "kept"])]
+        assert titles(context) == expected
+        assert titles(BebopContext(config, "test")) == expected
+
+    @pytest.mark.parametrize(
+        "token,expected",
+        [("D3:D5", [[3, 2], [3, 3], [3, 4]]), ("D7:", [[3, 6], [3, 7]]), ("B:C", [[1], [2]]), ("D8:20", [[3, 7]])],
+    )
+    def test_iter_paths(self, config, token, expected):
+        context = BebopContext(config, "test")
+        fill_board(context, 1)
+        assert list(context.iter_paths(Token.parse(token))) == expected
+
+    def test_cli_range_commands(self, config, mocker):
+        mocker.patch("bebop.cli.config.BebopConfig.load_config", return_value=config)
+        runner = CliRunner()
+        context = BebopContext(config, "test")
+        fill_board(context, 1, 10)
+
+        for args in (["rm", "D2:D9", "-y"], ["todo", "check", "D:"], ["mv", "D:", "A"], ["archive", "A1"]):
+            result = runner.invoke(app, ["--board", "test", *args])
+            assert result.exit_code == 0, result.output
+
+        context = BebopContext(config, "test")
+        assert [x.title for x in context.board.posts[0].posts] == ["P0-9"]
+        assert context.board.posts[0].posts[0].todos[0].text == "check"
+        assert [x.title for _, x in context.archive] == ["P0-0"]
@@ -0,0 +1,89 @@
+from io import StringIO
+
+from rich.console import Console
+from typer.testing import CliRunner
+from rich.theme import Theme
+
+from bebop.cli.config import BebopConfig
+from bebop.cli.context import BebopContext
+from bebop.cli.main import app
+from bebop.cli.render import Kanban, KanbanView, SearchResults
+from bebop.models import Board, PostGroup, Post
+from bebop.storage import load_board
+from bebop.storage.search import SNIPPET_END, SNIPPET_START, SearchResult
+
+
+class TestKanban:
+
+    def test_window_renders_requested_slice(self):
+        """Comprobar que sólo se renderizan los posts de la ventana y el resumen incluye todos los grupos"""
+        board = self.get_board(3, 50)
+        board.posts[1].posts[0].archived = True
+        output = self.render(Kanban(board, BebopConfig(), KanbanView(rows=5, columns=slice(1, 3), page=2)))
+
+        assert "B7 " in output and "B11 " in output
+        assert "B6 " not in output and "B12 " not in output
+        assert "A7 " not in output and "C10 " in output
+        assert "A PostGroup0 50" in output and "B PostGroup1 49" in output
+        assert "Page 2/10" in output
+
+    def test_window_loads_only_visible_posts(self):
+        """Comprobar que en un tablero cargado de forma diferida sólo se validan los elementos visibles"""
+        board = load_board(self.get_board(3, 50).model_dump_json(by_alias=True))
+        self.render(Kanban(board, BebopConfig(), KanbanView(rows=5, columns=slice(1, 2))))
+
+        assert not board.posts.is_loaded(0)
+        group = board.posts[1]
+        assert all(group.posts.is_loaded(idx) for idx in range(5))
+        assert not any(group.posts.is_loaded(idx) for idx in range(5, 50))
+
+    def test_pages_count_only_visible_columns(self, config, mocker):
+        """Comprobar que el total de páginas sólo depende de los grupos de las columnas indicadas"""
+        mocker.patch("bebop.cli.config.BebopConfig.load_config", return_value=config)
+        context = BebopContext(config, "test")
+        todo, doing, _ = context.board.posts
+        for idx in range(8):
+            context.add_post(todo, Post(title=f"todo {idx}"))
+        for idx in range(3):
+            context.add_post(doing, Post(title=f"doing {idx}"))
+        context.save_board()
+
+        result = CliRunner().invoke(app, ["--board", "test", "--cols", "B:C", "--rows", "2"], terminal_width=200)
+        assert result.exit_code == 0, result.output
+        assert "Page 1/2" in result.output
+        assert "A To Do 8" in result.output and "B In Progress 3" in result.output
+
+    @staticmethod
+    def render(kanban: Kanban) -> str:
+        theme = Theme(kanban.config.theme.model_dump(mode="json", by_alias=True))
+        console = Console(file=StringIO(), width=200, theme=theme)
+        console.print(kanban)
+        return console.file.getvalue()
+
+    @staticmethod
+    def get_board(groups=1, posts=1) -> Board:
+        board_posts = []
+        for i in range(groups):
+            group_posts = [Post(title=f"Post{i}-{j}") for j in range(posts)]
+            board_posts.append(PostGroup(title=f"PostGroup{i}", posts=group_posts))
+        return Board(title="Test", posts=board_posts)
+
+
+class TestSearchResults:
+
+    def test_snippet_fits_narrow_terminal(self):
+        """Comprobar que con 80 columnas y un título largo el fragmento se muestra completo"""
+        result = SearchResult(
+            path=[0, 3],
+            title="A very long post title that would take the whole width of the terminal " * 2,
+            snippet=f"deploy the {SNIPPET_START}rollback{SNIPPET_END} script",
+            score=1.0,
+        )
+        config = BebopConfig()
+        console = Console(file=StringIO(), width=80, theme=Theme(config.theme.model_dump(mode="json", by_alias=True)))
+        console.print(SearchResults([result], config))
+        output = console.file.getvalue()
+
+        assert "deploy the rollback script" in output
+        assert "A very long post" in output and "…" in output
+        assert all(len(x) <= 80 for x in output.splitlines())
@@ -0,0 +1,55 @@
+import os
+import re
+import subprocess
+import sys
+from typing import Tuple
+
+import pytest
+
+# Lo que cuesta importar el CLI después de typer, en proporción a lo que cuesta importar typer
+IMPORT_BUDGET_RATIO = float(os.environ.get("BEBOP_IMPORT_BUDGET_RATIO", "1.5"))
+DEFERRED_MODULES = [
+    "curses",
+    "rich.prompt",
+    "sqlite3",
+    "csv",
+    "gzip",
+    "mmap",
+    "concurrent.futures",
+    "bebop.cli.helpers",
+    "bebop.storage.sqlite",
+    "bebop.storage.records",
+]
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, check=True)
+
+
+class TestStartup:
+
+    @pytest.mark.parametrize("module", DEFERRED_MODULES)
+    def test_heavy_modules_are_deferred(self, module: str):
+        """Comprobar que los módulos que sólo usan algunos comandos no se importan al iniciar, aparte de typer"""
+        code = (
+            "import sys, typer; before = set(sys.modules); import bebop.cli.main; "
+            f"print({module!r} in set(sys.modules) - before)"
+        )
+        assert run_python("-c", code).stdout.strip() == "False"
+
+    def test_import_time_budget(self):
+        """Comprobar que importar el CLI después de typer no supera el presupuesto relativo a importar typer"""
+        typer_time, main_time = min((self.import_times() for _ in range(3)), key=lambda x: x[1] / x[0])
+        assert (
+            main_time < typer_time * IMPORT_BUDGET_RATIO
+        ), f"bebop.cli.main took {main_time:.3f}s to import after typer, which took {typer_time:.3f}s"
+
+    @staticmethod
+    def import_times() -> Tuple[float, float]:
+        """Obtener lo que tarda importar typer y lo que tarda después importar el CLI"""
+        result = run_python("-X", "importtime", "-c", "import typer; import bebop.cli.main")
+        typer_time, main_time = (
+            int(re.search(rf"\|\s*(\d+) \| {re.escape(x)}$", result.stderr, re.MULTILINE).group(1)) / 1_000_000
+            for x in ("typer", "bebop.cli.main")
+        )
+        return typer_time, main_time
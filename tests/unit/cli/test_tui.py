@@ -0,0 +1,97 @@
+import curses
+
+import pytest
+
+from bebop.cli.context import BebopContext
+from bebop.cli.tui import BoardState, BoardView, handle_key
+from bebop.models import Post
+from .test_helpers import FakeWindow
+
+
+@pytest.fixture()
+def context(config):
+    context = BebopContext(config, "test")
+    todo, doing, _ = context.board.posts
+    for idx in range(500):
+        context.add_post(todo, Post(title=f"todo {idx}"))
+    context.add_post(doing, Post(title="doing 0"))
+    context.save_board()
+    yield context
+
+
+def get_view(context: BebopContext, save_delay: float = 60, columns: int = 96) -> BoardView:
+    view = BoardView(FakeWindow(23, columns), BoardState(context, 1, save_delay))
+    view.layout()
+    view.draw()
+    return view
+
+
+class TestBoardTui:
+
+    def test_navigation_redraws_cursor_cells(self, context):
+        """Comprobar que se dibujan sólo las filas visibles y al mover el cursor sólo las celdas que cambian"""
+        # Con una sola columna visible cada fila de la ventana es una celda
+        view = get_view(context, columns=30)
+        window, state = view.window, view.state
+        assert state.height == 20 and sum(1 for x in window.lines.values() if "todo" in x) == 20
+
+        window.written.clear()
+        handle_key(state, curses.KEY_DOWN)
+        view.draw()
+        assert sorted(window.written) == [2, 3, 22]
+
+        window.written.clear()
+        handle_key(state, curses.KEY_END)
+        view.draw()
+        assert state.tops[0] == 480 and "A500 todo 499" in window.lines[21]
+
+    def test_move_post(self, context):
+        """Comprobar que mover un post a otro grupo redibuja sólo las columnas de ambos grupos"""
+        view = get_view(context)
+        state = view.state
+        handle_key(state, curses.KEY_DOWN)
+        view.draw()
+
+        handle_key(state, "L")
+        assert state.dirty == {0, 1} and not state.redraw
+        view.draw()
+        todo, doing, _ = context.board.posts
+        assert [x.title for x in doing.posts] == ["doing 0", "todo 1"]
+        assert (state.col, state.row, state.post.title) == (1, 1, "todo 1")
+
+        handle_key(state, "K")
+        assert [x.title for x in doing.posts] == ["todo 1", "doing 0"]
+        assert state.row == 0
+
+    def test_move_identical_post(self, context):
+        """Comprobar que el cursor sigue al post movido aunque otro post del grupo destino sea igual"""
+        todo, doing, _ = context.board.posts
+        same = Post(title="same")
+        context.add_post(doing, same, index=0)
+        copy = same.model_copy()
+        context.add_post(todo, copy)
+        state = get_view(context).state
+        handle_key(state, curses.KEY_END)
+        assert state.post is copy
+
+        handle_key(state, "L")
+        assert [x.title for x in doing.posts] == ["same", "doing 0", "same"]
+        assert (state.col, state.row) == (1, 2) and state.post is copy
+
+    def test_edits_are_saved_once(self, context):
+        """Comprobar que varias ediciones seguidas se guardan juntas pasada la espera"""
+        view = get_view(context, save_delay=1)
+        state = view.state
+        revision = context.revision
+        for key in ["n", *"new post", "\n", "a", *"check", "\n", "e", "\x7f", "!", "\n"]:
+            handle_key(state, key)
+            view.draw()
+
+        post = context.board.posts[0].posts[-1]
+        assert (post.title, post.todos[0].text, state.row) == ("new pos!", "check", 500)
+        assert not state.is_save_due(state.changed_at + 0.5)
+        assert state.is_save_due(state.changed_at + 1)
+
+        state.save()
+        assert context.revision == revision + 1 and state.changed_at is None
+        assert BebopContext(context.config, "test").board.posts[0].posts[-1].title == "new pos!"
@@ -0,0 +1,62 @@
+import io
+import sys
+
+import pytest
+
+from bebop.cli.context import BebopContext
+from bebop.cli.watch import BoardWatch, FrameWriter, InotifyWatcher, PollingWatcher
+from bebop.models import Post
+
+
+class TestBoardWatch:
+
+    def test_frame_writer_draws_changed_lines(self):
+        """Comprobar que sólo se reescriben las líneas que cambian respecto al cuadro anterior"""
+        output = io.StringIO()
+        writer = FrameWriter(output)
+        assert writer.draw(["a", "b", "c"]) == 3
+
+        output.seek(0)
+        output.truncate()
+        assert writer.draw(["a", "B", "c"]) == 1
+        assert output.getvalue() == "\x1b[2;1HB\x1b[0m\x1b[K"
+        assert writer.draw(["a"]) == 1 and writer.draw(["a"]) == 0
+
+    def test_refresh_only_on_content_change(self, config):
+        """Comprobar que el tablero sólo se vuelve a cargar si el contenido guardado cambió"""
+        context = BebopContext(config, "test")
+        context.board
+        watch = BoardWatch(context, FrameWriter(io.StringIO()))
+        assert watch.refresh() and not watch.refresh()
+
+        # Reescribir el mismo contenido cambia la firma pero no el hash
+        context.storage.write(context.board)
+        assert not watch.refresh()
+
+        other = BebopContext(config, "test")
+        other.add_post(other.board.posts[0], Post(title="new"))
+        other.save_board()
+        assert watch.refresh()
+        assert context.board.posts[0].posts[-1].title == "new"
+
+    @pytest.mark.parametrize("kind", ["inotify", "polling"])
+    def test_watcher_ignores_other_files(self, config, kind):
+        """Comprobar que guardar el tablero se detecta y que los cambios de otros archivos se descartan"""
+        if kind == "inotify" and not sys.platform.startswith("linux"):
+            pytest.skip("inotify is only available on Linux")
+
+        context = BebopContext(config, "test")
+        context.board
+        paths = context.storage.content_paths()
+        watcher = InotifyWatcher(paths) if kind == "inotify" else PollingWatcher(paths, interval=0.01)
+        try:
+            BebopContext(config, "other").board
+            assert not watcher.wait(0.05)
+
+            context.add_post(context.board.posts[0], Post(title="new"))
+            context.save_board()
+            assert watcher.wait(1)
+            watcher.settle(0.05)
+            assert not watcher.wait(0.05)
+        finally:
+            watcher.close()
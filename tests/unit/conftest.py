@@ -0,0 +1,9 @@
+import pytest
+
+from bebop.cli.config import BebopConfig
+
+
+@pytest.fixture()
+def config(tmp_path, mocker):
+    mocker.patch("bebop.cli.config.BebopConfig.get_root_path", return_value=tmp_path)
+    yield BebopConfig()
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+import pytest
+
+from bebop.cli.context import BebopContext
+from bebop.models import PostGroup, Post, Todo, Comment
+
+
+@pytest.fixture()
+def mutate():
+    def inner(context: BebopContext) -> None:
+        todo, _, done = context.board.posts
+        for title in "abc":
+            context.add_post(todo, Post(title=title))
+        context.add_post(done, Post(title="x", todos=[Todo(text="t1")], tags=["foo"]))
+        context.add_todo(done, done.posts[0], Todo(text="t2"))
+        context.move_element((todo, todo.posts[0]), (todo, todo.posts[2]))
+        context.add_comment(todo, None, Comment(text="hi"))
+        context.update_element(todo, todo.posts[1], title="a", start_date=datetime(2024, 1, 1), tags=["x", "y"])
+        context.add_group(PostGroup(title="first", posts=[Post(title="p")]), 0)
+        context.move_element((context.board.posts[0], None), (done, None))
+        context.remove_element(context.board.posts[1])
+        context.move_element((done, done.posts[0]), (todo, None))
+
+    yield inner
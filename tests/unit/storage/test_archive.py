@@ -0,0 +1,121 @@
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from typer.testing import CliRunner
+
+from bebop.cli.context import BebopContext
+from bebop.cli.main import app
+from bebop.models import PostGroup, Post, Todo
+
+
+@pytest.fixture()
+def context(config):
+    context = BebopContext(config, "test")
+    todo, _, done = context.board.posts
+    context.add_post(todo, Post(title="first", tags=["api"]))
+    context.add_post(todo, Post(title="second", todos=[Todo(text="Write the ÑANDÚ docs")]))
+    context.add_post(done, Post(title="old", createdAt=datetime.now() - timedelta(days=40)))
+    context.add_post(done, Post(title="recent"))
+    context.add_group(PostGroup(title="Ideas", posts=[Post(title="idea")]))
+    context.save_board()
+    yield context
+
+
+def titles(context: BebopContext):
+    return [(x.title, [y.title for y in x.posts]) for x in context.board.posts]
+
+
+class TestArchive:
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_archive_and_restore(self, config, context, compress):
+        """Comprobar que los elementos archivados salen del tablero y vuelven a su grupo al restaurarlos"""
+        config.archive_compress = compress
+        context = BebopContext(config, "test")
+        context.archive_elements([[0, 0], [3], [3, 0]])
+        context.save_board()
+        context = BebopContext(config, "test")
+        context.archive_elements([[0, 0]])
+        context.save_board()
+
+        context = BebopContext(config, "test")
+        assert titles(context)[0] == ("To Do", [])
+        assert len(context.board.posts) == 3
+        assert [(x, entry.title, entry.group) for x, entry in context.archive] == [
+            (1, "first", "To Do"),
+            (2, "Ideas", None),
+            (3, "second", "To Do"),
+        ]
+
+        context.update_element(context.board.posts[0], title="Backlog")
+        context.restore_elements({1, 2})
+        context.save_board()
+
+        context = BebopContext(config, "test")
+        assert titles(context)[0] == ("Backlog", ["first"])
+        assert titles(context)[-1] == ("Ideas", ["idea"])
+        assert [entry.title for _, entry in context.archive] == ["second"]
+
+    def test_concurrent_restore(self, config, context):
+        """Comprobar que al guardar se eliminan las entradas restauradas aunque otro proceso cambie sus números"""
+        context.archive_elements([[0, 0], [0, 1], [2, 0]])
+        context.save_board()
+
+        first = BebopContext(config, "test")
+        first.restore_elements({2})
+        other = BebopContext(config, "test")
+        other.restore_elements({1})
+        other.save_board()
+        first.save_board()
+
+        context = BebopContext(config, "test")
+        assert [entry.title for _, entry in context.archive] == ["old"]
+        assert sorted(x.title for x in context.board.posts[0].posts) == ["first", "second"]
+
+    def test_entries_without_id(self, context):
+        """Comprobar que las entradas escritas sin id se pueden restaurar"""
+        context.archive_elements([[0, 0], [0, 1]])
+        context.save_board()
+        lines = context.archive.path.read_bytes().splitlines(keepends=True)
+        context.archive.path.write_bytes(b"".join(re.sub(rb'"id":"\w+",', b"", x) for x in lines))
+
+        context.restore_elements({1})
+        context.save_board()
+        assert [entry.title for _, entry in context.archive] == ["second"]
+
+    def test_search(self, context):
+        context.archive_elements([[0, 0], [0, 1], [3]])
+        context.save_board()
+
+        assert [x for x, _ in context.archive.search("ñandú")] == [2]
+        assert [x for x, _ in context.archive.search("API")] == [1]
+        assert [x for x, _ in context.archive.search("idea")] == [3]
+        assert not len(list(context.archive.search("createdAt")))
+
+    def test_auto_archive(self, config, context):
+        """Comprobar que al guardar se archivan los posts antiguos de los grupos configurados"""
+        config.auto_archive_days = 30
+        config.lazy_load = True
+        context = BebopContext(config, "test")
+        context.add_post(context.board.posts[0], Post(title="new"))
+        context.save_board()
+
+        assert titles(BebopContext(config, "test"))[2] == ("Done", ["recent"])
+        assert [entry.title for _, entry in context.archive] == ["old"]
+
+    def test_cli(self, config, context, mocker):
+        mocker.patch("bebop.cli.config.BebopConfig.load_config", return_value=config)
+        runner = CliRunner()
+
+        for args in (["archive", "A:", "D"], ["archive", "--restore", "2:3"]):
+            result = runner.invoke(app, ["--board", "test", *args])
+            assert result.exit_code == 0, result.output
+
+        result = runner.invoke(app, ["--board", "test", "archive", "--list"])
+        assert "first" in result.output and "Ideas" not in result.output
+
+        result = runner.invoke(app, ["--board", "test", "archive", "--restore", "7"])
+        assert "There is no archived element #7" in result.output
+        result = runner.invoke(app, ["--board", "test", "archive", "--restore", "x"])
+        assert "'x' is not an archive entry number" in result.output
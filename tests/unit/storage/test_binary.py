@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from bebop.cli.config import StorageKind
+from bebop.cli.context import BebopContext
+from bebop.models import Post, Todo
+from bebop.storage import dump_board, load_board
+from bebop.storage.binary import FormatError, GroupChunk, decode_board, encode_board
+
+
+@pytest.fixture()
+def config(config):
+    config.storage = StorageKind.BINARY
+    yield config
+
+
+class TestBinaryStorage:
+
+    def test_saved_board_matches_live_mutations(self, config, mutate):
+        """Comprobar que el tablero guardado en binario es igual al de memoria"""
+        context = BebopContext(config, "test")
+        mutate(context)
+        context.save_board()
+
+        reloaded = BebopContext(config, "test")
+        assert reloaded.board == context.board
+
+    def test_json_round_trip(self, config, mutate):
+        """Comprobar que un tablero JSON se convierte a binario y de vuelta sin pérdidas"""
+        context = BebopContext(config, "test")
+        mutate(context)
+        todos = [Todo(text=f"t{x}", checked=x % 3 == 0) for x in range(11)]
+        aware = datetime(2024, 5, 1, 12, 30, 15, 250, tzinfo=timezone(timedelta(hours=-3)))
+        context.add_post(context.board.posts[0], Post(title="ñandú", todos=todos, end_date=aware, author="me"))
+
+        json = dump_board(context.board)
+        board = decode_board(encode_board(load_board(json)))
+        assert dump_board(board) == json
+        assert decode_board(encode_board(board), lazy=True) == board
+
+    def test_lazy_load_keeps_untouched_groups(self, config, mutate):
+        """Comprobar que sólo se decodifican los grupos accedidos y el resto se copia sin cambios"""
+        context = BebopContext(config, "test")
+        mutate(context)
+        context.save_board()
+
+        config.lazy_load = True
+        reloaded = BebopContext(config, "test")
+        assert not reloaded.board.posts.is_loaded(1)
+        reloaded.update_element(reloaded.board.posts[0], name="renamed")
+        reloaded.save_board()
+        assert isinstance(reloaded.board.posts.data[1], GroupChunk)
+
+        config.lazy_load = False
+        board = BebopContext(config, "test").board
+        assert board.posts[0].name == "renamed"
+        assert board.posts[1:] == context.board.posts[1:]
+
+    def test_unused_strings_are_dropped(self, config):
+        """Comprobar que el archivo se reduce al eliminar los elementos con cadenas que sólo ellos usaban"""
+        config.lazy_load = True
+        context = BebopContext(config, "test")
+        context.board
+        size = context.board_path.stat().st_size
+        for idx in range(200):
+            context.add_post(context.board.posts[0], Post(title="p", tags=[f"tag-{idx}"], author=f"author-{idx}"))
+        context.save_board()
+        assert context.board_path.stat().st_size > size + 5000
+
+        reloaded = BebopContext(config, "test")
+        reloaded.remove_elements([[0, x] for x in range(200)])
+        reloaded.save_board()
+        assert reloaded.board_path.stat().st_size < size + 200
+        assert isinstance(reloaded.board.posts.data[1], GroupChunk)
+        assert reloaded.board.posts.data[1].strings is reloaded.storage.strings
+
+        reloaded.update_element(reloaded.board.posts[0], name="todo")
+        reloaded.save_board()
+        board = BebopContext(config, "test").board
+        assert board.posts[0].name == "todo" and [x.title for x in board.posts] == ["To Do", "In Progress", "Done"]
+
+    def test_invalid_file(self):
+        with pytest.raises(FormatError):
+            decode_board(b'{"title": "Bebop"}')
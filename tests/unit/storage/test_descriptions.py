@@ -0,0 +1,74 @@
+import pytest
+
+from bebop.cli.config import StorageKind
+from bebop.cli.context import BebopContext
+from bebop.cli.render import ElementInfo
+from bebop.models import Post, PostGroup
+from bebop.storage.descriptions import iter_description_files
+from bebop.token import IndexToken
+
+
+class TestDescriptionStore:
+
+    @pytest.mark.parametrize("storage", list(StorageKind))
+    def test_long_descriptions_are_spilled(self, config, storage):
+        """Comprobar que las descripciones largas se guardan fuera del tablero y se muestran al renderizar"""
+        config.storage = storage
+        config.description_max_bytes = 100
+        text = "# Postmortem\n\n" + "timeline " * 50
+        context = BebopContext(config, "test")
+        context.add_post(context.board.posts[0], Post(title="short", description="inline"))
+        context.add_post(context.board.posts[0], Post(title="long", description=text))
+        context.save_board()
+
+        board = BebopContext(config, "test").board
+        short, long = board.posts[0].posts
+        assert (short.description, short.description_file) == ("inline", None)
+        assert long.description is None
+        assert (config.get_root_path() / long.description_file).read_text() == text
+        path = BebopContext(config, "test").storage.path
+        files = path.rglob("*") if path.is_dir() else [path]
+        assert all(text not in x.read_text(errors="replace") for x in files if x.is_file())
+
+        console = context.console
+        with console.capture() as capture:
+            console.print(ElementInfo(long, IndexToken.from_index(0, 1), config))
+        assert "Postmortem" in capture.get()
+
+    def test_orphan_files_are_collected(self, config):
+        """Comprobar que se eliminan los archivos que ya no usa ningún elemento"""
+        config.description_max_bytes = 10
+        context = BebopContext(config, "test")
+        todo, progress, _ = context.board.posts
+        context.add_post(todo, Post(title="a", description="first long text"))
+        context.add_group(PostGroup(title="g", description="group long text", posts=[Post(title="p")]))
+        context.save_board()
+        directory = context.descriptions.directory
+        assert len(list(directory.iterdir())) == 2
+
+        context.update_element(todo, todo.posts[0], description="second long text")
+        context.remove_element(context.board.posts[3])
+        context.save_board()
+        # Los archivos recientes se conservan por si otro proceso aún no ha guardado sus cambios
+        assert len(list(directory.iterdir())) == 3
+
+        assert context.descriptions.collect(set(iter_description_files(context.board)), grace=0) == 2
+        assert [x.read_text() for x in directory.iterdir()] == ["second long text"]
+        context.update_element(todo, todo.posts[0], description="short")
+        assert todo.posts[0].description_file is None
+
+    def test_archive_keeps_description(self, config):
+        """Comprobar que los elementos archivados guardan su descripción y la recuperan al restaurarlos"""
+        config.description_max_bytes = 10
+        context = BebopContext(config, "test")
+        context.add_post(context.board.posts[0], Post(title="a", description="archived long text"))
+        context.archive_elements([[0, 0]])
+        context.save_board()
+        context.descriptions.collect(set(), grace=0)
+
+        (_, entry), *_ = context.archive
+        assert entry.data["description"] == "archived long text"
+        context.restore_elements({1})
+        post = context.board.posts[0].posts[0]
+        assert context.read_description(post) == "archived long text"
+        assert post.description is None
@@ -0,0 +1,85 @@
+from datetime import datetime
+
+import pytest
+
+from bebop.cli.config import StorageKind
+from bebop.cli.context import BebopContext
+from bebop.models import Board
+from bebop.storage.journal import Journal
+from bebop.storage.operations import RemoveOperation
+
+
+@pytest.fixture()
+def config(config):
+    config.storage = StorageKind.JOURNAL
+    config.journal_max_operations = 100
+    yield config
+
+
+class TestJournal:
+
+    def test_replay_matches_live_mutations(self, config, mutate):
+        """Comprobar que reproducir el registro genera el mismo tablero"""
+        context = BebopContext(config, "test")
+        mutate(context)
+        context.save_board()
+        assert context.storage.journal.path.is_file()
+
+        replayed = BebopContext(config, "test")
+        assert replayed.board == context.board
+
+    def test_replay_on_lazy_board(self, config, mutate):
+        """Comprobar que el registro se reproduce sobre un tablero con carga perezosa"""
+        context = BebopContext(config, "test")
+        mutate(context)
+        context.save_board()
+
+        config.lazy_load = True
+        replayed = BebopContext(config, "test")
+        assert [x.title for x in replayed.board.posts[0].posts] == ["b", "a", "c", "x"]
+        assert replayed.board.posts[0].posts[1].start_date == datetime(2024, 1, 1)
+        assert [x.title for x in replayed.board.posts] == ["To Do", "first", "Done"]
+        assert replayed.board.posts[0].posts[-1].todos[-1].text == "t2"
+
+    def test_compaction_rewrites_snapshot(self, config, mutate):
+        """Comprobar que al superar el límite se compacta el registro"""
+        config.journal_max_operations = 3
+        context = BebopContext(config, "test")
+        mutate(context)
+        context.save_board()
+        assert not context.storage.journal.path.is_file()
+
+        reloaded = BebopContext(config, "test")
+        assert reloaded.board == context.board
+
+    def test_stale_journal_is_ignored(self, config):
+        """Comprobar que un registro de otra instantánea se descarta"""
+        context = BebopContext(config, "test")
+        context.remove_element(context.board.posts[0])
+        context.save_board()
+
+        context.board_path.write_text(Board(title="Other").model_dump_json(by_alias=True))
+        assert Journal(context.board_path).read() == []
+
+    def test_truncated_line_is_ignored(self, config):
+        """Comprobar que una escritura interrumpida no invalida el registro"""
+        context = BebopContext(config, "test")
+        context.remove_element(context.board.posts[0])
+        context.save_board()
+        with context.storage.journal.path.open("a") as f:
+            f.write('{"op":"remove","pa')
+
+        assert Journal(context.board_path).read() == [RemoveOperation(path=[0])]
+
+    def test_append_after_truncated_line(self, config):
+        """Comprobar que las operaciones agregadas después de una escritura interrumpida se pueden leer"""
+        context = BebopContext(config, "test")
+        context.remove_element(context.board.posts[0])
+        context.save_board()
+        with context.storage.journal.path.open("a") as f:
+            f.write('{"op":"remove","pa')
+
+        context.remove_element(context.board.posts[0])
+        context.save_board()
+        assert Journal(context.board_path).read() == [RemoveOperation(path=[0]), RemoveOperation(path=[0])]
+        assert [x.title for x in BebopContext(config, "test").board.posts] == ["Done"]
@@ -0,0 +1,58 @@
+import json
+
+from bebop.models import Board, PostGroup, Post, Todo
+from bebop.storage import LazyList, load_board, dump_board
+
+
+class TestLazyBoard:
+
+    def test_posts_are_not_validated_until_accessed(self):
+        """Comprobar que los elementos se validan sólo al ser accedidos"""
+        board = load_board(self.get_board(3, 4).model_dump_json(by_alias=True))
+        assert isinstance(board.posts, LazyList)
+        assert not any(board.posts.is_loaded(idx) for idx in range(3))
+
+        group = board.posts[1]
+        assert isinstance(group, PostGroup)
+        assert board.posts.is_loaded(1)
+        assert not board.posts.is_loaded(0)
+        assert not any(group.posts.is_loaded(idx) for idx in range(4))
+
+        post = group.posts[2]
+        assert post.title == "Post1-2"
+        assert group.posts.is_loaded(2)
+        assert not group.posts.is_loaded(3)
+
+    def test_dump_keeps_unvisited_subtrees(self):
+        """Comprobar que los subárboles no visitados se escriben sin cambios"""
+        source = self.get_board(2, 3)
+        board = load_board(source.model_dump_json(by_alias=True))
+        board.posts[0].posts[1].todos.append(Todo(text="new"))
+
+        data = json.loads(dump_board(board))
+        expected = json.loads(source.model_dump_json(by_alias=True))
+        assert data["posts"][1] == expected["posts"][1]
+        assert data["posts"][0]["posts"][0] == expected["posts"][0]["posts"][0]
+        assert data["posts"][0]["posts"][1]["todos"][0]["text"] == "new"
+
+    def test_round_trip_matches_eager_dump(self):
+        """Comprobar que un tablero sin cambios se serializa igual que con carga completa"""
+        source = self.get_board(2, 2)
+        board = load_board(source.model_dump_json(by_alias=True))
+        board.posts[1].posts[0]
+        assert dump_board(board) == dump_board(source)
+
+    def test_slice_keeps_loader(self):
+        """Comprobar que un corte de la lista mantiene la carga perezosa"""
+        board = load_board(self.get_board(3, 1).model_dump_json(by_alias=True))
+        sliced = board.posts[1:]
+        assert isinstance(sliced, LazyList)
+        assert [x.title for x in sliced] == ["PostGroup1", "PostGroup2"]
+
+    @staticmethod
+    def get_board(groups=1, posts=1) -> Board:
+        board_posts = []
+        for i in range(groups):
+            group_posts = [Post(title=f"Post{i}-{j}", tags=["tag"]) for j in range(posts)]
+            board_posts.append(PostGroup(title=f"PostGroup{i}", posts=group_posts))
+        return Board(title="Test", posts=board_posts, name="test")
@@ -0,0 +1,108 @@
+import multiprocessing
+import random
+import time
+
+import pytest
+import typer
+
+from bebop.cli.config import StorageKind
+from bebop.cli.context import BebopContext
+from bebop.models import Post, PostGroup
+
+WORKERS = 8
+SAVES = 10
+GROUP_EVERY = 3
+
+
+def push_posts(config, worker: int) -> None:
+    """Agregar posts y grupos guardando cada vez, con pausas entre la carga y el guardado para provocar conflictos"""
+    shuffle = random.Random(worker)
+    for idx in range(SAVES):
+        context = BebopContext(config, "test")
+        group = context.board.posts[worker % 3]
+        time.sleep(shuffle.random() * 0.01)
+        if idx % GROUP_EVERY == 0:
+            context.add_group(PostGroup(title=f"group {worker}-{idx}", posts=[Post(title=f"{worker}-{idx}")]))
+        else:
+            context.add_post(group, Post(title=f"{worker}-{idx}"))
+        context.save_board()
+        # Los grupos agregados al repetir las operaciones tienen que poder leerse después de guardar
+        for group in context.board.posts:
+            group.posts
+
+
+class TestBoardLock:
+
+    def test_conflict_replays_operations(self, config):
+        """Comprobar que los cambios se aplican sobre el tablero guardado por otro contexto"""
+        first = BebopContext(config, "test")
+        second = BebopContext(config, "test")
+        first.add_post(first.board.posts[0], Post(title="first"))
+        second.add_post(second.board.posts[0], Post(title="second"))
+        second.update_element(second.board.posts[1], title="Doing")
+        second.save_board()
+        first.save_board()
+
+        assert (first.retries, second.retries) == (1, 0)
+        assert first.revision == 2
+        board = BebopContext(config, "test").board
+        assert sorted(x.title for x in board.posts[0].posts) == ["first", "second"]
+        assert board.posts[1].title == "Doing"
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    @pytest.mark.parametrize("storage", list(StorageKind))
+    def test_conflict_on_moved_element(self, config, mocker, storage, lazy):
+        """Comprobar que no se cambia otro elemento si el elemento de la operación cambió de posición"""
+        mocker.patch("rich.console.Console.print")
+        config.storage = storage
+        config.lazy_load = lazy
+        setup = BebopContext(config, "test")
+        for title in ["keep-1", "delete-me", "keep-2"]:
+            setup.add_post(setup.board.posts[0], Post(title=title))
+        setup.save_board()
+
+        first = BebopContext(config, "test")
+        second = BebopContext(config, "test")
+        # Sin cargar los posts las claves se obtienen de los datos de cada almacenamiento
+        first.remove_elements([[0, 1]])
+        second.add_post(second.board.posts[0], Post(title="new"), index=0)
+        second.save_board()
+
+        with pytest.raises(typer.Abort):
+            first.save_board()
+        board = BebopContext(config, "test").board
+        assert [x.title for x in board.posts[0].posts] == ["new", "keep-1", "delete-me", "keep-2"]
+
+    def test_conflict_that_cannot_be_applied(self, config, mocker):
+        """Comprobar que el comando falla si las operaciones ya no corresponden al tablero guardado"""
+        mocker.patch("rich.console.Console.print")
+        first = BebopContext(config, "test")
+        second = BebopContext(config, "test")
+        first.remove_element(first.board.posts[2])
+        second.remove_element(second.board.posts[2])
+        second.remove_element(second.board.posts[1])
+        second.save_board()
+
+        with pytest.raises(Exception, match="changed by another process"):
+            first.save_board()
+        assert len(BebopContext(config, "test").board.posts) == 1
+
+    @pytest.mark.parametrize("storage", list(StorageKind))
+    def test_concurrent_processes(self, config, storage):
+        """Comprobar que no se pierde ningún cambio con varios procesos guardando a la vez"""
+        config.storage = storage
+        BebopContext(config, "test").board
+
+        fork = multiprocessing.get_context("fork")
+        workers = [fork.Process(target=push_posts, args=(config, x)) for x in range(WORKERS)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        assert all(x.exitcode == 0 for x in workers)
+
+        context = BebopContext(config, "test")
+        titles = [x.title for group in context.board.posts for x in group.posts]
+        assert sorted(titles) == sorted(f"{x}-{y}" for x in range(WORKERS) for y in range(SAVES))
+        assert len(context.board.posts) == 3 + WORKERS * len(range(0, SAVES, GROUP_EVERY))
+        assert context.revision == WORKERS * SAVES
@@ -0,0 +1,67 @@
+import pytest
+
+from bebop.cli.context import BebopContext
+from bebop.models import Post
+from bebop.storage.names import NameIndex
+from bebop.token import Token, IndexToken, RefToken
+
+
+class TestNameIndex:
+
+    def test_index_follows_operations(self, config, mutate):
+        """Comprobar que el índice actualizado con las operaciones coincide con uno nuevo"""
+        context = BebopContext(config, "test")
+        context.names
+        todo, progress, _ = context.board.posts
+        context.add_post(progress, Post(title="named", name="Named"))
+        context.add_post(todo, Post(title="other", name="other"))
+        mutate(context)
+        context.update_element(context.board.posts[0], context.board.posts[0].posts[1], name="renamed")
+
+        assert context.names.entries == NameIndex.build(context.board).entries
+        assert context.names.get("RENAMED") == [0, 1]
+
+    def test_first_element_wins(self, config):
+        """Comprobar que con nombres repetidos se devuelve el primero del tablero"""
+        context = BebopContext(config, "test")
+        done = context.board.posts[2]
+        context.add_post(done, Post(title="dup", name="todo"))
+        assert context.get_tree_by_ref(RefToken("@todo")) == (context.board.posts[0], None)
+
+        context.remove_element(context.board.posts[0])
+        assert context.get_tree_by_ref(RefToken("@todo")) == (done, done.posts[0])
+
+    def test_sidecar_avoids_rebuild(self, config, mocker):
+        """Comprobar que el índice guardado se reutiliza mientras el tablero no cambie"""
+        context = BebopContext(config, "test")
+        context.add_post(context.board.posts[1], Post(title="named", name="named"))
+        context.names
+        context.save_board()
+
+        build = mocker.spy(NameIndex, "build")
+        reloaded = BebopContext(config, "test")
+        group, post = reloaded.get_tree_by_ref(RefToken("@named"))
+        assert post.title == "named"
+        build.assert_not_called()
+
+    def test_stale_sidecar_is_rebuilt(self, config):
+        """Comprobar que el índice se descarta si el tablero cambió por otra vía"""
+        context = BebopContext(config, "test")
+        context.names
+        context.save_board()
+        other = BebopContext(config, "test")
+        other.update_element(other.board.posts[0], name="changed")
+        other.save_board()
+
+        assert NameIndex.read(context.names_path, context.signature) is None
+        assert BebopContext(config, "test").names.get("changed") == [0]
+
+    @pytest.mark.parametrize("value,expected", [("@todo", "A"), ("@q", "B2"), ("b2", "B2")])
+    def test_resolve_token(self, config, value, expected):
+        """Comprobar que los tokens de nombre e índice se resuelven al IndexToken del elemento"""
+        context = BebopContext(config, "test")
+        context.add_post(context.board.posts[1], Post(title="p"))
+        context.add_post(context.board.posts[1], Post(title="q", name="q"))
+        token = context.resolve_token(Token.parse(value))
+        assert isinstance(token, IndexToken)
+        assert token == expected
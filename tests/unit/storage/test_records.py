@@ -0,0 +1,109 @@
+import io
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from bebop.cli.config import StorageKind
+from bebop.cli.context import BebopContext
+from bebop.cli.main import app
+from bebop.models import Post, PostGroup, Todo
+from bebop.storage.records import READERS, WRITERS, RecordError, RecordFormat, iter_batches, iter_records
+
+
+@pytest.fixture()
+def context(config):
+    context = BebopContext(config, "test")
+    todos = [Todo(text="first", checked=True), Todo(text="second")]
+    context.add_post(context.board.posts[0], Post(title='say "hi", bye', tags=["a", "b"], todos=todos))
+    context.add_post(context.board.posts[2], Post(title="done", description="two\nlines"))
+    context.save_board()
+    yield context
+
+
+class TestRecords:
+
+    @pytest.mark.parametrize("record_format", [RecordFormat.NDJSON, RecordFormat.CSV])
+    def test_round_trip(self, context, record_format):
+        """Comprobar que los elementos exportados se vuelven a leer con sus grupos, etiquetas y tareas"""
+        output = io.StringIO()
+        WRITERS[record_format](iter_records(context.board), output)
+        output.seek(0)
+
+        elements = [x for batch in iter_batches(READERS[record_format](output), size=2) for x in batch]
+        assert [(x[0], type(x[1]), x[1].title, x[2]) for x in elements] == [
+            (1, PostGroup, "To Do", "To Do"),
+            (2, Post, 'say "hi", bye', "To Do"),
+            (3, PostGroup, "In Progress", "In Progress"),
+            (4, PostGroup, "Done", "Done"),
+            (5, Post, "done", "Done"),
+        ]
+        post = elements[1][1]
+        assert post.tags == ["a", "b"] and [(x.text, x.checked) for x in post.todos] == [
+            ("first", True),
+            ("second", False),
+        ]
+        assert elements[4][1].description == "two\nlines"
+
+    def test_markdown(self, context):
+        output = io.StringIO()
+        WRITERS[RecordFormat.MARKDOWN](iter_records(context.board), output)
+        assert '- **A1** say "hi", bye `a` `b`\n  - [x] first\n  - [ ] second\n' in output.getvalue()
+
+    def test_invalid_record(self):
+        """Comprobar que el error indica el número del registro inválido aunque esté en otro lote"""
+        records = [{"title": "ok"}, {"type": "group", "title": "g"}, {"title": "ok"}, {"tags": ["x"]}]
+        with pytest.raises(RecordError, match="Record 4: title"):
+            list(iter_batches(records, size=3))
+
+    @pytest.mark.parametrize("storage", list(StorageKind))
+    def test_add_posts(self, config, storage):
+        """Comprobar que los posts agregados juntos se guardan con una operación y actualizan los índices"""
+        config.storage = storage
+        context = BebopContext(config, "test")
+        context.names, context.tags, context.search("bulk", 5)
+        group = context.board.posts[1]
+        posts = [Post(title="bulk 0", name="bulk-zero", tags=["bulk"]), Post(title="bulk 1")]
+        context.add_post(group, Post(title="before"))
+        context.add_posts(group, posts)
+        assert len(context.operations) == 2 and context.operations[1].posts[0] is posts[0]
+        context.save_board()
+
+        context = BebopContext(config, "test")
+        assert [x.title for x in context.board.posts[1].posts] == ["before", "bulk 0", "bulk 1"]
+        assert context.names.get("bulk-zero") == [1, 1] and context.tags.paths("bulk") == [(1, 1)]
+        assert sorted(x.path for x in context.search("bulk", 5)) == [[1, 1], [1, 2]]
+
+        # Otro proceso guarda antes y la operación se vuelve a aplicar sobre su tablero
+        context.add_posts(context.board.posts[1], [Post(title="bulk 2")])
+        other = BebopContext(config, "test")
+        other.add_post(other.board.posts[0], Post(title="other"))
+        other.save_board()
+        context.save_board()
+        board = BebopContext(config, "test").board
+        assert [x.title for x in board.posts[1].posts] == ["before", "bulk 0", "bulk 1", "bulk 2"]
+        assert [x.title for x in board.posts[0].posts] == ["other"]
+
+    def test_cli_import(self, context, tmp_path):
+        """Comprobar que se importan los posts en sus grupos y no se guarda nada si un registro es inválido"""
+        path = tmp_path / "tickets.ndjson"
+        lines = [{"title": "t1", "group": "Done"}, {"title": "t2", "group": "Backlog"}, {"title": "t3"}]
+        path.write_text("\n".join(json.dumps(x) for x in lines))
+
+        runner = CliRunner()
+        result = runner.invoke(app, ["-b", "test", "import", str(path)])
+        assert result.exit_code != 0 and "Record 3" in result.output
+        assert len(BebopContext(context.config, "test").board.posts) == 3
+
+        result = runner.invoke(app, ["-b", "test", "import", str(path), "-o", "B"])
+        assert result.exit_code == 0 and "Imported 0 groups and 3 posts" in result.output
+        board = BebopContext(context.config, "test").board
+        assert [x.title for x in board.posts[1].posts] == ["t1", "t2", "t3"]
+
+        path.write_text("\n".join(json.dumps(x) for x in lines[:2]))
+        assert runner.invoke(app, ["-b", "test", "import", str(path)]).exit_code == 0
+        board = BebopContext(context.config, "test").board
+        assert [(x.title, [y.title for y in x.posts]) for x in board.posts[2:]] == [
+            ("Done", ["done", "t1"]),
+            ("Backlog", ["t2"]),
+        ]
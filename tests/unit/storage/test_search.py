@@ -0,0 +1,72 @@
+import pytest
+from typer.testing import CliRunner
+
+from bebop.cli.config import StorageKind
+from bebop.cli.context import BebopContext
+from bebop.cli.main import app
+from bebop.models import Post, Comment
+from bebop.storage.search import SearchIndex, build_query
+
+
+def dump_index(index: SearchIndex):
+    rows = index.connection.execute(
+        "SELECT group_position, post_position, title, tags, description, todos, comments "
+        "FROM docs JOIN texts ON texts.rowid = docs.id"
+    )
+    return sorted(rows)
+
+
+class TestSearchIndex:
+
+    @pytest.mark.parametrize("storage", [StorageKind.JSON, StorageKind.SQLITE])
+    def test_incremental_matches_rebuild(self, config, mutate, storage, mocker):
+        """Comprobar que aplicar las operaciones deja el índice igual que reconstruirlo"""
+        config.storage = storage
+        context = BebopContext(config, "test")
+        context.search("x", 10)
+
+        rebuild = mocker.spy(SearchIndex, "rebuild")
+        mutate(context)
+        context.save_board()
+        context.search("x", 10)
+        rebuild.assert_not_called()
+
+        incremental = context.get_search_index()
+        rebuilt = SearchIndex(config.get_root_path() / "rebuilt.db", config.get_root_path())
+        rebuilt.rebuild(BebopContext(config, "test").board, "")
+        assert dump_index(incremental) == dump_index(rebuilt)
+
+    def test_ranking_and_snippets(self, config):
+        context = BebopContext(config, "test")
+        todo, _, done = context.board.posts
+        context.add_post(todo, Post(title="Deploy", comments=[Comment(text="the migración failed at night")]))
+        context.add_post(done, Post(title="Migración de datos", tags=["db"]))
+        context.save_board()
+
+        results = context.search("migracion", 10)
+        assert [x.path for x in results] == [[2, 0], [0, 0]]
+        assert "\x02migración\x03 failed" in results[1].snippet
+        assert [x.path for x in context.search("datos migr*", 10)] == [[2, 0]]
+        assert context.search("datos migr", 10) == []
+        assert context.search("!!", 10) == []
+
+    def test_external_change_rebuilds(self, config):
+        """Comprobar que el índice se reconstruye si el tablero cambió sin actualizarlo"""
+        context = BebopContext(config, "test")
+        assert context.search("done", 10)[0].path == [2]
+
+        context.board.posts[2].title = "Finished"
+        context.storage.write(context.board)
+        assert BebopContext(config, "test").search("done", 10) == []
+
+    def test_cli(self, config, mocker):
+        mocker.patch("bebop.cli.config.BebopConfig.load_config", return_value=config)
+        runner = CliRunner()
+        runner.invoke(app, ["--board", "test", "post", "Fix the login [page]", "B"])
+
+        result = runner.invoke(app, ["--board", "test", "search", "login"])
+        assert result.exit_code == 0, result.output
+        assert "B1" in result.output and "Fix the login [page]" in result.output
+
+    def test_build_query(self):
+        assert build_query('fix "login" page* -') == '"fix" "login" "page"*'
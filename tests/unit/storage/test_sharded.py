@@ -0,0 +1,75 @@
+import pytest
+
+from bebop.cli.config import StorageKind
+from bebop.cli.context import BebopContext
+from bebop.models import Post, PostGroup
+
+
+@pytest.fixture()
+def config(config):
+    config.storage = StorageKind.SHARDED
+    yield config
+
+
+class TestShardedStorage:
+
+    def test_saved_board_matches_live_mutations(self, config, mutate):
+        """Comprobar que el tablero guardado en el directorio es igual al de memoria"""
+        context = BebopContext(config, "test")
+        mutate(context)
+        context.save_board()
+
+        reloaded = BebopContext(config, "test")
+        assert reloaded.board == context.board
+        files = reloaded.storage.files
+        assert all((reloaded.storage.groups_path / x).is_file() for x in files)
+
+    def test_save_rewrites_changed_groups(self, config, mocker):
+        """Comprobar que sólo se escriben el manifiesto y los grupos modificados"""
+        context = BebopContext(config, "test")
+        context.board
+        before = list(context.storage.files)
+
+        todo, doing, done = context.board.posts
+        context.add_post(doing, Post(title="p"))
+        context.move_element((todo, None), (done, None))
+        context.save_board()
+
+        after = context.storage.files
+        assert [x.title for x in context.board.posts] == ["In Progress", "To Do", "Done"]
+        assert after[1:] == [before[0], before[2]]
+        assert after[0] not in before
+        # El archivo anterior se conserva para los procesos que leyeron el manifiesto anterior
+        assert (context.storage.groups_path / before[1]).exists()
+
+        mocker.patch("bebop.storage.sharded.RETIRED_GRACE", -1)
+        context.update_element(context.board.posts[0], title="Doing")
+        context.save_board()
+        assert sorted(x.name for x in context.storage.groups_path.iterdir()) == sorted(context.storage.files)
+
+    def test_conflict_after_group_insert(self, config):
+        """Comprobar que un grupo agregado se guarda al repetir las operaciones tras un conflicto"""
+        first = BebopContext(config, "test")
+        second = BebopContext(config, "test")
+        first.add_group(PostGroup(title="New", posts=[Post(title="p")]))
+        second.add_post(second.board.posts[0], Post(title="other"))
+        second.save_board()
+        first.save_board()
+
+        assert first.retries == 1
+        board = BebopContext(config, "test").board
+        assert [x.title for x in board.posts] == ["To Do", "In Progress", "Done", "New"]
+        assert [x.title for x in board.posts[3].posts] == ["p"]
+        assert [x.title for x in board.posts[0].posts] == ["other"]
+
+    def test_single_group_load(self, config, tmp_path):
+        """Comprobar que acceder a un grupo sólo lee el manifiesto y el archivo de ese grupo"""
+        context = BebopContext(config, "test")
+        context.add_post(context.board.posts[1], Post(title="p"))
+        context.save_board()
+
+        reloaded = BebopContext(config, "test")
+        reloaded.board
+        reloaded.storage.groups_path.joinpath(reloaded.storage.files[0]).unlink()
+        assert reloaded.board.posts[1].posts[0].title == "p"
+        assert not reloaded.board.posts.is_loaded(0)
@@ -0,0 +1,53 @@
+import pytest
+
+from bebop.cli.config import StorageKind
+from bebop.cli.context import BebopContext
+from bebop.storage.sqlite import SqliteStorage
+
+
+@pytest.fixture()
+def config(config):
+    config.storage = StorageKind.SQLITE
+    yield config
+
+
+class TestSqliteStorage:
+
+    def test_row_updates_match_live_mutations(self, config, mutate):
+        """Comprobar que las operaciones guardadas como filas generan el mismo tablero"""
+        context = BebopContext(config, "test")
+        mutate(context)
+        context.save_board()
+
+        reloaded = BebopContext(config, "test")
+        assert reloaded.board == context.board
+
+    def test_posts_are_loaded_on_access(self, config, mutate):
+        """Comprobar que sólo se cargan los elementos accedidos"""
+        context = BebopContext(config, "test")
+        mutate(context)
+        context.save_board()
+
+        reloaded = BebopContext(config, "test")
+        assert not reloaded.board.posts.is_loaded(0)
+        group = reloaded.board.posts[0]
+        assert not any(group.posts.is_loaded(idx) for idx in range(len(group.posts)))
+        assert group.posts[1].tags == ["x", "y"]
+        assert not group.posts.is_loaded(0)
+
+    def test_migrate_both_ways(self, config, mutate, tmp_path):
+        """Comprobar que un tablero JSON se convierte a SQLite y de vuelta sin pérdidas"""
+        config.storage = StorageKind.JSON
+        context = BebopContext(config, "test")
+        mutate(context)
+        context.save_board()
+
+        sqlite = context.get_storage(StorageKind.SQLITE)
+        sqlite.write(context.board)
+        board = SqliteStorage(tmp_path / "test").load()
+        assert board == context.board
+
+        json = context.get_storage(StorageKind.JSON)
+        json.path.unlink()
+        json.write(board)
+        assert json.load() == context.board
@@ -0,0 +1,64 @@
+from typer.testing import CliRunner
+
+from bebop.cli.context import BebopContext
+from bebop.cli.main import app
+from bebop.models import Post
+from bebop.storage.tags import TagFilter, TagIndex
+
+
+def tagged_board(config) -> BebopContext:
+    context = BebopContext(config, "test")
+    todo, progress, _ = context.board.posts
+    context.add_post(todo, Post(title="deploy", tags=["prod", "infra"]))
+    context.add_post(todo, Post(title="docs", tags=["staging"]))
+    context.add_post(progress, Post(title="outage", tags=["prod", "incident"]))
+    context.add_post(progress, Post(title="hidden", tags=["prod"], archived=True))
+    context.save_board()
+    return context
+
+
+class TestTagIndex:
+
+    def test_index_follows_operations(self, config, mutate):
+        """Comprobar que el índice actualizado con las operaciones coincide con uno nuevo"""
+        context = BebopContext(config, "test")
+        context.tags
+        mutate(context)
+        context.update_element(context.board.posts[0], tags=["group"])
+
+        assert context.tags.entries == TagIndex.build(context.board).entries
+        context.save_board()
+        assert TagIndex.read(context.tags_path, context.signature).entries == context.tags.entries
+
+    def test_filter(self, config):
+        """Comprobar que las etiquetas separadas por comas son alternativas y las repetidas se combinan"""
+        context = tagged_board(config)
+        cases = [
+            (TagFilter.parse(["prod"]), {(0, 0), (1, 0), (1, 1)}),
+            (TagFilter.parse(["prod", "incident,infra"]), {(0, 0), (1, 0)}),
+            (TagFilter.parse(["prod,staging"], ["incident"]), {(0, 0), (0, 1), (1, 1)}),
+        ]
+        for tag_filter, expected in cases:
+            selection = context.tags.select(tag_filter)
+            assert {x for x in selection.include if x in selection} == expected
+
+    def test_cli(self, config):
+        tagged_board(config)
+        runner = CliRunner()
+
+        result = runner.invoke(app, ["-b", "test", "--tag", "prod", "--not-tag", "infra"])
+        assert result.exit_code == 0
+        assert "outage" in result.stdout
+        assert "deploy" not in result.stdout and "docs" not in result.stdout and "hidden" not in result.stdout
+
+        result = runner.invoke(app, ["-b", "test", "--tag", "staging,incident", "show"])
+        assert result.exit_code == 0
+        assert "docs" in result.stdout and "outage" in result.stdout and "deploy" not in result.stdout
+
+        result = runner.invoke(app, ["-b", "test", "--tag", "prod", "rm", "A:", "-y"])
+        assert result.exit_code == 0
+        assert [x.title for x in BebopContext(config, "test").board.posts[0].posts] == ["docs"]
+
+        result = runner.invoke(app, ["-b", "test", "tags"])
+        assert result.exit_code == 0
+        assert [x.split() for x in result.stdout.splitlines() if "prod" in x] == [["prod", "2"]]
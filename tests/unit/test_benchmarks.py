@@ -0,0 +1,29 @@
+from benchmarks.generator import BoardSpec, generate_board
+from benchmarks.run import Measure, compare
+from bebop.models import Board
+
+
+class TestBenchmarks:
+
+    def test_generated_board(self):
+        """Comprobar que el tablero generado es válido y los posts están donde indica la especificación"""
+        spec = BoardSpec(posts=103, groups=4, tags=5, tags_per_post=3)
+        board = Board.model_validate(generate_board(spec))
+
+        assert [len(x.posts) for x in board.posts] == [26, 26, 26, 25]
+        group, idx = spec.locate(80)
+        assert board.posts[group].posts[idx].title.startswith("Post 80 ")
+        assert board.posts[group].posts[idx].name == ("post_80" if spec.is_named(80) else None)
+        assert all(1 <= len(x.tags) <= 3 and len(x.todos) == 3 for group in board.posts for x in group.posts)
+        assert generate_board(spec) == generate_board(spec)
+
+    def test_compare(self):
+        """Comprobar que sólo se marcan los casos más lentos que la tolerancia y que el ruido mínimo"""
+        baseline = [Measure("load", 100, 5, 0.1, 0.1), Measure("save", 100, 5, 0.0001, 0.0001)]
+        results = [Measure("load", 100, 5, 0.13, 0.13), Measure("save", 100, 5, 0.0009, 0.0009)]
+        results.append(Measure("load", 10_000, 1, 1.0, 1.0))
+
+        regressions = compare(results, baseline, 0.2)
+        assert [x.key for x in regressions] == ["load@100"]
+        assert round(regressions[0].ratio, 2) == 1.3
+        assert compare(results, baseline, 0.5) == []
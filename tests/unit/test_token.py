@@ -2,7 +2,7 @@ from typing import Tuple
 
 import pytest
 
-from bebop.token import IndexToken
+from bebop.token import Token, IndexToken, RefToken, TokenRange
 
 
 class TestIndexToken:
@@ -60,3 +60,52 @@ class TestIndexToken:
         """Comprobar generación de subíndices"""
         token = IndexToken.from_index(0, index)
         assert token == f"A{index+1}"
+
+    def test_round_trip(self):
+        """Comprobar que los tokens generados y leídos coinciden con la codificación de letras en base 26"""
+        for idx in list(range(800)) + [18277, 18278]:
+            letters = ""
+            value = idx + 1
+            while value > 0:
+                letters = chr(ord("A") + (value - 1) % 26) + letters
+                value = (value - 1) // 26
+            for sub_idx in (None, 0, 9, 12345):
+                expected = letters if sub_idx is None else f"{letters}{sub_idx + 1}"
+                token = IndexToken.from_index(idx, sub_idx)
+                assert token == expected and IndexToken(expected.lower()) == expected
+                assert (token.main_index, token.sub_index) == (idx, sub_idx)
+                parsed = IndexToken(expected)
+                assert (parsed.main_index, parsed.sub_index) == (idx, sub_idx)
+
+    def test_bulk_generation(self):
+        """Comprobar que los tokens de un tablero son los mismos que se obtienen uno a uno"""
+        board = list(IndexToken.iter_board([2, 0, 3]))
+        assert board == [("A", ["A1", "A2"]), ("B", []), ("C", ["C1", "C2", "C3"])]
+        assert list(IndexToken.iter_group(27, 12, start=10)) == [IndexToken.from_index(27, x) for x in (10, 11)]
+        assert all(isinstance(x, IndexToken) and x.main_index == 2 for x in board[2][1])
+
+
+class TestToken:
+
+    @pytest.mark.parametrize("value,token_class", [("@name", RefToken), ("@Name_1", RefToken), ("a1", IndexToken)])
+    def test_parse(self, value: str, token_class: type):
+        """Comprobar que se obtiene el tipo de token correspondiente al valor"""
+        token = Token.parse(value)
+        assert isinstance(token, token_class)
+
+    def test_ref_token_name(self):
+        """Comprobar que el nombre de un RefToken no incluye la arroba"""
+        assert RefToken("@Name").name == "name"
+
+
+class TestTokenRange:
+
+    @pytest.mark.parametrize("value,expected", [("A:F", slice(0, 6)), ("c:", slice(2, None)), (":B", slice(None, 2))])
+    def test_group_slice(self, value: str, expected: slice):
+        """Comprobar las posiciones de un rango de grupos"""
+        assert TokenRange(value).group_slice() == expected
+
+    @pytest.mark.parametrize("value", ["A1:B", "A:B3", ":4"])
+    def test_invalid_group_slice(self, value: str):
+        with pytest.raises(ValueError):
+            TokenRange(value).group_slice()
@@ -0,0 +1,43 @@
+import json
+
+from typer.testing import CliRunner
+
+from bebop.cli.main import app
+from bebop.trace import NULL_SPAN, Tracer, tracer
+
+
+class TestTracer:
+
+    def test_spans(self, tmp_path):
+        """Comprobar que se suman los contadores por nombre sin contar dos veces las llamadas anidadas"""
+        trace = Tracer()
+        with trace.span("ignored") as disabled:
+            disabled.add(bytes=10)
+        assert trace.spans == [] and NULL_SPAN.counts == {}
+
+        trace.enable()
+        with trace.span("load", bytes=5):
+            with trace.span("load") as nested:
+                nested.add(bytes=100)
+        for value in (1, 2):
+            with trace.span("token") as token:
+                token.add(objects=value)
+
+        assert [(x.name, x.calls, x.counts) for x in trace.summary()] == [
+            ("load", 1, {"bytes": 5}),
+            ("token", 2, {"objects": 3}),
+        ]
+        trace.write_chrome_trace(tmp_path / "trace.json")
+        events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+        assert [(x["name"], x["ph"]) for x in events] == [("load", "X"), ("token", "X"), ("token", "X")]
+
+    def test_cli(self, config, tmp_path, monkeypatch):
+        """Comprobar que --debug muestra el resumen y BEBOP_TRACE escribe el archivo de traza"""
+        monkeypatch.setenv("BEBOP_TRACE", str(tmp_path / "trace.json"))
+        result = CliRunner().invoke(app, ["-b", "test", "--debug", "push", "traced", "-o", "A"])
+
+        assert result.exit_code == 0
+        assert "board.save" in result.output and "render.kanban" in result.output
+        events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+        assert {"config.load", "mutation", "storage.write"} <= {x["name"] for x in events}
+        assert not tracer.enabled